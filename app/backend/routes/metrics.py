@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+
+from src.data.cache import get_cache
+from src.data.stats import get_data_stats
+
+router = APIRouter(prefix="/metrics")
+
+
+@router.get("/data")
+async def data_metrics():
+    """Cache hits and misses, HTTP latency, bytes, retries and pages per data endpoint, plus cache residency."""
+    return {"endpoints": get_data_stats().snapshot(), "cache": get_cache().stats()}
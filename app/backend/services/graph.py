@@ -6,6 +6,7 @@ from langgraph.graph import END, StateGraph
 from src.agents.portfolio_manager import portfolio_management_agent
 from src.agents.risk_manager import risk_management_agent
 from src.main import start
+from src.tools.prefetch import plan_prefetch, prefetch_async
 from src.utils.analysts import ANALYST_CONFIG
 from src.graph.state import AgentState
 
@@ -50,6 +51,9 @@ def create_graph(selected_agents: list[str]) -> StateGraph:
 
 async def run_graph_async(graph, portfolio, tickers, start_date, end_date, model_name, model_provider, request=None):
     """Async wrapper for run_graph to work with asyncio."""
+    # Fetch the shared data concurrently on the event loop so the graph's worker thread mostly hits the cache
+    await prefetch_async(plan_prefetch(request.selected_agents if request else list(ANALYST_CONFIG), tickers, start_date, end_date))
+
     # Use run_in_executor to run the synchronous function in a separate thread
     # so it doesn't block the event loop
     loop = asyncio.get_running_loop()
@@ -11,9 +11,9 @@ from langchain_core.messages import HumanMessage
 from src.tools.api import (
     get_financial_metrics,
     get_market_cap,
-    search_line_items,
+    search_line_items_batch,
 )
-from src.utils.llm import call_llm
+from src.utils.llm import acall_llm_per_ticker, is_rule_based, run_llm
 from src.utils.progress import progress
 
 
@@ -39,26 +39,29 @@ def aswath_damodaran_agent(state: AgentState):
     analysis_data: dict[str, dict] = {}
     damodaran_signals: dict[str, dict] = {}
 
+    # Search line items for all tickers in shared requests rather than one request per ticker
+    line_items_by_ticker = search_line_items_batch(
+        tickers,
+        [
+            "free_cash_flow",
+            "ebit",
+            "interest_expense",
+            "capital_expenditure",
+            "depreciation_and_amortization",
+            "outstanding_shares",
+            "net_income",
+            "total_debt",
+        ],
+        end_date,
+    )
+
     for ticker in tickers:
         # ─── Fetch core data ────────────────────────────────────────────────────
         progress.update_status("aswath_damodaran_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=5)
 
         progress.update_status("aswath_damodaran_agent", ticker, "Fetching financial line items")
-        line_items = search_line_items(
-            ticker,
-            [
-                "free_cash_flow",
-                "ebit",
-                "interest_expense",
-                "capital_expenditure",
-                "depreciation_and_amortization",
-                "outstanding_shares",
-                "net_income",
-                "total_debt",
-            ],
-            end_date,
-        )
+        line_items = line_items_by_ticker[ticker]
 
         progress.update_status("aswath_damodaran_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -111,15 +114,11 @@ def aswath_damodaran_agent(state: AgentState):
             "market_cap": market_cap,
         }
 
-        # ─── LLM: craft Damodaran-style narrative ──────────────────────────────
-        progress.update_status("aswath_damodaran_agent", ticker, "Generating Damodaran analysis")
-        damodaran_output = generate_damodaran_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
-
-        damodaran_signals[ticker] = damodaran_output.model_dump()
+    # ─── LLM: craft Damodaran-style narrative ──────────────────────────────
+    # The LLM calls of all tickers run concurrently (or in batches of LLM_BATCH_SIZE tickers), bounded by the provider's concurrency limit
+    progress.update_status("aswath_damodaran_agent", None, "Generating Damodaran analysis")
+    for ticker, damodaran_output in run_llm(generate_damodaran_output(analysis_data, state)).items():
+        damodaran_signals[ticker] = {**damodaran_output.model_dump(), "rule_based": is_rule_based(damodaran_output)}
 
         progress.update_status("aswath_damodaran_agent", ticker, "Done", analysis=damodaran_output.reasoning)
 
@@ -148,7 +147,7 @@ def analyze_growth_and_reinvestment(metrics: list, line_items: list) -> dict[str
     """
     max_score = 4
     if len(metrics) < 2:
-        return {"score": 0, "max_score": max_score, "details": "Insufficient history"}
+        return {"score": 0, "max_score": max_score, "details": "Insufficient history", "data_available": False}
 
     # Revenue CAGR (oldest to latest)
     revs = [m.revenue for m in reversed(metrics) if hasattr(m, "revenue") and m.revenue]
@@ -197,7 +196,7 @@ def analyze_risk_profile(metrics: list, line_items: list) -> dict[str, any]:
     """
     max_score = 3
     if not metrics:
-        return {"score": 0, "max_score": max_score, "details": "No metrics"}
+        return {"score": 0, "max_score": max_score, "details": "No metrics", "data_available": False}
 
     latest = metrics[0]
     score, details = 0, []
@@ -258,11 +257,11 @@ def analyze_relative_valuation(metrics: list) -> dict[str, any]:
     """
     max_score = 1
     if not metrics or len(metrics) < 5:
-        return {"score": 0, "max_score": max_score, "details": "Insufficient P/E history"}
+        return {"score": 0, "max_score": max_score, "details": "Insufficient P/E history", "data_available": False}
 
     pes = [m.price_to_earnings_ratio for m in metrics if m.price_to_earnings_ratio]
     if len(pes) < 5:
-        return {"score": 0, "max_score": max_score, "details": "P/E data sparse"}
+        return {"score": 0, "max_score": max_score, "details": "P/E data sparse", "data_available": False}
 
     ttm_pe = pes[0]
     median_pe = sorted(pes)[len(pes) // 2]
@@ -356,11 +355,10 @@ def estimate_cost_of_equity(beta: float | None) -> float:
 # ────────────────────────────────────────────────────────────────────────────────
 # LLM generation
 # ────────────────────────────────────────────────────────────────────────────────
-def generate_damodaran_output(
-    ticker: str,
-    analysis_data: dict[str, any],
+async def generate_damodaran_output(
+    analysis_data: dict[str, dict[str, any]],
     state: AgentState,
-) -> AswathDamodaranSignal:
+) -> dict[str, AswathDamodaranSignal]:
     """
     Ask the LLM to channel Prof. Damodaran's analytical style:
       • Story → Numbers → Value narrative
@@ -398,8 +396,6 @@ def generate_damodaran_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
-
     def default_signal():
         return AswathDamodaranSignal(
             signal="neutral",
@@ -407,8 +403,9 @@ def generate_damodaran_output(
             reasoning="Parsing error; defaulting to neutral",
         )
 
-    return call_llm(
-        prompt=prompt,
+    return await acall_llm_per_ticker(
+        template=template,
+        analysis_data=analysis_data,
         pydantic_model=AswathDamodaranSignal,
         agent_name="aswath_damodaran_agent",
         state=state,
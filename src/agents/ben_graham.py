@@ -1,12 +1,12 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
+from src.tools.api import get_financial_metrics, get_market_cap, search_line_items_batch
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
+from src.utils.llm import acall_llm_per_ticker, is_rule_based, run_llm
 import math
 
 
@@ -31,12 +31,15 @@ def ben_graham_agent(state: AgentState):
     analysis_data = {}
     graham_analysis = {}
 
+    # Search line items for all tickers in shared requests rather than one request per ticker
+    line_items_by_ticker = search_line_items_batch(tickers, ["earnings_per_share", "revenue", "net_income", "book_value_per_share", "total_assets", "total_liabilities", "current_assets", "current_liabilities", "dividends_and_other_cash_distributions", "outstanding_shares"], end_date, period="annual", limit=10)
+
     for ticker in tickers:
         progress.update_status("ben_graham_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=10)
 
         progress.update_status("ben_graham_agent", ticker, "Gathering financial line items")
-        financial_line_items = search_line_items(ticker, ["earnings_per_share", "revenue", "net_income", "book_value_per_share", "total_assets", "total_liabilities", "current_assets", "current_liabilities", "dividends_and_other_cash_distributions", "outstanding_shares"], end_date, period="annual", limit=10)
+        financial_line_items = line_items_by_ticker[ticker]
 
         progress.update_status("ben_graham_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -65,14 +68,10 @@ def ben_graham_agent(state: AgentState):
 
         analysis_data[ticker] = {"signal": signal, "score": total_score, "max_score": max_possible_score, "earnings_analysis": earnings_analysis, "strength_analysis": strength_analysis, "valuation_analysis": valuation_analysis}
 
-        progress.update_status("ben_graham_agent", ticker, "Generating Ben Graham analysis")
-        graham_output = generate_graham_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
-
-        graham_analysis[ticker] = {"signal": graham_output.signal, "confidence": graham_output.confidence, "reasoning": graham_output.reasoning}
+    # The LLM calls of all tickers run concurrently (or in batches of LLM_BATCH_SIZE tickers), bounded by the provider's concurrency limit
+    progress.update_status("ben_graham_agent", None, "Generating Ben Graham analysis")
+    for ticker, graham_output in run_llm(generate_graham_output(analysis_data, state)).items():
+        graham_analysis[ticker] = {"signal": graham_output.signal, "confidence": graham_output.confidence, "reasoning": graham_output.reasoning, "rule_based": is_rule_based(graham_output)}
 
         progress.update_status("ben_graham_agent", ticker, "Done", analysis=graham_output.reasoning)
 
@@ -102,7 +101,7 @@ def analyze_earnings_stability(metrics: list, financial_line_items: list) -> dic
     details = []
 
     if not metrics or not financial_line_items:
-        return {"score": score, "details": "Insufficient data for earnings stability analysis"}
+        return {"score": score, "details": "Insufficient data for earnings stability analysis", "data_available": False}
 
     eps_vals = []
     for item in financial_line_items:
@@ -144,7 +143,7 @@ def analyze_financial_strength(financial_line_items: list) -> dict:
     details = []
 
     if not financial_line_items:
-        return {"score": score, "details": "No data for financial strength analysis"}
+        return {"score": score, "details": "No data for financial strength analysis", "data_available": False}
 
     latest_item = financial_line_items[0]
     total_assets = latest_item.total_assets or 0
@@ -209,7 +208,7 @@ def analyze_valuation_graham(financial_line_items: list, market_cap: float) -> d
     3. Compare per-share price to Graham Number => margin of safety
     """
     if not financial_line_items or not market_cap or market_cap <= 0:
-        return {"score": 0, "details": "Insufficient data to perform valuation"}
+        return {"score": 0, "details": "Insufficient data to perform valuation", "data_available": False}
 
     latest = financial_line_items[0]
     current_assets = latest.current_assets or 0
@@ -276,11 +275,10 @@ def analyze_valuation_graham(financial_line_items: list, market_cap: float) -> d
     return {"score": score, "details": "; ".join(details)}
 
 
-def generate_graham_output(
-    ticker: str,
-    analysis_data: dict[str, any],
+async def generate_graham_output(
+    analysis_data: dict[str, dict[str, any]],
     state: AgentState,
-) -> BenGrahamSignal:
+) -> dict[str, BenGrahamSignal]:
     """
     Generates an investment decision in the style of Benjamin Graham:
     - Value emphasis, margin of safety, net-nets, conservative balance sheet, stable earnings.
@@ -330,13 +328,12 @@ def generate_graham_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
-
     def create_default_ben_graham_signal():
         return BenGrahamSignal(signal="neutral", confidence=0.0, reasoning="Error in generating analysis; defaulting to neutral.")
 
-    return call_llm(
-        prompt=prompt,
+    return await acall_llm_per_ticker(
+        template=template,
+        analysis_data=analysis_data,
         pydantic_model=BenGrahamSignal,
         agent_name="ben_graham_agent",
         state=state,
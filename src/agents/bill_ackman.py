@@ -1,13 +1,13 @@
 from langchain_openai import ChatOpenAI
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
+from src.tools.api import get_financial_metrics, get_market_cap, search_line_items_batch
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
+from src.utils.llm import acall_llm_per_ticker, is_rule_based, run_llm
 
 
 class BillAckmanSignal(BaseModel):
@@ -29,30 +29,33 @@ def bill_ackman_agent(state: AgentState):
     analysis_data = {}
     ackman_analysis = {}
     
+    # Search line items for all tickers in shared requests rather than one request per ticker
+    line_items_by_ticker = search_line_items_batch(
+        tickers,
+        [
+            "revenue",
+            "operating_margin",
+            "debt_to_equity",
+            "free_cash_flow",
+            "total_assets",
+            "total_liabilities",
+            "dividends_and_other_cash_distributions",
+            "outstanding_shares",
+            # Optional: intangible_assets if available
+            # "intangible_assets"
+        ],
+        end_date,
+        period="annual",
+        limit=5
+    )
+
     for ticker in tickers:
         progress.update_status("bill_ackman_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
         
         progress.update_status("bill_ackman_agent", ticker, "Gathering financial line items")
         # Request multiple periods of data (annual or TTM) for a more robust long-term view.
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "revenue",
-                "operating_margin",
-                "debt_to_equity",
-                "free_cash_flow",
-                "total_assets",
-                "total_liabilities",
-                "dividends_and_other_cash_distributions",
-                "outstanding_shares",
-                # Optional: intangible_assets if available
-                # "intangible_assets"
-            ],
-            end_date,
-            period="annual",
-            limit=5
-        )
+        financial_line_items = line_items_by_ticker[ticker]
         
         progress.update_status("bill_ackman_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -95,18 +98,15 @@ def bill_ackman_agent(state: AgentState):
             "activism_analysis": activism_analysis,
             "valuation_analysis": valuation_analysis
         }
-        
-        progress.update_status("bill_ackman_agent", ticker, "Generating Bill Ackman analysis")
-        ackman_output = generate_ackman_output(
-            ticker=ticker, 
-            analysis_data=analysis_data,
-            state=state,
-        )
-        
+
+    # The LLM calls of all tickers run concurrently (or in batches of LLM_BATCH_SIZE tickers), bounded by the provider's concurrency limit
+    progress.update_status("bill_ackman_agent", None, "Generating Bill Ackman analysis")
+    for ticker, ackman_output in run_llm(generate_ackman_output(analysis_data, state)).items():
         ackman_analysis[ticker] = {
             "signal": ackman_output.signal,
             "confidence": ackman_output.confidence,
-            "reasoning": ackman_output.reasoning
+            "reasoning": ackman_output.reasoning,
+            "rule_based": is_rule_based(ackman_output),
         }
         
         progress.update_status("bill_ackman_agent", ticker, "Done", analysis=ackman_output.reasoning)
@@ -144,7 +144,8 @@ def analyze_business_quality(metrics: list, financial_line_items: list) -> dict:
     if not metrics or not financial_line_items:
         return {
             "score": 0,
-            "details": "Insufficient data to analyze business quality"
+            "details": "Insufficient data to analyze business quality",
+            "data_available": False
         }
     
     # 1. Multi-period revenue growth analysis
@@ -222,7 +223,8 @@ def analyze_financial_discipline(metrics: list, financial_line_items: list) -> d
     if not metrics or not financial_line_items:
         return {
             "score": 0,
-            "details": "Insufficient data to analyze financial discipline"
+            "details": "Insufficient data to analyze financial discipline",
+            "data_available": False
         }
     
     # 1. Multi-period debt ratio or debt_to_equity
@@ -297,7 +299,8 @@ def analyze_activism_potential(financial_line_items: list) -> dict:
     if not financial_line_items:
         return {
             "score": 0,
-            "details": "Insufficient data for activism potential"
+            "details": "Insufficient data for activism potential",
+            "data_available": False
         }
     
     # Check revenue growth vs. operating margin
@@ -307,7 +310,8 @@ def analyze_activism_potential(financial_line_items: list) -> dict:
     if len(revenues) < 2 or not op_margins:
         return {
             "score": 0,
-            "details": "Not enough data to assess activism potential (need multi-year revenue + margins)."
+            "details": "Not enough data to assess activism potential (need multi-year revenue + margins).",
+            "data_available": False
         }
     
     initial, final = revenues[-1], revenues[0]
@@ -338,7 +342,8 @@ def analyze_valuation(financial_line_items: list, market_cap: float) -> dict:
     if not financial_line_items or market_cap is None:
         return {
             "score": 0,
-            "details": "Insufficient data to perform valuation"
+            "details": "Insufficient data to perform valuation",
+            "data_available": False
         }
     
     # Since financial_line_items are in descending order (newest first),
@@ -394,11 +399,10 @@ def analyze_valuation(financial_line_items: list, market_cap: float) -> dict:
     }
 
 
-def generate_ackman_output(
-    ticker: str,
-    analysis_data: dict[str, any],
+async def generate_ackman_output(
+    analysis_data: dict[str, dict[str, any]],
     state: AgentState,
-) -> BillAckmanSignal:
+) -> dict[str, BillAckmanSignal]:
     """
     Generates investment decisions in the style of Bill Ackman.
     Includes more explicit references to brand strength, activism potential, 
@@ -444,11 +448,6 @@ def generate_ackman_output(
         )
     ])
 
-    prompt = template.invoke({
-        "analysis_data": json.dumps(analysis_data, indent=2),
-        "ticker": ticker
-    })
-
     def create_default_bill_ackman_signal():
         return BillAckmanSignal(
             signal="neutral",
@@ -456,8 +455,9 @@ def generate_ackman_output(
             reasoning="Error in analysis, defaulting to neutral"
         )
 
-    return call_llm(
-        prompt=prompt, 
+    return await acall_llm_per_ticker(
+        template=template,
+        analysis_data=analysis_data,
         pydantic_model=BillAckmanSignal, 
         agent_name="bill_ackman_agent", 
         state=state,
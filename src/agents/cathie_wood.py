@@ -1,12 +1,12 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
+from src.tools.api import get_financial_metrics, get_market_cap, search_line_items_batch
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
+from src.utils.llm import acall_llm_per_ticker, is_rule_based, run_llm
 
 
 class CathieWoodSignal(BaseModel):
@@ -30,32 +30,35 @@ def cathie_wood_agent(state: AgentState):
     analysis_data = {}
     cw_analysis = {}
 
+    # Search line items for all tickers in shared requests rather than one request per ticker
+    line_items_by_ticker = search_line_items_batch(
+        tickers,
+        [
+            "revenue",
+            "gross_margin",
+            "operating_margin",
+            "debt_to_equity",
+            "free_cash_flow",
+            "total_assets",
+            "total_liabilities",
+            "dividends_and_other_cash_distributions",
+            "outstanding_shares",
+            "research_and_development",
+            "capital_expenditure",
+            "operating_expense",
+        ],
+        end_date,
+        period="annual",
+        limit=5,
+    )
+
     for ticker in tickers:
         progress.update_status("cathie_wood_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
 
         progress.update_status("cathie_wood_agent", ticker, "Gathering financial line items")
         # Request multiple periods of data (annual or TTM) for a more robust view.
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "revenue",
-                "gross_margin",
-                "operating_margin",
-                "debt_to_equity",
-                "free_cash_flow",
-                "total_assets",
-                "total_liabilities",
-                "dividends_and_other_cash_distributions",
-                "outstanding_shares",
-                "research_and_development",
-                "capital_expenditure",
-                "operating_expense",
-            ],
-            end_date,
-            period="annual",
-            limit=5,
-        )
+        financial_line_items = line_items_by_ticker[ticker]
 
         progress.update_status("cathie_wood_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -82,14 +85,10 @@ def cathie_wood_agent(state: AgentState):
 
         analysis_data[ticker] = {"signal": signal, "score": total_score, "max_score": max_possible_score, "disruptive_analysis": disruptive_analysis, "innovation_analysis": innovation_analysis, "valuation_analysis": valuation_analysis}
 
-        progress.update_status("cathie_wood_agent", ticker, "Generating Cathie Wood analysis")
-        cw_output = generate_cathie_wood_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
-
-        cw_analysis[ticker] = {"signal": cw_output.signal, "confidence": cw_output.confidence, "reasoning": cw_output.reasoning}
+    # The LLM calls of all tickers run concurrently (or in batches of LLM_BATCH_SIZE tickers), bounded by the provider's concurrency limit
+    progress.update_status("cathie_wood_agent", None, "Generating Cathie Wood analysis")
+    for ticker, cw_output in run_llm(generate_cathie_wood_output(analysis_data, state)).items():
+        cw_analysis[ticker] = {"signal": cw_output.signal, "confidence": cw_output.confidence, "reasoning": cw_output.reasoning, "rule_based": is_rule_based(cw_output)}
 
         progress.update_status("cathie_wood_agent", ticker, "Done", analysis=cw_output.reasoning)
 
@@ -119,7 +118,7 @@ def analyze_disruptive_potential(metrics: list, financial_line_items: list) -> d
     details = []
 
     if not metrics or not financial_line_items:
-        return {"score": 0, "details": "Insufficient data to analyze disruptive potential"}
+        return {"score": 0, "details": "Insufficient data to analyze disruptive potential", "data_available": False}
 
     # 1. Revenue Growth Analysis - Check for accelerating growth
     revenues = [item.revenue for item in financial_line_items if item.revenue]
@@ -218,7 +217,7 @@ def analyze_innovation_growth(metrics: list, financial_line_items: list) -> dict
     details = []
 
     if not metrics or not financial_line_items:
-        return {"score": 0, "details": "Insufficient data to analyze innovation-driven growth"}
+        return {"score": 0, "details": "Insufficient data to analyze innovation-driven growth", "data_available": False}
 
     # 1. R&D Investment Trends
     rd_expenses = [item.research_and_development for item in financial_line_items if hasattr(item, "research_and_development") and item.research_and_development]
@@ -319,7 +318,7 @@ def analyze_cathie_wood_valuation(financial_line_items: list, market_cap: float)
     company's ability to capture a sizable portion.
     """
     if not financial_line_items or market_cap is None:
-        return {"score": 0, "details": "Insufficient data for valuation"}
+        return {"score": 0, "details": "Insufficient data for valuation", "data_available": False}
 
     latest = financial_line_items[0]
     fcf = latest.free_cash_flow if latest.free_cash_flow else 0
@@ -357,11 +356,10 @@ def analyze_cathie_wood_valuation(financial_line_items: list, market_cap: float)
     return {"score": score, "details": "; ".join(details), "intrinsic_value": intrinsic_value, "margin_of_safety": margin_of_safety}
 
 
-def generate_cathie_wood_output(
-    ticker: str,
-    analysis_data: dict[str, any],
+async def generate_cathie_wood_output(
+    analysis_data: dict[str, dict[str, any]],
     state: AgentState,
-) -> CathieWoodSignal:
+) -> dict[str, CathieWoodSignal]:
     """
     Generates investment decisions in the style of Cathie Wood.
     """
@@ -415,13 +413,12 @@ def generate_cathie_wood_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
-
     def create_default_cathie_wood_signal():
         return CathieWoodSignal(signal="neutral", confidence=0.0, reasoning="Error in analysis, defaulting to neutral")
 
-    return call_llm(
-        prompt=prompt,
+    return await acall_llm_per_ticker(
+        template=template,
+        analysis_data=analysis_data,
         pydantic_model=CathieWoodSignal,
         agent_name="cathie_wood_agent",
         state=state,
@@ -1,12 +1,12 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items, get_insider_trades, get_company_news
+from src.tools.api import get_financial_metrics, get_market_cap, search_line_items_batch, get_insider_trades, get_company_news
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
+from src.utils.llm import acall_llm_per_ticker, is_rule_based, run_llm
 
 class CharlieMungerSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
@@ -26,33 +26,36 @@ def charlie_munger_agent(state: AgentState):
     analysis_data = {}
     munger_analysis = {}
     
+    # Search line items for all tickers in shared requests rather than one request per ticker
+    line_items_by_ticker = search_line_items_batch(
+        tickers,
+        [
+            "revenue",
+            "net_income",
+            "operating_income",
+            "return_on_invested_capital",
+            "gross_margin",
+            "operating_margin",
+            "free_cash_flow",
+            "capital_expenditure",
+            "cash_and_equivalents",
+            "total_debt",
+            "shareholders_equity",
+            "outstanding_shares",
+            "research_and_development",
+            "goodwill_and_intangible_assets",
+        ],
+        end_date,
+        period="annual",
+        limit=10  # Munger examines long-term trends
+    )
+
     for ticker in tickers:
         progress.update_status("charlie_munger_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=10)  # Munger looks at longer periods
         
         progress.update_status("charlie_munger_agent", ticker, "Gathering financial line items")
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "revenue",
-                "net_income",
-                "operating_income",
-                "return_on_invested_capital",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-                "research_and_development",
-                "goodwill_and_intangible_assets",
-            ],
-            end_date,
-            period="annual",
-            limit=10  # Munger examines long-term trends
-        )
+        financial_line_items = line_items_by_ticker[ticker]
         
         progress.update_status("charlie_munger_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -119,18 +122,15 @@ def charlie_munger_agent(state: AgentState):
             # Include some qualitative assessment from news
             "news_sentiment": analyze_news_sentiment(company_news) if company_news else "No news data available"
         }
-        
-        progress.update_status("charlie_munger_agent", ticker, "Generating Charlie Munger analysis")
-        munger_output = generate_munger_output(
-            ticker=ticker, 
-            analysis_data=analysis_data,
-            state=state,
-        )
-        
+
+    # The LLM calls of all tickers run concurrently (or in batches of LLM_BATCH_SIZE tickers), bounded by the provider's concurrency limit
+    progress.update_status("charlie_munger_agent", None, "Generating Charlie Munger analysis")
+    for ticker, munger_output in run_llm(generate_munger_output(analysis_data, state)).items():
         munger_analysis[ticker] = {
             "signal": munger_output.signal,
             "confidence": munger_output.confidence,
-            "reasoning": munger_output.reasoning
+            "reasoning": munger_output.reasoning,
+            "rule_based": is_rule_based(munger_output),
         }
         
         progress.update_status("charlie_munger_agent", ticker, "Done", analysis=munger_output.reasoning)
@@ -170,7 +170,8 @@ def analyze_moat_strength(metrics: list, financial_line_items: list) -> dict:
     if not metrics or not financial_line_items:
         return {
             "score": 0,
-            "details": "Insufficient data to analyze moat strength"
+            "details": "Insufficient data to analyze moat strength",
+            "data_available": False
         }
     
     # 1. Return on Invested Capital (ROIC) analysis - Munger's favorite metric
@@ -277,7 +278,8 @@ def analyze_management_quality(financial_line_items: list, insider_trades: list)
     if not financial_line_items:
         return {
             "score": 0,
-            "details": "Insufficient data to analyze management quality"
+            "details": "Insufficient data to analyze management quality",
+            "data_available": False
         }
     
     # 1. Capital allocation - Check FCF to net income ratio
@@ -433,7 +435,8 @@ def analyze_predictability(financial_line_items: list) -> dict:
     if not financial_line_items or len(financial_line_items) < 5:
         return {
             "score": 0,
-            "details": "Insufficient data to analyze business predictability (need 5+ years)"
+            "details": "Insufficient data to analyze business predictability (need 5+ years)",
+            "data_available": False
         }
     
     # 1. Revenue stability and growth
@@ -560,7 +563,8 @@ def calculate_munger_valuation(financial_line_items: list, market_cap: float) ->
     if not financial_line_items or market_cap is None:
         return {
             "score": 0,
-            "details": "Insufficient data to perform valuation"
+            "details": "Insufficient data to perform valuation",
+            "data_available": False
         }
     
     # Get FCF values (Munger's preferred "owner earnings" metric)
@@ -570,7 +574,8 @@ def calculate_munger_valuation(financial_line_items: list, market_cap: float) ->
     if not fcf_values or len(fcf_values) < 3:
         return {
             "score": 0,
-            "details": "Insufficient free cash flow data for valuation"
+            "details": "Insufficient free cash flow data for valuation",
+            "data_available": False
         }
     
     # 1. Normalize earnings by taking average of last 3-5 years
@@ -588,7 +593,8 @@ def calculate_munger_valuation(financial_line_items: list, market_cap: float) ->
     if market_cap <= 0:
         return {
             "score": 0,
-            "details": f"Invalid market cap ({market_cap}), cannot value"
+            "details": f"Invalid market cap ({market_cap}), cannot value",
+            "data_available": False
         }
     
     fcf_yield = normalized_fcf / market_cap
@@ -673,11 +679,10 @@ def analyze_news_sentiment(news_items: list) -> str:
     return f"Qualitative review of {len(news_items)} recent news items would be needed"
 
 
-def generate_munger_output(
-    ticker: str,
-    analysis_data: dict[str, any],
+async def generate_munger_output(
+    analysis_data: dict[str, dict[str, any]],
     state: AgentState,
-) -> CharlieMungerSignal:
+) -> dict[str, CharlieMungerSignal]:
     """
     Generates investment decisions in the style of Charlie Munger.
     """
@@ -735,11 +740,6 @@ def generate_munger_output(
         )
     ])
 
-    prompt = template.invoke({
-        "analysis_data": json.dumps(analysis_data, indent=2),
-        "ticker": ticker
-    })
-
     def create_default_charlie_munger_signal():
         return CharlieMungerSignal(
             signal="neutral",
@@ -747,8 +747,9 @@ def generate_munger_output(
             reasoning="Error in analysis, defaulting to neutral"
         )
 
-    return call_llm(
-        prompt=prompt,
+    return await acall_llm_per_ticker(
+        template=template,
+        analysis_data=analysis_data,
         state=state,
         pydantic_model=CharlieMungerSignal, 
         agent_name="charlie_munger_agent", 
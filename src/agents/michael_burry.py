@@ -14,9 +14,9 @@ from src.tools.api import (
     get_financial_metrics,
     get_insider_trades,
     get_market_cap,
-    search_line_items,
+    search_line_items_batch,
 )
-from src.utils.llm import call_llm
+from src.utils.llm import acall_llm_per_ticker, is_rule_based, run_llm
 from src.utils.progress import progress
 
 __all__ = [
@@ -55,6 +55,22 @@ def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine h
     analysis_data: dict[str, dict] = {}
     burry_analysis: dict[str, dict] = {}
 
+    # Search line items for all tickers in shared requests rather than one request per ticker
+    line_items_by_ticker = search_line_items_batch(
+        tickers,
+        [
+            "free_cash_flow",
+            "net_income",
+            "total_debt",
+            "cash_and_equivalents",
+            "total_assets",
+            "total_liabilities",
+            "outstanding_shares",
+            "issuance_or_purchase_of_equity_shares",
+        ],
+        end_date,
+    )
+
     for ticker in tickers:
         # ------------------------------------------------------------------
         # Fetch raw data
@@ -63,20 +79,7 @@ def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine h
         metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=5)
 
         progress.update_status("michael_burry_agent", ticker, "Fetching line items")
-        line_items = search_line_items(
-            ticker,
-            [
-                "free_cash_flow",
-                "net_income",
-                "total_debt",
-                "cash_and_equivalents",
-                "total_assets",
-                "total_liabilities",
-                "outstanding_shares",
-                "issuance_or_purchase_of_equity_shares",
-            ],
-            end_date,
-        )
+        line_items = line_items_by_ticker[ticker]
 
         progress.update_status("michael_burry_agent", ticker, "Fetching insider trades")
         insider_trades = get_insider_trades(ticker, end_date=end_date, start_date=start_date)
@@ -139,17 +142,14 @@ def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine h
             "market_cap": market_cap,
         }
 
-        progress.update_status("michael_burry_agent", ticker, "Generating LLM output")
-        burry_output = _generate_burry_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
-
+    # The LLM calls of all tickers run concurrently (or in batches of LLM_BATCH_SIZE tickers), bounded by the provider's concurrency limit
+    progress.update_status("michael_burry_agent", None, "Generating LLM output")
+    for ticker, burry_output in run_llm(_generate_burry_output(analysis_data, state)).items():
         burry_analysis[ticker] = {
             "signal": burry_output.signal,
             "confidence": burry_output.confidence,
             "reasoning": burry_output.reasoning,
+            "rule_based": is_rule_based(burry_output),
         }
 
         progress.update_status("michael_burry_agent", ticker, "Done", analysis=burry_output.reasoning)
@@ -279,7 +279,7 @@ def _analyze_insider_activity(insider_trades):
 
     if not insider_trades:
         details.append("No insider trade data")
-        return {"score": score, "max_score": max_score, "details": "; ".join(details)}
+        return {"score": score, "max_score": max_score, "details": "; ".join(details), "data_available": False}
 
     shares_bought = sum(t.transaction_shares or 0 for t in insider_trades if (t.transaction_shares or 0) > 0)
     shares_sold = abs(sum(t.transaction_shares or 0 for t in insider_trades if (t.transaction_shares or 0) < 0))
@@ -304,7 +304,7 @@ def _analyze_contrarian_sentiment(news):
 
     if not news:
         details.append("No recent news")
-        return {"score": score, "max_score": max_score, "details": "; ".join(details)}
+        return {"score": score, "max_score": max_score, "details": "; ".join(details), "data_available": False}
 
     # Count negative sentiment articles
     sentiment_negative_count = sum(
@@ -324,11 +324,10 @@ def _analyze_contrarian_sentiment(news):
 # LLM generation
 ###############################################################################
 
-def _generate_burry_output(
-    ticker: str,
-    analysis_data: dict,
+async def _generate_burry_output(
+    analysis_data: dict[str, dict[str, any]],
     state: AgentState,
-) -> MichaelBurrySignal:
+) -> dict[str, MichaelBurrySignal]:
     """Call the LLM to craft the final trading signal in Burry's voice."""
 
     template = ChatPromptTemplate.from_messages(
@@ -371,14 +370,13 @@ def _generate_burry_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
-
     # Default fallback signal in case parsing fails
     def create_default_michael_burry_signal():
         return MichaelBurrySignal(signal="neutral", confidence=0.0, reasoning="Parsing error – defaulting to neutral")
 
-    return call_llm(
-        prompt=prompt,
+    return await acall_llm_per_ticker(
+        template=template,
+        analysis_data=analysis_data,
         pydantic_model=MichaelBurrySignal,
         agent_name="michael_burry_agent",
         state=state,
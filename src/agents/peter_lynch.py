@@ -2,7 +2,7 @@ from src.graph.state import AgentState, show_agent_reasoning
 from src.tools.api import (
     get_financial_metrics,
     get_market_cap,
-    search_line_items,
+    search_line_items_batch,
     get_insider_trades,
     get_company_news,
     get_prices,
@@ -13,7 +13,7 @@ from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
+from src.utils.llm import acall_llm_per_ticker, is_rule_based, run_llm
 
 
 class PeterLynchSignal(BaseModel):
@@ -48,32 +48,35 @@ def peter_lynch_agent(state: AgentState):
     analysis_data = {}
     lynch_analysis = {}
 
+    # Search line items for all tickers in shared requests rather than one request per ticker
+    line_items_by_ticker = search_line_items_batch(
+        tickers,
+        [
+            "revenue",
+            "earnings_per_share",
+            "net_income",
+            "operating_income",
+            "gross_margin",
+            "operating_margin",
+            "free_cash_flow",
+            "capital_expenditure",
+            "cash_and_equivalents",
+            "total_debt",
+            "shareholders_equity",
+            "outstanding_shares",
+        ],
+        end_date,
+        period="annual",
+        limit=5,
+    )
+
     for ticker in tickers:
         progress.update_status("peter_lynch_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
 
         progress.update_status("peter_lynch_agent", ticker, "Gathering financial line items")
         # Relevant line items for Peter Lynch's approach
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "revenue",
-                "earnings_per_share",
-                "net_income",
-                "operating_income",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-            ],
-            end_date,
-            period="annual",
-            limit=5,
-        )
+        financial_line_items = line_items_by_ticker[ticker]
 
         progress.update_status("peter_lynch_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -135,17 +138,14 @@ def peter_lynch_agent(state: AgentState):
             "insider_activity": insider_activity,
         }
 
-        progress.update_status("peter_lynch_agent", ticker, "Generating Peter Lynch analysis")
-        lynch_output = generate_lynch_output(
-            ticker=ticker,
-            analysis_data=analysis_data[ticker],
-            state=state,
-        )
-
+    # The LLM calls of all tickers run concurrently (or in batches of LLM_BATCH_SIZE tickers), bounded by the provider's concurrency limit
+    progress.update_status("peter_lynch_agent", None, "Generating Peter Lynch analysis")
+    for ticker, lynch_output in run_llm(generate_lynch_output(analysis_data, state)).items():
         lynch_analysis[ticker] = {
             "signal": lynch_output.signal,
             "confidence": lynch_output.confidence,
             "reasoning": lynch_output.reasoning,
+            "rule_based": is_rule_based(lynch_output),
         }
 
         progress.update_status("peter_lynch_agent", ticker, "Done", analysis=lynch_output.reasoning)
@@ -173,7 +173,7 @@ def analyze_lynch_growth(financial_line_items: list) -> dict:
     often searching for potential 'ten-baggers' with a long runway.
     """
     if not financial_line_items or len(financial_line_items) < 2:
-        return {"score": 0, "details": "Insufficient financial data for growth analysis"}
+        return {"score": 0, "details": "Insufficient financial data for growth analysis", "data_available": False}
 
     details = []
     raw_score = 0  # We'll sum up points, then scale to 0–10 eventually
@@ -238,7 +238,7 @@ def analyze_lynch_fundamentals(financial_line_items: list) -> dict:
     Lynch avoided heavily indebted or complicated businesses.
     """
     if not financial_line_items:
-        return {"score": 0, "details": "Insufficient fundamentals data"}
+        return {"score": 0, "details": "Insufficient fundamentals data", "data_available": False}
 
     details = []
     raw_score = 0  # We'll accumulate up to 6 points, then scale to 0–10
@@ -300,7 +300,7 @@ def analyze_lynch_valuation(financial_line_items: list, market_cap: float | None
     A PEG < 1 is very attractive; 1-2 is fair; >2 is expensive.
     """
     if not financial_line_items or market_cap is None:
-        return {"score": 0, "details": "Insufficient data for valuation"}
+        return {"score": 0, "details": "Insufficient data for valuation", "data_available": False}
 
     details = []
     raw_score = 0
@@ -366,7 +366,7 @@ def analyze_sentiment(news_items: list) -> dict:
     Basic news sentiment check. Negative headlines weigh on the final score.
     """
     if not news_items:
-        return {"score": 5, "details": "No news data; default to neutral sentiment"}
+        return {"score": 5, "details": "No news data; default to neutral sentiment", "data_available": False}
 
     negative_keywords = ["lawsuit", "fraud", "negative", "downturn", "decline", "investigation", "recall"]
     negative_count = 0
@@ -405,7 +405,7 @@ def analyze_insider_activity(insider_trades: list) -> dict:
 
     if not insider_trades:
         details.append("No insider trades data; defaulting to neutral")
-        return {"score": score, "details": "; ".join(details)}
+        return {"score": score, "details": "; ".join(details), "data_available": False}
 
     buys, sells = 0, 0
     for trade in insider_trades:
@@ -437,11 +437,10 @@ def analyze_insider_activity(insider_trades: list) -> dict:
     return {"score": score, "details": "; ".join(details)}
 
 
-def generate_lynch_output(
-    ticker: str,
-    analysis_data: dict[str, any],
+async def generate_lynch_output(
+    analysis_data: dict[str, dict[str, any]],
     state: AgentState,
-) -> PeterLynchSignal:
+) -> dict[str, PeterLynchSignal]:
     """
     Generates a final JSON signal in Peter Lynch's voice & style.
     """
@@ -487,8 +486,6 @@ def generate_lynch_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
-
     def create_default_signal():
         return PeterLynchSignal(
             signal="neutral",
@@ -496,8 +493,9 @@ def generate_lynch_output(
             reasoning="Error in analysis; defaulting to neutral"
         )
 
-    return call_llm(
-        prompt=prompt,
+    return await acall_llm_per_ticker(
+        template=template,
+        analysis_data=analysis_data,
         pydantic_model=PeterLynchSignal,
         agent_name="peter_lynch_agent",
         state=state,
@@ -2,7 +2,7 @@ from src.graph.state import AgentState, show_agent_reasoning
 from src.tools.api import (
     get_financial_metrics,
     get_market_cap,
-    search_line_items,
+    search_line_items_batch,
     get_insider_trades,
     get_company_news,
 )
@@ -12,7 +12,7 @@ from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
+from src.utils.llm import acall_llm_per_ticker, is_rule_based, run_llm
 import statistics
 
 
@@ -41,6 +41,29 @@ def phil_fisher_agent(state: AgentState):
     analysis_data = {}
     fisher_analysis = {}
 
+    # Search line items for all tickers in shared requests rather than one request per ticker
+    line_items_by_ticker = search_line_items_batch(
+        tickers,
+        [
+            "revenue",
+            "net_income",
+            "earnings_per_share",
+            "free_cash_flow",
+            "research_and_development",
+            "operating_income",
+            "operating_margin",
+            "gross_margin",
+            "total_debt",
+            "shareholders_equity",
+            "cash_and_equivalents",
+            "ebit",
+            "ebitda",
+        ],
+        end_date,
+        period="annual",
+        limit=5,
+    )
+
     for ticker in tickers:
         progress.update_status("phil_fisher_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
@@ -51,27 +74,7 @@ def phil_fisher_agent(state: AgentState):
         #   - Margins & Stability: operating_income, operating_margin, gross_margin
         #   - Management Efficiency & Leverage: total_debt, shareholders_equity, free_cash_flow
         #   - Valuation: net_income, free_cash_flow (for P/E, P/FCF), ebit, ebitda
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "revenue",
-                "net_income",
-                "earnings_per_share",
-                "free_cash_flow",
-                "research_and_development",
-                "operating_income",
-                "operating_margin",
-                "gross_margin",
-                "total_debt",
-                "shareholders_equity",
-                "cash_and_equivalents",
-                "ebit",
-                "ebitda",
-            ],
-            end_date,
-            period="annual",
-            limit=5,
-        )
+        financial_line_items = line_items_by_ticker[ticker]
 
         progress.update_status("phil_fisher_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -138,17 +141,14 @@ def phil_fisher_agent(state: AgentState):
             "sentiment_analysis": sentiment_analysis,
         }
 
-        progress.update_status("phil_fisher_agent", ticker, "Generating Phil Fisher-style analysis")
-        fisher_output = generate_fisher_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
-
+    # The LLM calls of all tickers run concurrently (or in batches of LLM_BATCH_SIZE tickers), bounded by the provider's concurrency limit
+    progress.update_status("phil_fisher_agent", None, "Generating Phil Fisher-style analysis")
+    for ticker, fisher_output in run_llm(generate_fisher_output(analysis_data, state)).items():
         fisher_analysis[ticker] = {
             "signal": fisher_output.signal,
             "confidence": fisher_output.confidence,
             "reasoning": fisher_output.reasoning,
+            "rule_based": is_rule_based(fisher_output),
         }
 
         progress.update_status("phil_fisher_agent", ticker, "Done", analysis=fisher_output.reasoning)
@@ -177,6 +177,7 @@ def analyze_fisher_growth_quality(financial_line_items: list) -> dict:
         return {
             "score": 0,
             "details": "Insufficient financial data for growth/quality analysis",
+            "data_available": False,
         }
 
     details = []
@@ -265,6 +266,7 @@ def analyze_margins_stability(financial_line_items: list) -> dict:
         return {
             "score": 0,
             "details": "Insufficient data for margin stability analysis",
+            "data_available": False,
         }
 
     details = []
@@ -334,6 +336,7 @@ def analyze_management_efficiency_leverage(financial_line_items: list) -> dict:
         return {
             "score": 0,
             "details": "No financial data for management efficiency analysis",
+            "data_available": False,
         }
 
     details = []
@@ -408,7 +411,7 @@ def analyze_fisher_valuation(financial_line_items: list, market_cap: float | Non
     We will grant up to 2 points for each of two metrics => max 4 raw => scale to 0–10.
     """
     if not financial_line_items or market_cap is None:
-        return {"score": 0, "details": "Insufficient data to perform valuation"}
+        return {"score": 0, "details": "Insufficient data to perform valuation", "data_available": False}
 
     details = []
     raw_score = 0
@@ -469,7 +472,7 @@ def analyze_insider_activity(insider_trades: list) -> dict:
 
     if not insider_trades:
         details.append("No insider trades data; defaulting to neutral")
-        return {"score": score, "details": "; ".join(details)}
+        return {"score": score, "details": "; ".join(details), "data_available": False}
 
     buys, sells = 0, 0
     for trade in insider_trades:
@@ -503,7 +506,7 @@ def analyze_sentiment(news_items: list) -> dict:
     Basic news sentiment: negative keyword check vs. overall volume.
     """
     if not news_items:
-        return {"score": 5, "details": "No news data; defaulting to neutral sentiment"}
+        return {"score": 5, "details": "No news data; defaulting to neutral sentiment", "data_available": False}
 
     negative_keywords = ["lawsuit", "fraud", "negative", "downturn", "decline", "investigation", "recall"]
     negative_count = 0
@@ -526,11 +529,10 @@ def analyze_sentiment(news_items: list) -> dict:
     return {"score": score, "details": "; ".join(details)}
 
 
-def generate_fisher_output(
-    ticker: str,
-    analysis_data: dict[str, any],
+async def generate_fisher_output(
+    analysis_data: dict[str, dict[str, any]],
     state: AgentState,
-) -> PhilFisherSignal:
+) -> dict[str, PhilFisherSignal]:
     """
     Generates a JSON signal in the style of Phil Fisher.
     """
@@ -582,8 +584,6 @@ def generate_fisher_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
-
     def create_default_signal():
         return PhilFisherSignal(
             signal="neutral",
@@ -591,8 +591,9 @@ def generate_fisher_output(
             reasoning="Error in analysis, defaulting to neutral"
         )
 
-    return call_llm(
-        prompt=prompt,
+    return await acall_llm_per_ticker(
+        template=template,
+        analysis_data=analysis_data,
         pydantic_model=PhilFisherSignal,
         state=state,
         agent_name="phil_fisher_agent",
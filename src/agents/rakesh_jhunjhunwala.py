@@ -4,8 +4,8 @@ from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
-from src.utils.llm import call_llm
+from src.tools.api import get_financial_metrics, get_market_cap, search_line_items_batch
+from src.utils.llm import acall_llm_per_ticker, is_rule_based, run_llm
 from src.utils.progress import progress
 
 class RakeshJhunjhunwalaSignal(BaseModel):
@@ -23,6 +23,27 @@ def rakesh_jhunjhunwala_agent(state: AgentState):
     analysis_data = {}
     jhunjhunwala_analysis = {}
 
+    # Search line items for all tickers in shared requests rather than one request per ticker
+    line_items_by_ticker = search_line_items_batch(
+        tickers,
+        [
+            "net_income",
+            "earnings_per_share",
+            "ebit",
+            "operating_income",
+            "revenue",
+            "operating_margin",
+            "total_assets",
+            "total_liabilities",
+            "current_assets",
+            "current_liabilities",
+            "free_cash_flow",
+            "dividends_and_other_cash_distributions",
+            "issuance_or_purchase_of_equity_shares"
+        ],
+        end_date,
+    )
+
     for ticker in tickers:
 
         # Core Data
@@ -30,25 +51,7 @@ def rakesh_jhunjhunwala_agent(state: AgentState):
         metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=5)
 
         progress.update_status("rakesh_jhunjhunwala_agent", ticker, "Fetching financial line items")
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "net_income",
-                "earnings_per_share",
-                "ebit",
-                "operating_income",
-                "revenue",
-                "operating_margin",
-                "total_assets",
-                "total_liabilities",
-                "current_assets",
-                "current_liabilities",
-                "free_cash_flow",
-                "dividends_and_other_cash_distributions",
-                "issuance_or_purchase_of_equity_shares"
-            ],
-            end_date,
-        )
+        financial_line_items = line_items_by_ticker[ticker]
 
         progress.update_status("rakesh_jhunjhunwala_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -132,15 +135,11 @@ def rakesh_jhunjhunwala_agent(state: AgentState):
             "market_cap": market_cap,
         }
 
-        # ─── LLM: craft Jhunjhunwala‑style narrative ──────────────────────────────
-        progress.update_status("rakesh_jhunjhunwala_agent", ticker, "Generating Jhunjhunwala analysis")
-        jhunjhunwala_output = generate_jhunjhunwala_output(
-            ticker=ticker,
-            analysis_data=analysis_data[ticker],
-            state=state,
-        )
-
-        jhunjhunwala_analysis[ticker] = jhunjhunwala_output.model_dump()
+    # ─── LLM: craft Jhunjhunwala‑style narrative ──────────────────────────────
+    # The LLM calls of all tickers run concurrently (or in batches of LLM_BATCH_SIZE tickers), bounded by the provider's concurrency limit
+    progress.update_status("rakesh_jhunjhunwala_agent", None, "Generating Jhunjhunwala analysis")
+    for ticker, jhunjhunwala_output in run_llm(generate_jhunjhunwala_output(analysis_data, state)).items():
+        jhunjhunwala_analysis[ticker] = {**jhunjhunwala_output.model_dump(), "rule_based": is_rule_based(jhunjhunwala_output)}
 
         progress.update_status("rakesh_jhunjhunwala_agent", ticker, "Done", analysis=jhunjhunwala_output.reasoning)
 
@@ -162,7 +161,7 @@ def analyze_profitability(financial_line_items: list) -> dict[str, any]:
     Focus on strong, consistent earnings growth and operating efficiency.
     """
     if not financial_line_items:
-        return {"score": 0, "details": "No profitability data available"}
+        return {"score": 0, "details": "No profitability data available", "data_available": False}
 
     latest = financial_line_items[0]
     score = 0
@@ -246,7 +245,7 @@ def analyze_growth(financial_line_items: list) -> dict[str, any]:
     Jhunjhunwala favored companies with strong, consistent compound growth.
     """
     if len(financial_line_items) < 3:
-        return {"score": 0, "details": "Insufficient data for growth analysis"}
+        return {"score": 0, "details": "Insufficient data for growth analysis", "data_available": False}
 
     score = 0
     reasoning = []
@@ -327,7 +326,7 @@ def analyze_balance_sheet(financial_line_items: list) -> dict[str, any]:
     Jhunjhunwala favored companies with clean balance sheets and manageable debt.
     """
     if not financial_line_items:
-        return {"score": 0, "details": "No balance sheet data"}
+        return {"score": 0, "details": "No balance sheet data", "data_available": False}
 
     latest = financial_line_items[0]
     score = 0
@@ -374,7 +373,7 @@ def analyze_cash_flow(financial_line_items: list) -> dict[str, any]:
     Jhunjhunwala appreciated companies generating strong free cash flow and rewarding shareholders.
     """
     if not financial_line_items:
-        return {"score": 0, "details": "No cash flow data"}
+        return {"score": 0, "details": "No cash flow data", "data_available": False}
 
     latest = financial_line_items[0]
     score = 0
@@ -409,7 +408,7 @@ def analyze_management_actions(financial_line_items: list) -> dict[str, any]:
     Jhunjhunwala liked managements who buy back shares or avoid dilution.
     """
     if not financial_line_items:
-        return {"score": 0, "details": "No management action data"}
+        return {"score": 0, "details": "No management action data", "data_available": False}
 
     latest = financial_line_items[0]
     score = 0
@@ -638,11 +637,10 @@ def analyze_rakesh_jhunjhunwala_style(
 # ────────────────────────────────────────────────────────────────────────────────
 # LLM generation
 # ────────────────────────────────────────────────────────────────────────────────
-def generate_jhunjhunwala_output(
-    ticker: str,
-    analysis_data: dict[str, any],
+async def generate_jhunjhunwala_output(
+    analysis_data: dict[str, dict[str, any]],
     state: AgentState,
-) -> RakeshJhunjhunwalaSignal:
+) -> dict[str, RakeshJhunjhunwalaSignal]:
     """Get investment decision from LLM with Jhunjhunwala's principles"""
     template = ChatPromptTemplate.from_messages(
         [
@@ -689,14 +687,13 @@ def generate_jhunjhunwala_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
-
     # Default fallback signal in case parsing fails
     def create_default_rakesh_jhunjhunwala_signal():
         return RakeshJhunjhunwalaSignal(signal="neutral", confidence=0.0, reasoning="Error in analysis, defaulting to neutral")
 
-    return call_llm(
-        prompt=prompt,
+    return await acall_llm_per_ticker(
+        template=template,
+        analysis_data=analysis_data,
         pydantic_model=RakeshJhunjhunwalaSignal,
         state=state,
         agent_name="rakesh_jhunjhunwala_agent",
@@ -1,7 +1,7 @@
 from langchain_core.messages import HumanMessage
 from src.graph.state import AgentState, show_agent_reasoning
 from src.utils.progress import progress
-from src.tools.api import get_prices, prices_to_df
+from src.tools.api import get_price_series, prices_to_df
 import json
 
 
@@ -22,7 +22,7 @@ def risk_management_agent(state: AgentState):
     for ticker in all_tickers:
         progress.update_status("risk_management_agent", ticker, "Fetching price data")
         
-        prices = get_prices(
+        prices = get_price_series(
             ticker=ticker,
             start_date=data["start_date"],
             end_date=data["end_date"],
@@ -1,11 +1,12 @@
+from src.data.price_series import PriceSeries
 from src.graph.state import AgentState, show_agent_reasoning
 from src.tools.api import (
     get_financial_metrics,
     get_market_cap,
-    search_line_items,
+    search_line_items_batch,
     get_insider_trades,
     get_company_news,
-    get_prices,
+    get_price_series,
 )
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
@@ -13,8 +14,8 @@ from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
-from src.utils.llm import call_llm
-import statistics
+from src.utils.llm import acall_llm_per_ticker, is_rule_based, run_llm
+import numpy as np
 
 
 class StanleyDruckenmillerSignal(BaseModel):
@@ -41,6 +42,30 @@ def stanley_druckenmiller_agent(state: AgentState):
     analysis_data = {}
     druck_analysis = {}
 
+    # Search line items for all tickers in shared requests rather than one request per ticker
+    line_items_by_ticker = search_line_items_batch(
+        tickers,
+        [
+            "revenue",
+            "earnings_per_share",
+            "net_income",
+            "operating_income",
+            "gross_margin",
+            "operating_margin",
+            "free_cash_flow",
+            "capital_expenditure",
+            "cash_and_equivalents",
+            "total_debt",
+            "shareholders_equity",
+            "outstanding_shares",
+            "ebit",
+            "ebitda",
+        ],
+        end_date,
+        period="annual",
+        limit=5,
+    )
+
     for ticker in tickers:
         progress.update_status("stanley_druckenmiller_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
@@ -51,28 +76,7 @@ def stanley_druckenmiller_agent(state: AgentState):
         #   - Valuation: net_income, free_cash_flow, ebit, ebitda
         #   - Leverage: total_debt, shareholders_equity
         #   - Liquidity: cash_and_equivalents
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "revenue",
-                "earnings_per_share",
-                "net_income",
-                "operating_income",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-                "ebit",
-                "ebitda",
-            ],
-            end_date,
-            period="annual",
-            limit=5,
-        )
+        financial_line_items = line_items_by_ticker[ticker]
 
         progress.update_status("stanley_druckenmiller_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -84,7 +88,7 @@ def stanley_druckenmiller_agent(state: AgentState):
         company_news = get_company_news(ticker, end_date, start_date=None, limit=50)
 
         progress.update_status("stanley_druckenmiller_agent", ticker, "Fetching recent price data for momentum")
-        prices = get_prices(ticker, start_date=start_date, end_date=end_date)
+        prices = get_price_series(ticker, start_date=start_date, end_date=end_date)
 
         progress.update_status("stanley_druckenmiller_agent", ticker, "Analyzing growth & momentum")
         growth_momentum_analysis = analyze_growth_and_momentum(financial_line_items, prices)
@@ -133,17 +137,14 @@ def stanley_druckenmiller_agent(state: AgentState):
             "valuation_analysis": valuation_analysis,
         }
 
-        progress.update_status("stanley_druckenmiller_agent", ticker, "Generating Stanley Druckenmiller analysis")
-        druck_output = generate_druckenmiller_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
-
+    # The LLM calls of all tickers run concurrently (or in batches of LLM_BATCH_SIZE tickers), bounded by the provider's concurrency limit
+    progress.update_status("stanley_druckenmiller_agent", None, "Generating Stanley Druckenmiller analysis")
+    for ticker, druck_output in run_llm(generate_druckenmiller_output(analysis_data, state)).items():
         druck_analysis[ticker] = {
             "signal": druck_output.signal,
             "confidence": druck_output.confidence,
             "reasoning": druck_output.reasoning,
+            "rule_based": is_rule_based(druck_output),
         }
 
         progress.update_status("stanley_druckenmiller_agent", ticker, "Done", analysis=druck_output.reasoning)
@@ -161,7 +162,7 @@ def stanley_druckenmiller_agent(state: AgentState):
     return {"messages": [message], "data": state["data"]}
 
 
-def analyze_growth_and_momentum(financial_line_items: list, prices: list) -> dict:
+def analyze_growth_and_momentum(financial_line_items: list, prices: PriceSeries) -> dict:
     """
     Evaluate:
       - Revenue Growth (YoY)
@@ -169,7 +170,7 @@ def analyze_growth_and_momentum(financial_line_items: list, prices: list) -> dic
       - Price Momentum
     """
     if not financial_line_items or len(financial_line_items) < 2:
-        return {"score": 0, "details": "Insufficient financial data for growth analysis"}
+        return {"score": 0, "details": "Insufficient financial data for growth analysis", "data_available": False}
 
     details = []
     raw_score = 0  # We'll sum up a maximum of 9 raw points, then scale to 0–10
@@ -230,8 +231,8 @@ def analyze_growth_and_momentum(financial_line_items: list, prices: list) -> dic
     #
     # We'll give up to 3 points for strong momentum
     if prices and len(prices) > 30:
-        sorted_prices = sorted(prices, key=lambda p: p.time)
-        close_prices = [p.close for p in sorted_prices if p.close is not None]
+        # The series is already sorted by date
+        close_prices = prices.close
         if len(close_prices) >= 2:
             start_price = close_prices[0]
             end_price = close_prices[-1]
@@ -277,7 +278,7 @@ def analyze_insider_activity(insider_trades: list) -> dict:
 
     if not insider_trades:
         details.append("No insider trades data; defaulting to neutral")
-        return {"score": score, "details": "; ".join(details)}
+        return {"score": score, "details": "; ".join(details), "data_available": False}
 
     buys, sells = 0, 0
     for trade in insider_trades:
@@ -316,7 +317,7 @@ def analyze_sentiment(news_items: list) -> dict:
     Basic news sentiment: negative keyword check vs. overall volume.
     """
     if not news_items:
-        return {"score": 5, "details": "No news data; defaulting to neutral sentiment"}
+        return {"score": 5, "details": "No news data; defaulting to neutral sentiment", "data_available": False}
 
     negative_keywords = ["lawsuit", "fraud", "negative", "downturn", "decline", "investigation", "recall"]
     negative_count = 0
@@ -342,7 +343,7 @@ def analyze_sentiment(news_items: list) -> dict:
     return {"score": score, "details": "; ".join(details)}
 
 
-def analyze_risk_reward(financial_line_items: list, prices: list) -> dict:
+def analyze_risk_reward(financial_line_items: list, prices: PriceSeries) -> dict:
     """
     Assesses risk via:
       - Debt-to-Equity
@@ -350,7 +351,7 @@ def analyze_risk_reward(financial_line_items: list, prices: list) -> dict:
     Aims for strong upside with contained downside.
     """
     if not financial_line_items or not prices:
-        return {"score": 0, "details": "Insufficient data for risk-reward analysis"}
+        return {"score": 0, "details": "Insufficient data for risk-reward analysis", "data_available": False}
 
     details = []
     raw_score = 0  # We'll accumulate up to 6 raw points, then scale to 0-10
@@ -383,16 +384,13 @@ def analyze_risk_reward(financial_line_items: list, prices: list) -> dict:
     # 2. Price Volatility
     #
     if len(prices) > 10:
-        sorted_prices = sorted(prices, key=lambda p: p.time)
-        close_prices = [p.close for p in sorted_prices if p.close is not None]
+        close_prices = prices.close
         if len(close_prices) > 10:
-            daily_returns = []
-            for i in range(1, len(close_prices)):
-                prev_close = close_prices[i - 1]
-                if prev_close > 0:
-                    daily_returns.append((close_prices[i] - prev_close) / prev_close)
-            if daily_returns:
-                stdev = statistics.pstdev(daily_returns)  # population stdev
+            prev_close = close_prices[:-1]
+            valid = prev_close > 0
+            daily_returns = (close_prices[1:][valid] - prev_close[valid]) / prev_close[valid]
+            if len(daily_returns):
+                stdev = float(np.std(daily_returns))  # population stdev
                 if stdev < 0.01:
                     raw_score += 3
                     details.append(f"Low volatility: daily returns stdev {stdev:.2%}")
@@ -426,7 +424,7 @@ def analyze_druckenmiller_valuation(financial_line_items: list, market_cap: floa
     Each can yield up to 2 points => max 8 raw points => scale to 0–10.
     """
     if not financial_line_items or market_cap is None:
-        return {"score": 0, "details": "Insufficient data to perform valuation"}
+        return {"score": 0, "details": "Insufficient data to perform valuation", "data_available": False}
 
     details = []
     raw_score = 0
@@ -520,11 +518,10 @@ def analyze_druckenmiller_valuation(financial_line_items: list, market_cap: floa
     return {"score": final_score, "details": "; ".join(details)}
 
 
-def generate_druckenmiller_output(
-    ticker: str,
-    analysis_data: dict[str, any],
+async def generate_druckenmiller_output(
+    analysis_data: dict[str, dict[str, any]],
     state: AgentState,
-) -> StanleyDruckenmillerSignal:
+) -> dict[str, StanleyDruckenmillerSignal]:
     """
     Generates a JSON signal in the style of Stanley Druckenmiller.
     """
@@ -577,8 +574,6 @@ def generate_druckenmiller_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
-
     def create_default_signal():
         return StanleyDruckenmillerSignal(
             signal="neutral",
@@ -586,8 +581,9 @@ def generate_druckenmiller_output(
             reasoning="Error in analysis, defaulting to neutral"
         )
 
-    return call_llm(
-        prompt=prompt,
+    return await acall_llm_per_ticker(
+        template=template,
+        analysis_data=analysis_data,
         pydantic_model=StanleyDruckenmillerSignal,
         agent_name="stanley_druckenmiller_agent",
         state=state,
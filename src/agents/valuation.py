@@ -15,7 +15,7 @@ from src.utils.progress import progress
 from src.tools.api import (
     get_financial_metrics,
     get_market_cap,
-    search_line_items,
+    search_line_items_batch,
 )
 
 def valuation_analyst_agent(state: AgentState):
@@ -27,6 +27,21 @@ def valuation_analyst_agent(state: AgentState):
 
     valuation_analysis: dict[str, dict] = {}
 
+    # Search line items for all tickers in shared requests rather than one request per ticker
+    line_items_by_ticker = search_line_items_batch(
+        tickers=tickers,
+        line_items=[
+            "free_cash_flow",
+            "net_income",
+            "depreciation_and_amortization",
+            "capital_expenditure",
+            "working_capital",
+        ],
+        end_date=end_date,
+        period="ttm",
+        limit=2,
+    )
+
     for ticker in tickers:
         progress.update_status("valuation_analyst_agent", ticker, "Fetching financial data")
 
@@ -44,19 +59,7 @@ def valuation_analyst_agent(state: AgentState):
 
         # --- Fine‑grained line‑items (need two periods to calc WC change) ---
         progress.update_status("valuation_analyst_agent", ticker, "Gathering line items")
-        line_items = search_line_items(
-            ticker=ticker,
-            line_items=[
-                "free_cash_flow",
-                "net_income",
-                "depreciation_and_amortization",
-                "capital_expenditure",
-                "working_capital",
-            ],
-            end_date=end_date,
-            period="ttm",
-            limit=2,
-        )
+        line_items = line_items_by_ticker[ticker]
         if len(line_items) < 2:
             progress.update_status("valuation_analyst_agent", ticker, "Failed: Insufficient financial line items")
             continue
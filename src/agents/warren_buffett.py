@@ -4,8 +4,8 @@ from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
-from src.utils.llm import call_llm
+from src.tools.api import get_financial_metrics, get_market_cap, search_line_items_batch
+from src.utils.llm import acall_llm_per_ticker, is_rule_based, run_llm
 from src.utils.progress import progress
 
 
@@ -25,32 +25,35 @@ def warren_buffett_agent(state: AgentState):
     analysis_data = {}
     buffett_analysis = {}
 
+    # Search line items for all tickers in shared requests rather than one request per ticker
+    line_items_by_ticker = search_line_items_batch(
+        tickers,
+        [
+            "capital_expenditure",
+            "depreciation_and_amortization",
+            "net_income",
+            "outstanding_shares",
+            "total_assets",
+            "total_liabilities",
+            "shareholders_equity",
+            "dividends_and_other_cash_distributions",
+            "issuance_or_purchase_of_equity_shares",
+            "gross_profit",
+            "revenue",
+            "free_cash_flow",
+        ],
+        end_date,
+        period="ttm",
+        limit=10,
+    )
+
     for ticker in tickers:
         progress.update_status("warren_buffett_agent", ticker, "Fetching financial metrics")
         # Fetch required data - request more periods for better trend analysis
         metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=10)
 
         progress.update_status("warren_buffett_agent", ticker, "Gathering financial line items")
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "capital_expenditure",
-                "depreciation_and_amortization",
-                "net_income",
-                "outstanding_shares",
-                "total_assets",
-                "total_liabilities",
-                "shareholders_equity",
-                "dividends_and_other_cash_distributions",
-                "issuance_or_purchase_of_equity_shares",
-                "gross_profit",
-                "revenue",
-                "free_cash_flow",
-            ],
-            end_date,
-            period="ttm",
-            limit=10,
-        )
+        financial_line_items = line_items_by_ticker[ticker]
 
         progress.update_status("warren_buffett_agent", ticker, "Getting market cap")
         # Get current market cap
@@ -119,18 +122,15 @@ def warren_buffett_agent(state: AgentState):
             "margin_of_safety": margin_of_safety,
         }
 
-        progress.update_status("warren_buffett_agent", ticker, "Generating Warren Buffett analysis")
-        buffett_output = generate_buffett_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
-
+    # The LLM calls of all tickers run concurrently (or in batches of LLM_BATCH_SIZE tickers), bounded by the provider's concurrency limit
+    progress.update_status("warren_buffett_agent", None, "Generating Warren Buffett analysis")
+    for ticker, buffett_output in run_llm(generate_buffett_output(analysis_data, state)).items():
         # Store analysis in consistent format with other agents
         buffett_analysis[ticker] = {
             "signal": buffett_output.signal,
             "confidence": buffett_output.confidence,
             "reasoning": buffett_output.reasoning,
+            "rule_based": is_rule_based(buffett_output),
         }
 
         progress.update_status("warren_buffett_agent", ticker, "Done", analysis=buffett_output.reasoning)
@@ -153,7 +153,7 @@ def warren_buffett_agent(state: AgentState):
 def analyze_fundamentals(metrics: list) -> dict[str, any]:
     """Analyze company fundamentals based on Buffett's criteria."""
     if not metrics:
-        return {"score": 0, "details": "Insufficient fundamental data"}
+        return {"score": 0, "details": "Insufficient fundamental data", "data_available": False}
 
     latest_metrics = metrics[0]
 
@@ -202,7 +202,7 @@ def analyze_fundamentals(metrics: list) -> dict[str, any]:
 def analyze_consistency(financial_line_items: list) -> dict[str, any]:
     """Analyze earnings consistency and growth."""
     if len(financial_line_items) < 4:  # Need at least 4 periods for trend analysis
-        return {"score": 0, "details": "Insufficient historical data"}
+        return {"score": 0, "details": "Insufficient historical data", "data_available": False}
 
     score = 0
     reasoning = []
@@ -243,7 +243,7 @@ def analyze_moat(metrics: list) -> dict[str, any]:
     5. Switching costs (inferred from customer retention)
     """
     if not metrics or len(metrics) < 5:  # Need more data for proper moat analysis
-        return {"score": 0, "max_score": 5, "details": "Insufficient data for comprehensive moat analysis"}
+        return {"score": 0, "max_score": 5, "details": "Insufficient data for comprehensive moat analysis", "data_available": False}
 
     reasoning = []
     moat_score = 0
@@ -338,7 +338,7 @@ def analyze_management_quality(financial_line_items: list) -> dict[str, any]:
       - if there's a big new issuance, it might be a negative sign (dilution).
     """
     if not financial_line_items:
-        return {"score": 0, "max_score": 2, "details": "Insufficient data for management analysis"}
+        return {"score": 0, "max_score": 2, "details": "Insufficient data for management analysis", "data_available": False}
 
     reasoning = []
     mgmt_score = 0
@@ -617,7 +617,7 @@ def analyze_book_value_growth(financial_line_items: list) -> dict[str, any]:
     Buffett often talks about companies that compound book value over decades.
     """
     if len(financial_line_items) < 3:
-        return {"score": 0, "details": "Insufficient data for book value analysis"}
+        return {"score": 0, "details": "Insufficient data for book value analysis", "data_available": False}
     
     score = 0
     reasoning = []
@@ -679,7 +679,7 @@ def analyze_pricing_power(financial_line_items: list, metrics: list) -> dict[str
     Looks at ability to raise prices without losing customers (margin expansion during inflation).
     """
     if not financial_line_items or not metrics:
-        return {"score": 0, "details": "Insufficient data for pricing power analysis"}
+        return {"score": 0, "details": "Insufficient data for pricing power analysis", "data_available": False}
     
     score = 0
     reasoning = []
@@ -723,11 +723,10 @@ def analyze_pricing_power(financial_line_items: list, metrics: list) -> dict[str
     }
 
 
-def generate_buffett_output(
-    ticker: str,
-    analysis_data: dict[str, any],
+async def generate_buffett_output(
+    analysis_data: dict[str, dict[str, any]],
     state: AgentState,
-) -> WarrenBuffettSignal:
+) -> dict[str, WarrenBuffettSignal]:
     """Get investment decision from LLM with Buffett's principles"""
     template = ChatPromptTemplate.from_messages(
         [
@@ -819,14 +818,13 @@ def generate_buffett_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
-
     # Default fallback signal in case parsing fails
     def create_default_warren_buffett_signal():
         return WarrenBuffettSignal(signal="neutral", confidence=0.0, reasoning="Error in analysis, defaulting to neutral")
 
-    return call_llm(
-        prompt=prompt,
+    return await acall_llm_per_ticker(
+        template=template,
+        analysis_data=analysis_data,
         pydantic_model=WarrenBuffettSignal,
         agent_name="warren_buffett_agent",
         state=state,
@@ -20,7 +20,8 @@ from src.tools.api import (
     get_financial_metrics,
     get_insider_trades,
 )
-from src.utils.display import print_backtest_results, format_backtest_row
+from src.utils.display import print_backtest_results, format_backtest_row, print_data_stats
+from src.data.stats import get_data_stats
 from typing_extensions import Callable
 from src.utils.ollama import ensure_ollama_and_model
 
@@ -774,3 +775,4 @@ if __name__ == "__main__":
 
     performance_metrics = backtester.run_backtest()
     performance_df = backtester.analyze_performance()
+    print_data_stats(get_data_stats().snapshot())
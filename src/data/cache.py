@@ -1,65 +1,580 @@
+import asyncio
+import bisect
+import functools
+import os
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from datetime import date, timedelta
+
+from pydantic import BaseModel
+
+from src.data.freshness import FreshnessPolicy
+from src.data.lru import LRUCache
+from src.data.market_calendar import has_trading_day
+from src.data.models import CompanyFacts, CompanyNews, FinancialMetrics, InsiderTrade
+from src.data.price_series import PriceSeries
+from src.data.record_table import RecordTable
+from src.data.stats import get_data_stats
+from src.data.store import SQLiteStore
+
+# Environment variable pointing at the directory of the persistent cache tier
+CACHE_DIR_ENV = "FINANCIAL_DATA_CACHE_DIR"
+
+# Environment variable capping the memory of each cache category, in megabytes.
+# A category can be overridden with a suffix, e.g. FINANCIAL_DATA_CACHE_MAX_MB_COMPANY_NEWS.
+CACHE_MAX_MB_ENV = "FINANCIAL_DATA_CACHE_MAX_MB"
+
+# Environment variable marking the persistent cache as shared by several processes (e.g. uvicorn workers).
+# Shared caches check their in-memory entries against the store and fetch each key in one process at a time.
+CACHE_SHARED_ENV = "FINANCIAL_DATA_CACHE_SHARED"
+
+# Environment variable with the seconds a writer waits for the store's write lock before failing
+CACHE_BUSY_TIMEOUT_ENV = "FINANCIAL_DATA_CACHE_BUSY_TIMEOUT"
+
+# Environment variable with the seconds a process may hold the lease on fetching a key before others take over
+CACHE_LEASE_SECONDS_ENV = "FINANCIAL_DATA_CACHE_LEASE_SECONDS"
+
+# Seconds between attempts to take a lease held by another process
+LEASE_POLL_SECONDS = 0.05
+
+# Lease token handed out when the cache is not shared, so there is nobody to exclude
+_LOCAL_LEASE = "local"
+
+_UNSET = object()
+
+# Start of the coverage recorded when a query without a start date returned everything up to its end date
+_EARLIEST_DATE = "0001-01-01"
+
+# Field that insider trades and company news are filtered and ordered by
+_DATE_FIELDS = {"insider_trades": "filing_date", "company_news": "date"}
+
+# String fields of insider trades and company news whose values repeat across records and are shared in memory
+_INTERNED_FIELDS = {
+    "insider_trades": ("ticker", "issuer", "name", "title", "security_title", "transaction_date", "filing_date"),
+    "company_news": ("ticker", "author", "source", "sentiment"),
+}
+
+# Categories whose large payloads are gzip-compressed in the persistent store
+_COMPRESSED_CATEGORIES = {"insider_trades", "company_news"}
+
+
+def _dated_records_entry(table: RecordTable, date_field: str, ranges: list, live: list | None) -> dict:
+    """Entry of date-sorted records with the day index used to slice them by date."""
+    days = [sys.intern(day[:10]) for day in table.column(date_field)]
+    return {"records": table, "days": days, "ranges": ranges, "live": live}
+
+
+def _dated_records_codec(model: type[BaseModel], category: str) -> tuple:
+    """Codec persisting date-sorted records column by column; the day index is rebuilt once when loaded."""
+
+    def decode(data: dict) -> dict:
+        if isinstance(data["records"], list):
+            # Entries written before records were stored by column hold one dict per record
+            table = RecordTable.from_records(model, [model.model_validate(record) for record in data["records"]], _INTERNED_FIELDS[category])
+        else:
+            table = RecordTable.from_columns(model, data["records"], _INTERNED_FIELDS[category])
+        return _dated_records_entry(table, _DATE_FIELDS[category], data["ranges"], data["live"])
+
+    return (
+        lambda entry: {"records": entry["records"].to_columns(), "ranges": entry["ranges"], "live": entry["live"]},
+        decode,
+    )
+
+
+# Categories whose in-memory representation differs from the JSON kept in the
+# persistent store, mapped to their (encode, decode) functions
+_CODECS = {
+    "financial_metrics": (
+        lambda entry: {"rows": {report_period: metrics.model_dump() for report_period, metrics in entry["rows"].items()}, "queries": entry["queries"]},
+        lambda data: {"rows": {report_period: FinancialMetrics.model_validate(metrics) for report_period, metrics in data["rows"].items()}, "queries": data["queries"]},
+    ),
+    "insider_trades": _dated_records_codec(InsiderTrade, "insider_trades"),
+    "company_news": _dated_records_codec(CompanyNews, "company_news"),
+    "company_facts": (lambda facts: facts.model_dump(), CompanyFacts.model_validate),
+    "prices": (
+        lambda entry: {"series": entry["series"].to_columns(), "ranges": entry["ranges"], "live": entry.get("live")},
+        lambda data: {"series": PriceSeries.from_columns(data["series"]), "ranges": data["ranges"], "live": data.get("live")},
+    ),
+}
+
+# Fields present on every line item regardless of which line items were requested
+LINE_ITEM_BASE_FIELDS = ("ticker", "report_period", "period", "currency")
+
+
+def _synchronized(method):
+    """Run a Cache method while holding the cache lock."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _synchronized_update(method):
+    """Run a Cache read-modify-write holding the cache lock and the store's write lock, so no other process interleaves."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            store = self._get_store()
+            with store.transaction() if store else nullcontext():
+                return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _next_day(day: str) -> str:
+    return (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+
+
+def _previous_day(day: str) -> str:
+    return (date.fromisoformat(day) - timedelta(days=1)).isoformat()
+
+
+def _missing_ranges(ranges: list[list[str]], start_date: str, end_date: str) -> list[tuple[str, str]]:
+    """Return the sub-ranges of [start_date, end_date] not covered by the sorted, disjoint ranges."""
+    if start_date > end_date:
+        return []
+    missing = []
+    cursor = start_date
+    for covered_start, covered_end in ranges:
+        if covered_end < cursor:
+            continue
+        if covered_start > end_date:
+            break
+        if covered_start > cursor:
+            missing.append((cursor, _previous_day(covered_start)))
+        cursor = _next_day(covered_end)
+        if cursor > end_date:
+            return missing
+    missing.append((cursor, end_date))
+    return missing
+
+
+def _add_range(ranges: list[list[str]], start_date: str, end_date: str) -> list[list[str]]:
+    """Add [start_date, end_date] to sorted, disjoint ranges, coalescing overlapping and adjacent ones."""
+    merged = []
+    for covered_start, covered_end in sorted([*ranges, [start_date, end_date]]):
+        if merged and covered_start <= _next_day(merged[-1][1]):
+            merged[-1][1] = max(merged[-1][1], covered_end)
+        else:
+            merged.append([covered_start, covered_end])
+    return merged
+
+
 class Cache:
-    """In-memory cache for API responses."""
-
-    def __init__(self):
-        self._prices_cache: dict[str, list[dict[str, any]]] = {}
-        self._financial_metrics_cache: dict[str, list[dict[str, any]]] = {}
-        self._line_items_cache: dict[str, list[dict[str, any]]] = {}
-        self._insider_trades_cache: dict[str, list[dict[str, any]]] = {}
-        self._company_news_cache: dict[str, list[dict[str, any]]] = {}
-
-    def _merge_data(self, existing: list[dict] | None, new_data: list[dict], key_field: str) -> list[dict]:
-        """Merge existing and new data, avoiding duplicates based on a key field."""
-        if not existing:
-            return new_data
-
-        # Create a set of existing keys for O(1) lookup
-        existing_keys = {item[key_field] for item in existing}
-
-        # Only add items that don't exist yet
-        merged = existing.copy()
-        merged.extend([item for item in new_data if item[key_field] not in existing_keys])
-        return merged
-
-    def get_prices(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached price data if available."""
-        return self._prices_cache.get(ticker)
-
-    def set_prices(self, ticker: str, data: list[dict[str, any]]):
-        """Append new price data to cache."""
-        self._prices_cache[ticker] = self._merge_data(self._prices_cache.get(ticker), data, key_field="time")
-
-    def get_financial_metrics(self, ticker: str) -> list[dict[str, any]]:
-        """Get cached financial metrics if available."""
-        return self._financial_metrics_cache.get(ticker)
-
-    def set_financial_metrics(self, ticker: str, data: list[dict[str, any]]):
-        """Append new financial metrics to cache."""
-        self._financial_metrics_cache[ticker] = self._merge_data(self._financial_metrics_cache.get(ticker), data, key_field="report_period")
-
-    def get_line_items(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached line items if available."""
-        return self._line_items_cache.get(ticker)
-
-    def set_line_items(self, ticker: str, data: list[dict[str, any]]):
-        """Append new line items to cache."""
-        self._line_items_cache[ticker] = self._merge_data(self._line_items_cache.get(ticker), data, key_field="report_period")
-
-    def get_insider_trades(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached insider trades if available."""
-        return self._insider_trades_cache.get(ticker)
-
-    def set_insider_trades(self, ticker: str, data: list[dict[str, any]]):
-        """Append new insider trades to cache."""
-        self._insider_trades_cache[ticker] = self._merge_data(self._insider_trades_cache.get(ticker), data, key_field="filing_date")  # Could also use transaction_date if preferred
-
-    def get_company_news(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached company news if available."""
-        return self._company_news_cache.get(ticker)
-
-    def set_company_news(self, ticker: str, data: list[dict[str, any]]):
-        """Append new company news to cache."""
-        self._company_news_cache[ticker] = self._merge_data(self._company_news_cache.get(ticker), data, key_field="date")
+    """In-memory cache for API responses, optionally backed by a persistent store.
+
+    Reads go to memory first and fall through to the persistent store on a miss;
+    writes go to both. Each category in memory is an LRU bounded by a byte
+    budget; evicted entries are simply reloaded from the persistent store.
+    Data that can still change (anything reaching today, and company facts)
+    expires according to the freshness policy; historical data never does.
+    The store and budgets are resolved lazily so that environment variables
+    loaded after import (e.g. from a .env file) are still honored.
+
+    Several processes can share one persistent store. In shared mode each read
+    from memory is checked against the entry's version in the store, updates
+    are atomic across processes, and `lease` lets a single process fetch the
+    data behind a key while the others wait and then read it from the store.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        max_bytes: int | dict[str, int] | None = None,
+        freshness: FreshnessPolicy | None = None,
+        shared: bool | None = None,
+    ):
+        self._cache_dir = cache_dir
+        self._max_bytes = max_bytes
+        self._shared = shared
+        # Store version of each entry held in memory, checked in shared mode
+        self._versions: dict[tuple[str, str], int] = {}
+        self.freshness = freshness or FreshnessPolicy()
+        # Agents run concurrently, so reads and read-modify-write updates are serialized
+        self._lock = threading.RLock()
+        self._store = _UNSET
+        self._prices_cache = LRUCache()
+        self._financial_metrics_cache = LRUCache()
+        self._line_items_cache = LRUCache()
+        self._insider_trades_cache = LRUCache()
+        self._company_news_cache = LRUCache()
+        self._company_facts_cache = LRUCache()
+        self._categories = {
+            "prices": self._prices_cache,
+            "financial_metrics": self._financial_metrics_cache,
+            "line_items": self._line_items_cache,
+            "insider_trades": self._insider_trades_cache,
+            "company_news": self._company_news_cache,
+            "company_facts": self._company_facts_cache,
+        }
+
+    def _get_store(self) -> SQLiteStore | None:
+        """Open the persistent store and apply the memory budgets on first use."""
+        if self._store is _UNSET:
+            cache_dir = self._cache_dir or os.environ.get(CACHE_DIR_ENV)
+            busy_timeout = float(os.environ.get(CACHE_BUSY_TIMEOUT_ENV) or 30)
+            self._store = SQLiteStore(cache_dir, busy_timeout) if cache_dir else None
+            if self._shared is None:
+                self._shared = os.environ.get(CACHE_SHARED_ENV, "").lower() in ("1", "true", "yes")
+            for category, cache in self._categories.items():
+                cache.set_max_bytes(self._budget(category))
+        return self._store
+
+    def _budget(self, category: str) -> int | None:
+        """Memory budget of a category in bytes, or None if unbounded."""
+        if isinstance(self._max_bytes, dict):
+            return self._max_bytes.get(category)
+        if self._max_bytes is not None:
+            return self._max_bytes
+        max_mb = os.environ.get(f"{CACHE_MAX_MB_ENV}_{category.upper()}") or os.environ.get(CACHE_MAX_MB_ENV)
+        return int(float(max_mb) * 1024 * 1024) if max_mb else None
+
+    def _get(self, cache: LRUCache, category: str, key: str) -> any:
+        """Read through the in-memory cache to the persistent store, skipping expired entries."""
+        store = self._get_store()
+        if (data := cache.get(key)) is not None:
+            # Another process may have updated a shared store since this entry was loaded
+            if not (store and self._shared) or store.get_version(category, key) == self._versions.get((category, key)):
+                get_data_stats().record_tier_read(category, "memory")
+                return data
+        if store:
+            if entry := store.get_entry(category, key):
+                data, expires_at, self._versions[(category, key)] = entry
+                if codec := _CODECS.get(category):
+                    data = codec[1](data)
+                cache.set(key, data, expires_at)
+                get_data_stats().record_tier_read(category, "disk")
+                return data
+        return None
+
+    def _set(self, cache: LRUCache, category: str, key: str, data: any, expires_at: float | None = None):
+        """Write to the in-memory cache and the persistent store, optionally expiring at a Unix timestamp."""
+        store = self._get_store()
+        cache.set(key, data, expires_at)
+        if store:
+            if codec := _CODECS.get(category):
+                data = codec[0](data)
+            self._versions[(category, key)] = store.set(category, key, data, expires_at, compress=category in _COMPRESSED_CATEGORIES)
+
+    def _coverage(self, entry: dict | None) -> list[list[str]]:
+        """Date ranges a range-covered entry can answer: its final data plus today's window until it expires."""
+        if not entry:
+            return []
+        live = entry.get("live")
+        # A window fetched on an earlier day holds that day's intraday data, so it is stale once the day is over
+        if live and not self.freshness.is_expired(live[2]) and live[0] >= self.freshness.today():
+            return _add_range(entry["ranges"], live[0], live[1])
+        return entry["ranges"]
+
+    def _cover(self, entry: dict, category: str, start_date: str, end_date: str) -> tuple[list[list[str]], list | None]:
+        """Record [start_date, end_date] as fetched, returning the entry's new (ranges, live) coverage."""
+        ranges, live = entry["ranges"], entry.get("live")
+        # Data up to yesterday is final; anything from today on can still change, so its coverage expires
+        historical_end = min(end_date, self.freshness.yesterday())
+        if start_date <= historical_end:
+            ranges = _add_range(ranges, start_date, historical_end)
+        if self.freshness.is_live(end_date):
+            live = [max(start_date, self.freshness.today()), end_date, self.freshness.expires_at(category, end_date)]
+        return ranges, live
+
+    def _missing_price_ranges(self, entry: dict | None, start_date: str, end_date: str) -> list[tuple[str, str]]:
+        """Uncovered parts of a date range, skipping gaps such as weekends and holidays in which the market never opened."""
+        return [(missing_start, missing_end) for missing_start, missing_end in _missing_ranges(self._coverage(entry), start_date, end_date) if has_trading_day(missing_start, missing_end)]
+
+    @_synchronized
+    def get_prices(self, ticker: str, start_date: str, end_date: str) -> PriceSeries | None:
+        """Get cached price data for a date range if every trading day in it is covered."""
+        entry = self._get(self._prices_cache, "prices", ticker)
+        if self._missing_price_ranges(entry, start_date, end_date):
+            return None
+        # A range without trading days has no bars to fetch
+        return entry["series"].slice(start_date, end_date) if entry else PriceSeries.empty()
+
+    @_synchronized
+    def get_cached_prices(self, ticker: str, start_date: str, end_date: str) -> PriceSeries:
+        """Get whatever price data is cached for a date range, even if parts of it are missing."""
+        entry = self._get(self._prices_cache, "prices", ticker)
+        return entry["series"].slice(start_date, end_date) if entry else PriceSeries.empty()
+
+    @_synchronized
+    def get_missing_price_ranges(self, ticker: str, start_date: str, end_date: str) -> list[tuple[str, str]]:
+        """Get the parts of a date range that still have to be fetched for a ticker.
+
+        Once the series covers up to the previous trading day, only the days after it are
+        fetched, so a window moved forward by a day costs one small request.
+        """
+        entry = self._get(self._prices_cache, "prices", ticker)
+        return self._missing_price_ranges(entry, start_date, end_date)
+
+    @_synchronized_update
+    def set_prices(self, ticker: str, data: PriceSeries, start_date: str, end_date: str):
+        """Merge price data fetched for a date range into the ticker's series."""
+        entry = self._get(self._prices_cache, "prices", ticker) or {"series": PriceSeries.empty(), "ranges": [], "live": None}
+        ranges, live = self._cover(entry, "prices", start_date, end_date)
+        # Freshly fetched bars replace cached ones, so a refreshed bar for today wins
+        self._set(self._prices_cache, "prices", ticker, {"series": data.merge(entry["series"]), "ranges": ranges, "live": live})
+
+    @_synchronized
+    def get_financial_metrics(self, ticker: str, period: str, end_date: str, limit: int) -> list[FinancialMetrics] | None:
+        """Get cached financial metrics from any stored query that ended on or after end_date and holds enough periods."""
+        entry = self._get(self._financial_metrics_cache, "financial_metrics", f"{ticker}_{period}")
+        if not entry:
+            return None
+        for query_end_date, query in entry["queries"].items():
+            if query_end_date < end_date or self.freshness.is_expired(query.get("expires_at")):
+                continue
+            # Results are ordered newest first, so the periods up to end_date are the ones an earlier query would return
+            report_periods = [report_period for report_period in query["report_periods"] if report_period <= end_date]
+            # A query that returned fewer periods than its limit already holds every available period
+            if len(report_periods) >= limit or len(query["report_periods"]) < query["limit"]:
+                return [entry["rows"][report_period] for report_period in report_periods[:limit]]
+        return None
+
+    @_synchronized_update
+    def set_financial_metrics(self, ticker: str, period: str, end_date: str, limit: int, data: list[FinancialMetrics]):
+        """Merge financial metrics fetched for a query into the per-period store."""
+        key = f"{ticker}_{period}"
+        entry = self._get(self._financial_metrics_cache, "financial_metrics", key) or {"rows": {}, "queries": {}}
+        rows = {**entry["rows"], **{metrics.report_period: metrics for metrics in data}}
+        query = {"limit": limit, "report_periods": [metrics.report_period for metrics in data], "expires_at": self.freshness.expires_at("financial_metrics", end_date)}
+        self._set(self._financial_metrics_cache, "financial_metrics", key, {"rows": rows, "queries": {**entry["queries"], end_date: query}})
+
+    def _get_line_item_query(self, ticker: str, period: str, end_date: str, limit: int) -> dict | None:
+        """Get the stored line item query for an end date if it covers the requested limit."""
+        entry = self._get(self._line_items_cache, "line_items", f"{ticker}_{period}")
+        if not entry or not (query := entry["queries"].get(end_date)) or self.freshness.is_expired(query.get("expires_at")):
+            return None
+        # A query that returned fewer periods than its limit already holds every available period
+        if limit > query["limit"] and len(query["report_periods"]) >= query["limit"]:
+            return None
+        return query
+
+    @_synchronized
+    def get_line_items(self, ticker: str, period: str, end_date: str, limit: int, line_items: list[str]) -> list[dict[str, any]] | None:
+        """Get cached line items if every requested field is stored for the requested periods."""
+        query = self._get_line_item_query(ticker, period, end_date, limit)
+        if not query or not set(line_items) <= set(query["line_items"]):
+            return None
+        rows = self._get(self._line_items_cache, "line_items", f"{ticker}_{period}")["rows"]
+        results = []
+        for report_period in query["report_periods"][:limit]:
+            row = rows[report_period]
+            item = {field: row[field] for field in LINE_ITEM_BASE_FIELDS}
+            item.update({field: row[field] for field in line_items if field in row})
+            results.append(item)
+        return results
+
+    @_synchronized
+    def get_cached_line_item_rows(self, ticker: str, period: str, end_date: str, limit: int) -> list[dict[str, any]]:
+        """Get whatever fields are cached for a query's periods, even if some requested fields are missing."""
+        query = self._get_line_item_query(ticker, period, end_date, limit)
+        if not query:
+            return []
+        rows = self._get(self._line_items_cache, "line_items", f"{ticker}_{period}")["rows"]
+        return [rows[report_period] for report_period in query["report_periods"][:limit]]
+
+    @_synchronized
+    def get_missing_line_items(self, ticker: str, period: str, end_date: str, limit: int, line_items: list[str]) -> tuple[list[str], int]:
+        """Get the fields that still have to be fetched, and the limit to fetch them with."""
+        query = self._get_line_item_query(ticker, period, end_date, limit)
+        if not query:
+            return list(line_items), limit
+        stored = set(query["line_items"])
+        return [field for field in line_items if field not in stored], query["limit"]
+
+    @_synchronized_update
+    def set_line_items(self, ticker: str, period: str, end_date: str, limit: int, line_items: list[str], data: list[dict[str, any]]):
+        """Merge line items fetched for some fields into the per-period, per-field store."""
+        key = f"{ticker}_{period}"
+        entry = self._get(self._line_items_cache, "line_items", key) or {"rows": {}, "queries": {}}
+        rows = dict(entry["rows"])
+        for item in data:
+            rows[item["report_period"]] = {**rows.get(item["report_period"], {}), **item}
+
+        report_periods = [item["report_period"] for item in data]
+        query = entry["queries"].get(end_date)
+        if query and not self.freshness.is_expired(query.get("expires_at")) and query["limit"] == limit and query["report_periods"] == report_periods:
+            # Same periods as before, so the new fields extend the stored ones
+            fields = sorted(set(query["line_items"]) | set(line_items))
+            expires_at = query.get("expires_at")
+        else:
+            fields = sorted(set(line_items))
+            expires_at = self.freshness.expires_at("line_items", end_date)
+        queries = {**entry["queries"], end_date: {"limit": limit, "report_periods": report_periods, "line_items": fields, "expires_at": expires_at}}
+        self._set(self._line_items_cache, "line_items", key, {"rows": rows, "queries": queries})
+
+    def _get_dated_records(self, cache: LRUCache, category: str, ticker: str, end_date: str, start_date: str | None, limit: int) -> list | None:
+        """Answer a trades or news query from the ticker's date-sorted records, newest first, if the cache covers it.
+
+        A query with a start date returns every record in [start_date, end_date]
+        (the API pages through the whole window). Without one it returns the
+        `limit` newest records up to end_date, which the cache holds if the
+        covered range reaching end_date contains at least that many.
+        """
+        entry = self._get(cache, category, ticker)
+        if not entry:
+            return None
+        coverage = self._coverage(entry)
+        days = entry["days"]
+        hi = bisect.bisect_right(days, end_date)
+        if start_date:
+            if _missing_ranges(coverage, start_date, end_date):
+                return None
+            return entry["records"].rows(bisect.bisect_left(days, start_date), hi)[::-1]
+
+        covered_start = next((covered_start for covered_start, covered_end in coverage if covered_start <= end_date <= covered_end), None)
+        if covered_start is None:
+            return None
+        if covered_start == _EARLIEST_DATE:
+            lo = bisect.bisect_left(days, covered_start)
+        else:
+            # The API cuts a full page somewhere within its oldest day, so any stored records from the
+            # day before the covered range are as good as the ones it would return
+            lo = bisect.bisect_left(days, _previous_day(covered_start))
+            if hi - lo < limit:
+                return None
+        return entry["records"].rows(max(lo, hi - limit), hi)[::-1]
+
+    def _get_missing_dated_ranges(self, cache: LRUCache, category: str, ticker: str, end_date: str, start_date: str | None, limit: int) -> list[tuple[str | None, str]]:
+        """Windows still to be fetched for a trades or news query; a start of None means the latest `limit` records.
+
+        A query for the latest records whose end date moved past the newest covered
+        range only fetches the days after it, as long as that range already holds
+        `limit` records (or everything back to the earliest one). Otherwise a page
+        of the `limit` newest records is fetched.
+        """
+        if self._get_dated_records(cache, category, ticker, end_date, start_date, limit) is not None:
+            return []
+        entry = self._get(cache, category, ticker)
+        coverage = self._coverage(entry)
+        if start_date:
+            return _missing_ranges(coverage, start_date, end_date)
+
+        older = [(covered_start, covered_end) for covered_start, covered_end in coverage if covered_end < end_date]
+        if older and not any(covered_start <= end_date <= covered_end for covered_start, covered_end in coverage):
+            covered_start, covered_end = older[-1]
+            days = entry["days"]
+            lo = bisect.bisect_left(days, covered_start if covered_start == _EARLIEST_DATE else _previous_day(covered_start))
+            if covered_start == _EARLIEST_DATE or bisect.bisect_right(days, covered_end) - lo >= limit:
+                return [(_next_day(covered_end), end_date)]
+        return [(None, end_date)]
+
+    def _set_dated_records(self, cache: LRUCache, category: str, model: type[BaseModel], ticker: str, data: list, end_date: str, start_date: str | None, limit: int):
+        """Merge the complete results of a trades or news query into the ticker's date-sorted records."""
+        date_field = _DATE_FIELDS[category]
+        entry = self._get(cache, category, ticker) or _dated_records_entry(RecordTable.from_records(model, []), date_field, [], None)
+        if start_date:
+            covered_start = start_date
+        elif len(data) < limit:
+            # Fewer records than asked for means nothing older exists
+            covered_start = _EARLIEST_DATE
+        else:
+            # The page may have been cut off part way through its oldest day
+            covered_start = _next_day(min(getattr(record, date_field) for record in data)[:10])
+
+        # Fetched records replace the stored ones for the days they cover; records on a partially fetched day are added if new
+        existing = [record for record in entry["records"].rows() if not covered_start <= getattr(record, date_field)[:10] <= end_date]
+        known = set(existing)
+        records = existing + [record for record in dict.fromkeys(data) if covered_start <= getattr(record, date_field)[:10] <= end_date or record not in known]
+        records.sort(key=lambda record: getattr(record, date_field))
+
+        ranges, live = entry["ranges"], entry["live"]
+        if covered_start <= end_date:
+            ranges, live = self._cover(entry, category, covered_start, end_date)
+        self._set(cache, category, ticker, _dated_records_entry(RecordTable.from_records(model, records, _INTERNED_FIELDS[category]), date_field, ranges, live))
+
+    @_synchronized
+    def get_insider_trades(self, ticker: str, end_date: str, start_date: str | None, limit: int) -> list[InsiderTrade] | None:
+        """Get cached insider trades if the query's window is covered."""
+        return self._get_dated_records(self._insider_trades_cache, "insider_trades", ticker, end_date, start_date, limit)
+
+    @_synchronized
+    def get_missing_insider_trade_ranges(self, ticker: str, end_date: str, start_date: str | None, limit: int) -> list[tuple[str | None, str]]:
+        """Get the windows of an insider trades query that still have to be fetched."""
+        return self._get_missing_dated_ranges(self._insider_trades_cache, "insider_trades", ticker, end_date, start_date, limit)
+
+    @_synchronized_update
+    def set_insider_trades(self, ticker: str, data: list[InsiderTrade], end_date: str, start_date: str | None, limit: int):
+        """Merge insider trades fetched for a window into the ticker's records."""
+        self._set_dated_records(self._insider_trades_cache, "insider_trades", InsiderTrade, ticker, data, end_date, start_date, limit)
+
+    @_synchronized
+    def get_company_news(self, ticker: str, end_date: str, start_date: str | None, limit: int) -> list[CompanyNews] | None:
+        """Get cached company news if the query's window is covered."""
+        return self._get_dated_records(self._company_news_cache, "company_news", ticker, end_date, start_date, limit)
+
+    @_synchronized
+    def get_missing_company_news_ranges(self, ticker: str, end_date: str, start_date: str | None, limit: int) -> list[tuple[str | None, str]]:
+        """Get the windows of a company news query that still have to be fetched."""
+        return self._get_missing_dated_ranges(self._company_news_cache, "company_news", ticker, end_date, start_date, limit)
+
+    @_synchronized_update
+    def set_company_news(self, ticker: str, data: list[CompanyNews], end_date: str, start_date: str | None, limit: int):
+        """Merge company news fetched for a window into the ticker's records."""
+        self._set_dated_records(self._company_news_cache, "company_news", CompanyNews, ticker, data, end_date, start_date, limit)
+
+    @_synchronized
+    def get_company_facts(self, ticker: str) -> CompanyFacts | None:
+        """Get cached company facts if they have not expired."""
+        return self._get(self._company_facts_cache, "company_facts", ticker)
+
+    @_synchronized_update
+    def set_company_facts(self, ticker: str, data: CompanyFacts):
+        """Cache company facts; they describe the company today, so they always expire."""
+        self._set(self._company_facts_cache, "company_facts", ticker, data, self.freshness.expires_at("company_facts", None))
+
+    def acquire_lease(self, name: str) -> str | None:
+        """Try to become the one process fetching the data behind `name`, returning a token for `release_lease` or None if another process is."""
+        with self._lock:
+            store = self._get_store()
+            if not (store and self._shared):
+                return _LOCAL_LEASE
+            return store.acquire_lease(name, float(os.environ.get(CACHE_LEASE_SECONDS_ENV) or 60))
+
+    def release_lease(self, name: str, token: str):
+        if token != _LOCAL_LEASE:
+            with self._lock:
+                self._get_store().release_lease(name, token)
+
+    @contextmanager
+    def lease(self, name: str):
+        """Hold the lease on `name`, waiting while another process holds it. Callers should re-check the cache once inside."""
+        while (token := self.acquire_lease(name)) is None:
+            time.sleep(LEASE_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            self.release_lease(name, token)
+
+    @asynccontextmanager
+    async def lease_async(self, name: str):
+        """Counterpart of `lease` that waits without blocking the event loop, taking and releasing the lease in a worker thread."""
+        while (token := await asyncio.to_thread(self.acquire_lease, name)) is None:
+            await asyncio.sleep(LEASE_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            await asyncio.to_thread(self.release_lease, name, token)
+
+    @_synchronized
+    def clear(self):
+        """Drop all cached data, including the persistent store."""
+        for cache in self._categories.values():
+            cache.clear()
+        self._versions.clear()
+        if store := self._get_store():
+            store.clear()
+
+    @_synchronized
+    def stats(self) -> dict[str, dict[str, int | None]]:
+        """Resident entries, bytes, budget and eviction count for each category."""
+        return {category: cache.stats() for category, cache in self._categories.items()}
 
 
 # Global cache instance
@@ -0,0 +1,52 @@
+import os
+import time
+from datetime import date, timedelta
+
+# Seconds that data which can still change is served from cache before being refetched
+DEFAULT_TTLS = {
+    "prices": 5 * 60,
+    "financial_metrics": 60 * 60,
+    "line_items": 60 * 60,
+    "insider_trades": 15 * 60,
+    "company_news": 15 * 60,
+    "company_facts": 15 * 60,
+}
+
+
+class FreshnessPolicy:
+    """Decides how long cached data stays valid.
+
+    Windows that end before today are historical and never expire. Windows
+    that reach today (and company facts, which always describe the present)
+    expire after a per-category TTL, overridable with FINANCIAL_DATA_TTL_<CATEGORY>
+    in seconds.
+    """
+
+    def __init__(self, ttls: dict[str, float] | None = None):
+        self._ttls = ttls or {}
+
+    def today(self) -> str:
+        return date.today().isoformat()
+
+    def yesterday(self) -> str:
+        return (date.today() - timedelta(days=1)).isoformat()
+
+    def is_live(self, end_date: str | None) -> bool:
+        """Whether a window ending on end_date can still change."""
+        return end_date is None or end_date >= self.today()
+
+    def ttl(self, category: str) -> float:
+        if category in self._ttls:
+            return self._ttls[category]
+        if value := os.environ.get(f"FINANCIAL_DATA_TTL_{category.upper()}"):
+            return float(value)
+        return DEFAULT_TTLS[category]
+
+    def expires_at(self, category: str, end_date: str | None) -> float | None:
+        """Expiry timestamp for data of a window ending on end_date, or None if it never expires."""
+        if not self.is_live(end_date):
+            return None
+        return time.time() + self.ttl(category)
+
+    def is_expired(self, expires_at: float | None) -> bool:
+        return expires_at is not None and expires_at <= time.time()
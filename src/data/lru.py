@@ -0,0 +1,98 @@
+import sys
+import time
+from collections import OrderedDict
+
+import numpy as np
+from pydantic import BaseModel
+
+from src.data.record_table import RecordTable
+
+
+def estimate_size(value: any) -> int:
+    """Approximate the memory held by a cached value, in bytes."""
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return value.nbytes + sum(estimate_size(item) for item in value)
+        return value.nbytes
+    if isinstance(value, RecordTable):
+        return value.nbytes
+    if isinstance(value, BaseModel):
+        size = sys.getsizeof(value) + estimate_size(value.__dict__)
+        if value.__pydantic_extra__:
+            size += estimate_size(value.__pydantic_extra__)
+        return size
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if hasattr(value, "__slots__"):
+        return sys.getsizeof(value) + sum(estimate_size(getattr(value, name)) for name in value.__slots__)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Dict-like store that evicts least recently used entries beyond a byte budget.
+
+    Entry sizes are estimated once when they are stored. A budget of None
+    disables eviction. The most recently stored entry is always kept, even if
+    it alone exceeds the budget. Entries stored with an expiry timestamp are
+    dropped by `get` once it has passed.
+    """
+
+    def __init__(self, max_bytes: int | None = None):
+        self.max_bytes = max_bytes
+        self.resident_bytes = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[any, int, float | None]] = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __getitem__(self, key: str) -> any:
+        self._entries.move_to_end(key)
+        return self._entries[key][0]
+
+    def __setitem__(self, key: str, value: any):
+        self.set(key, value)
+
+    def get(self, key: str) -> any:
+        """Return an entry, or None if it is missing or expired."""
+        if key not in self._entries:
+            return None
+        value, size, expires_at = self._entries[key]
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            self.resident_bytes -= size
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: any, expires_at: float | None = None):
+        if key in self._entries:
+            self.resident_bytes -= self._entries.pop(key)[1]
+        size = estimate_size(value)
+        self._entries[key] = (value, size, expires_at)
+        self.resident_bytes += size
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        while self.resident_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self.resident_bytes -= size
+            self.evictions += 1
+
+    def set_max_bytes(self, max_bytes: int | None):
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self):
+        self._entries.clear()
+        self.resident_bytes = 0
+
+    def stats(self) -> dict[str, int | None]:
+        return {"entries": len(self._entries), "resident_bytes": self.resident_bytes, "max_bytes": self.max_bytes, "evictions": self.evictions}
@@ -0,0 +1,55 @@
+from datetime import date, timedelta
+from functools import lru_cache
+
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar,
+    GoodFriday,
+    Holiday,
+    USLaborDay,
+    USMartinLutherKingJr,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+    nearest_workday,
+    sunday_to_monday,
+)
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """Regular full-day closures of US equity markets.
+
+    Unscheduled closures are not listed; fetching such a day just returns no bars.
+    """
+
+    rules = [
+        # A Saturday New Year's Day is not observed on the Friday before
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-01-01", observance=nearest_workday),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+@lru_cache(maxsize=None)
+def _holidays(year: int) -> frozenset[date]:
+    return frozenset(holiday.date() for holiday in NYSEHolidayCalendar().holidays(f"{year}-01-01", f"{year}-12-31"))
+
+
+def is_trading_day(day: date) -> bool:
+    return day.weekday() < 5 and day not in _holidays(day.year)
+
+
+def has_trading_day(start_date: str, end_date: str) -> bool:
+    """Whether the market is open on any day of [start_date, end_date]."""
+    day, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    while day <= end:
+        if is_trading_day(day):
+            return True
+        day += timedelta(days=1)
+    return False
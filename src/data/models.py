@@ -9,6 +9,9 @@ class Price(BaseModel):
     volume: int
     time: str
 
+    # Cached instances are shared between callers, so they must not be mutated
+    model_config = {"frozen": True}
+
 
 class PriceResponse(BaseModel):
     ticker: str
@@ -60,6 +63,8 @@ class FinancialMetrics(BaseModel):
     book_value_per_share: float | None
     free_cash_flow_per_share: float | None
 
+    model_config = {"frozen": True}
+
 
 class FinancialMetricsResponse(BaseModel):
     financial_metrics: list[FinancialMetrics]
@@ -72,7 +77,7 @@ class LineItem(BaseModel):
     currency: str
 
     # Allow additional fields dynamically
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "allow", "frozen": True}
 
 
 class LineItemResponse(BaseModel):
@@ -94,6 +99,8 @@ class InsiderTrade(BaseModel):
     security_title: str | None
     filing_date: str
 
+    model_config = {"frozen": True}
+
 
 class InsiderTradeResponse(BaseModel):
     insider_trades: list[InsiderTrade]
@@ -108,12 +115,16 @@ class CompanyNews(BaseModel):
     url: str
     sentiment: str | None = None
 
+    model_config = {"frozen": True}
+
 
 class CompanyNewsResponse(BaseModel):
     news: list[CompanyNews]
 
 
 class CompanyFacts(BaseModel):
+    model_config = {"frozen": True}
+
     ticker: str
     name: str
     cik: str | None = None
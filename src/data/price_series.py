@@ -0,0 +1,96 @@
+import numpy as np
+
+from src.data.models import Price
+
+PRICE_COLUMNS = ("open", "close", "high", "low", "volume")
+
+
+class PriceSeries:
+    """Columnar daily price history for a single ticker.
+
+    Prices are held as contiguous arrays sorted by date (float64 for OHLC,
+    int64 for volume, datetime64[D] for the trading day), so slicing a date
+    window returns views instead of copying per-bar objects. The original
+    `time` strings are kept so the series can be turned back into Price models.
+    """
+
+    __slots__ = ("dates", "time", "open", "close", "high", "low", "volume")
+
+    def __init__(self, time: np.ndarray, open: np.ndarray, close: np.ndarray, high: np.ndarray, low: np.ndarray, volume: np.ndarray, dates: np.ndarray | None = None):
+        self.time = time
+        self.open = open
+        self.close = close
+        self.high = high
+        self.low = low
+        self.volume = volume
+        self.dates = dates if dates is not None else np.array([t[:10] for t in time], dtype="datetime64[D]")
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, list]) -> "PriceSeries":
+        """Build a series from column lists, sorting the rows by date."""
+        time = np.array(columns["time"], dtype=object)
+        series = cls(
+            time=time,
+            open=np.asarray(columns["open"], dtype=np.float64),
+            close=np.asarray(columns["close"], dtype=np.float64),
+            high=np.asarray(columns["high"], dtype=np.float64),
+            low=np.asarray(columns["low"], dtype=np.float64),
+            volume=np.asarray(columns["volume"], dtype=np.int64),
+        )
+        return series.take(np.argsort(series.time, kind="stable"))
+
+    @classmethod
+    def from_prices(cls, prices: list[Price]) -> "PriceSeries":
+        return cls.from_columns({column: [getattr(p, column) for p in prices] for column in ("time", *PRICE_COLUMNS)})
+
+    def to_columns(self) -> dict[str, list]:
+        """Column lists suitable for JSON serialization."""
+        return {"time": self.time.tolist(), **{column: getattr(self, column).tolist() for column in PRICE_COLUMNS}}
+
+    def to_prices(self) -> list[Price]:
+        """Materialize the series as Price models."""
+        columns = self.to_columns()
+        return [Price.model_construct(time=t, open=o, close=c, high=h, low=l, volume=v) for t, o, c, h, l, v in zip(columns["time"], *(columns[column] for column in PRICE_COLUMNS))]
+
+    def take(self, indices: np.ndarray | slice) -> "PriceSeries":
+        return PriceSeries(
+            time=self.time[indices],
+            open=self.open[indices],
+            close=self.close[indices],
+            high=self.high[indices],
+            low=self.low[indices],
+            volume=self.volume[indices],
+            dates=self.dates[indices],
+        )
+
+    def slice(self, start_date: str, end_date: str) -> "PriceSeries":
+        """Bars whose trading day lies in [start_date, end_date], as views of this series."""
+        lo = np.searchsorted(self.dates, np.datetime64(start_date, "D"), side="left")
+        hi = np.searchsorted(self.dates, np.datetime64(end_date, "D"), side="right")
+        return self.take(slice(lo, hi))
+
+    def merge(self, other: "PriceSeries") -> "PriceSeries":
+        """Union of both series; bars already in this series win over duplicates in `other`."""
+        if not len(other):
+            return self
+        if not len(self):
+            return other
+        combined = PriceSeries(
+            time=np.concatenate([self.time, other.time]),
+            open=np.concatenate([self.open, other.open]),
+            close=np.concatenate([self.close, other.close]),
+            high=np.concatenate([self.high, other.high]),
+            low=np.concatenate([self.low, other.low]),
+            volume=np.concatenate([self.volume, other.volume]),
+            dates=np.concatenate([self.dates, other.dates]),
+        )
+        # np.unique sorts by time and keeps the first occurrence of each bar
+        _, first = np.unique(combined.time.astype(str), return_index=True)
+        return combined.take(first)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    @classmethod
+    def empty(cls) -> "PriceSeries":
+        return cls.from_columns({column: [] for column in ("time", *PRICE_COLUMNS)})
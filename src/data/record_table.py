@@ -0,0 +1,61 @@
+import sys
+
+from pydantic import BaseModel
+
+
+class RecordTable:
+    """Columnar storage for a list of flat pydantic records such as insider trades or company news.
+
+    Each field is held as one tuple of values instead of one model per row,
+    and the values of the `interned` string fields (tickers, authors, sources,
+    insider names and titles, ...) are interned so that repeated strings share
+    a single object across rows and tables. Rows were validated when they were
+    first fetched, so they are materialized with `model_construct`.
+    """
+
+    __slots__ = ("model", "columns")
+
+    def __init__(self, model: type[BaseModel], columns: dict[str, tuple]):
+        self.model = model
+        self.columns = columns
+
+    @classmethod
+    def from_columns(cls, model: type[BaseModel], columns: dict[str, list], interned: tuple[str, ...] = ()) -> "RecordTable":
+        return cls(model, {field: tuple(_intern_all(values) if field in interned else values) for field, values in columns.items()})
+
+    @classmethod
+    def from_records(cls, model: type[BaseModel], records: list[BaseModel], interned: tuple[str, ...] = ()) -> "RecordTable":
+        return cls.from_columns(model, {field: [getattr(record, field) for record in records] for field in model.model_fields}, interned)
+
+    def to_columns(self) -> dict[str, list]:
+        """Column lists suitable for JSON serialization."""
+        return {field: list(values) for field, values in self.columns.items()}
+
+    def column(self, field: str) -> tuple:
+        return self.columns[field]
+
+    def rows(self, start: int | None = None, stop: int | None = None) -> list[BaseModel]:
+        """Materialize rows [start:stop] as models."""
+        fields = list(self.columns)
+        construct = self.model.model_construct
+        return [construct(**dict(zip(fields, row))) for row in zip(*(values[start:stop] for values in self.columns.values()))]
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the table, counting each shared value once."""
+        size = sys.getsizeof(self) + sys.getsizeof(self.columns)
+        seen = set()
+        for values in self.columns.values():
+            size += sys.getsizeof(values)
+            for value in values:
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    size += sys.getsizeof(value)
+        return size
+
+
+def _intern_all(values: list) -> list:
+    return [sys.intern(value) if isinstance(value, str) else value for value in values]
@@ -0,0 +1,114 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds of the HTTP latency histogram buckets, in seconds. Slower requests fall in a final overflow bucket.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# API paths mapped to the endpoint names used by the cache categories and the fetchers
+ENDPOINTS = {
+    "/prices/": "prices",
+    "/financial-metrics/": "financial_metrics",
+    "/financials/search/line-items": "line_items",
+    "/insider-trades/": "insider_trades",
+    "/news/": "company_news",
+    "/company/facts/": "company_facts",
+}
+
+
+def _new_counters() -> dict:
+    return {
+        "hits": 0,
+        "misses": 0,
+        "memory_reads": 0,
+        "disk_reads": 0,
+        "requests": 0,
+        "errors": 0,
+        "retries": 0,
+        "pages": 0,
+        "bytes": 0,
+        "latency_seconds": 0.0,
+        "latency_buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+    }
+
+
+class DataStats:
+    """Per-endpoint counters of the time and traffic spent on financial data.
+
+    Fetchers record whether a lookup was answered by the cache (hits) or needed
+    the API (misses) and how many pages it took; the cache records which tier
+    each entry was read from; the HTTP clients record each attempt's latency, response bytes,
+    errors and retries. Counters only grow until `reset`, and `snapshot`
+    returns a consistent copy that is safe to serialize.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, dict] = {}
+
+    def _add(self, endpoint: str, **increments):
+        with self._lock:
+            counters = self._endpoints.setdefault(endpoint, _new_counters())
+            for name, value in increments.items():
+                counters[name] += value
+
+    def record_lookup(self, endpoint: str, hit: bool, count: int = 1):
+        """Record lookups that were answered from the cache, or that needed the API."""
+        self._add(endpoint, **{"hits" if hit else "misses": count})
+
+    def record_tier_read(self, endpoint: str, tier: str):
+        """Record a cache entry read from the "memory" or "disk" tier."""
+        self._add(endpoint, **{f"{tier}_reads": 1})
+
+    def record_page(self, endpoint: str):
+        self._add(endpoint, pages=1)
+
+    def record_request(self, path: str, seconds: float, nbytes: int = 0, error: bool = False):
+        """Record one HTTP attempt against an API path."""
+        with self._lock:
+            counters = self._endpoints.setdefault(ENDPOINTS.get(path, path), _new_counters())
+            counters["requests"] += 1
+            counters["errors"] += int(error)
+            counters["bytes"] += nbytes
+            counters["latency_seconds"] += seconds
+            counters["latency_buckets"][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def record_retry(self, path: str):
+        self._add(ENDPOINTS.get(path, path), retries=1)
+
+    @contextmanager
+    def time_request(self, path: str):
+        """Time an HTTP attempt; the block sets `attempt["bytes"]` and `attempt["error"]` once the response is in."""
+        attempt = {"bytes": 0, "error": True}
+        started = time.perf_counter()
+        try:
+            yield attempt
+        finally:
+            self.record_request(path, time.perf_counter() - started, attempt["bytes"], attempt["error"])
+
+    def snapshot(self) -> dict[str, dict]:
+        """Copy of the counters per endpoint, with the hit rate, mean latency and labelled histogram derived."""
+        with self._lock:
+            endpoints = {endpoint: {**counters, "latency_buckets": list(counters["latency_buckets"])} for endpoint, counters in self._endpoints.items()}
+
+        labels = [f"<={bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        for counters in endpoints.values():
+            lookups = counters["hits"] + counters["misses"]
+            counters["hit_rate"] = counters["hits"] / lookups if lookups else None
+            counters["mean_latency_seconds"] = counters["latency_seconds"] / counters["requests"] if counters["requests"] else None
+            counters["latency_histogram"] = dict(zip(labels, counters.pop("latency_buckets")))
+        return dict(sorted(endpoints.items()))
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+# Global stats instance
+_stats = DataStats()
+
+
+def get_data_stats() -> DataStats:
+    """Get the global data stats instance."""
+    return _stats
@@ -0,0 +1,153 @@
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class SQLiteStore:
+    """Persistent key/value store backing the in-memory cache.
+
+    Entries are stored as JSON documents in a single SQLite database, keyed by
+    (category, key), so cached API responses survive across process restarts.
+    Large documents can be stored gzip-compressed, as a blob instead of text.
+    Entries may carry an expiry timestamp, after which they read as missing.
+
+    The database runs in WAL mode so that several processes can share it:
+    readers never block, and writers wait up to `busy_timeout` seconds for one
+    another instead of failing. Every write bumps the entry's version, which
+    lets a process tell whether its in-memory copy is still current. Leases
+    let one process at a time fetch the data behind a key.
+    """
+
+    def __init__(self, cache_dir: str | os.PathLike, busy_timeout: float = 30.0, filename: str = "financial_data.sqlite3"):
+        self.path = Path(cache_dir).expanduser() / filename
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Reentrant so that writes can run inside `transaction`
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
+        self._conn = sqlite3.connect(self.path, timeout=busy_timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                category TEXT NOT NULL,
+                key TEXT NOT NULL,
+                data TEXT NOT NULL,
+                expires_at REAL,
+                version INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (category, key)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                token TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        # Databases created by earlier versions lack the newer columns
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if "expires_at" not in columns:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN expires_at REAL")
+        if "version" not in columns:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        self._conn.commit()
+
+    def get(self, category: str, key: str) -> any:
+        """Load an entry, returning None if it is not stored or has expired."""
+        entry = self.get_entry(category, key)
+        return entry[0] if entry else None
+
+    def get_entry(self, category: str, key: str) -> tuple[any, float | None, int] | None:
+        """Load an entry together with its expiry timestamp and version, returning None if it is not stored or has expired."""
+        with self._lock:
+            row = self._conn.execute("SELECT data, expires_at, version FROM entries WHERE category = ? AND key = ?", (category, key)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        payload = gzip.decompress(row[0]) if isinstance(row[0], bytes) else row[0]
+        return json.loads(payload), row[1], row[2]
+
+    def get_version(self, category: str, key: str) -> int | None:
+        """Version of an entry, or None if it is not stored."""
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM entries WHERE category = ? AND key = ?", (category, key)).fetchone()
+        return row[0] if row else None
+
+    def set(self, category: str, key: str, data: any, expires_at: float | None = None, compress: bool = False) -> int:
+        """Insert or replace an entry, optionally expiring at a Unix timestamp and gzip-compressed. Returns its new version."""
+        payload = json.dumps(data, separators=(",", ":"))
+        if compress:
+            payload = gzip.compress(payload.encode(), compresslevel=6)
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO entries (category, key, data, expires_at, version) VALUES (?, ?, ?, ?, 1)
+                ON CONFLICT (category, key) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at, version = entries.version + 1
+                """,
+                (category, key, payload, expires_at),
+            )
+            version = self._conn.execute("SELECT version FROM entries WHERE category = ? AND key = ?", (category, key)).fetchone()[0]
+            if not self._transaction_depth:
+                self._conn.commit()
+        return version
+
+    @contextmanager
+    def transaction(self):
+        """Hold the database's write lock for a read-modify-write, so writers in other processes wait for it to commit."""
+        with self._lock:
+            if self._transaction_depth:
+                self._transaction_depth += 1
+                try:
+                    yield
+                finally:
+                    self._transaction_depth -= 1
+                return
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._transaction_depth = 1
+            try:
+                yield
+            except BaseException:
+                self._conn.rollback()
+                raise
+            else:
+                self._conn.commit()
+            finally:
+                self._transaction_depth = 0
+
+    def acquire_lease(self, name: str, duration: float) -> str | None:
+        """Try to take the lease on a name for `duration` seconds, returning a token to release it with, or None if another holder has it."""
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self.transaction():
+            self._conn.execute("DELETE FROM leases WHERE name = ? AND expires_at <= ?", (name, now))
+            acquired = self._conn.execute("INSERT OR IGNORE INTO leases (name, token, expires_at) VALUES (?, ?, ?)", (name, token, now + duration)).rowcount
+        return token if acquired else None
+
+    def release_lease(self, name: str, token: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE name = ? AND token = ?", (name, token))
+            if not self._transaction_depth:
+                self._conn.commit()
+
+    def clear(self, category: str | None = None):
+        """Delete all entries, or only those of one category."""
+        with self._lock:
+            if category is None:
+                self._conn.execute("DELETE FROM entries")
+            else:
+                self._conn.execute("DELETE FROM entries WHERE category = ?", (category,))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import threading
+
+from pydantic import BaseModel
+
+from src.data.store import SQLiteStore
+
+# Environment variable pointing at the directory of the LLM response cache.
+# Falls back to the financial data cache directory, so one setting caches both.
+LLM_CACHE_DIR_ENV = "LLM_CACHE_DIR"
+FINANCIAL_DATA_CACHE_DIR_ENV = "FINANCIAL_DATA_CACHE_DIR"
+
+# Environment variable disabling the LLM response cache when set to 0/false/no
+LLM_CACHE_ENV = "LLM_CACHE"
+
+# Environment variable with a version string mixed into every key; change it to invalidate all cached responses
+LLM_CACHE_VERSION_ENV = "LLM_CACHE_VERSION"
+
+# Version of the key format, bumped when the way keys are derived changes
+KEY_VERSION = 1
+
+_CATEGORY = "llm_responses"
+
+_UNSET = object()
+
+
+def _render_prompt(prompt: any) -> list[dict]:
+    """The messages a prompt sends to the model, as plain role/content pairs."""
+    if hasattr(prompt, "to_messages"):
+        prompt = prompt.to_messages()
+    if isinstance(prompt, str):
+        return [{"role": "human", "content": prompt}]
+    messages = []
+    for message in prompt:
+        if isinstance(message, str):
+            messages.append({"role": "human", "content": message})
+        elif isinstance(message, (tuple, list)):
+            messages.append({"role": message[0], "content": message[1]})
+        else:
+            messages.append({"role": message.type, "content": message.content})
+    return messages
+
+
+class LLMResponseCache:
+    """Persistent cache of structured LLM responses.
+
+    Responses are content-addressed: the key is a hash of the provider, model,
+    output schema and rendered prompt messages, so a byte-identical request is
+    answered from disk instead of the provider. Nothing expires; changing
+    LLM_CACHE_VERSION (or calling `clear`) invalidates every cached response.
+    The store is resolved lazily so that environment variables loaded after
+    import (e.g. from a .env file) are still honored.
+    """
+
+    def __init__(self, cache_dir: str | None = None, version: str | None = None):
+        self._cache_dir = cache_dir
+        self._version = version
+        self._lock = threading.Lock()
+        self._store = _UNSET
+
+    def _get_store(self) -> SQLiteStore | None:
+        with self._lock:
+            if self._store is _UNSET:
+                enabled = os.environ.get(LLM_CACHE_ENV, "1").lower() not in ("0", "false", "no")
+                cache_dir = self._cache_dir or os.environ.get(LLM_CACHE_DIR_ENV) or os.environ.get(FINANCIAL_DATA_CACHE_DIR_ENV)
+                self._store = SQLiteStore(cache_dir, filename="llm_responses.sqlite3") if enabled and cache_dir else None
+            return self._store
+
+    @property
+    def enabled(self) -> bool:
+        return self._get_store() is not None
+
+    def key(self, model_provider: str, model_name: str, pydantic_model: type[BaseModel], prompt: any) -> str:
+        """Content hash identifying a request."""
+        version = self._version if self._version is not None else os.environ.get(LLM_CACHE_VERSION_ENV, "")
+        request = {
+            "key_version": KEY_VERSION,
+            "version": version,
+            "provider": str(model_provider),
+            "model": model_name,
+            "schema": pydantic_model.model_json_schema(),
+            "messages": _render_prompt(prompt),
+        }
+        return hashlib.sha256(json.dumps(request, sort_keys=True, separators=(",", ":"), default=str).encode()).hexdigest()
+
+    def get(self, key: str, pydantic_model: type[BaseModel]) -> BaseModel | None:
+        """Cached response for a key, or None if there is none or it no longer fits the schema."""
+        if not (store := self._get_store()):
+            return None
+        data = store.get(_CATEGORY, key)
+        if data is None:
+            return None
+        try:
+            return pydantic_model.model_validate(data)
+        except ValueError:
+            return None
+
+    def set(self, key: str, response: BaseModel):
+        if store := self._get_store():
+            store.set(_CATEGORY, key, response.model_dump(mode="json"), compress=True)
+
+    def clear(self):
+        if store := self._get_store():
+            store.clear(_CATEGORY)
+
+
+# Global LLM response cache instance
+_llm_cache = LLMResponseCache()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get the global LLM response cache instance."""
+    return _llm_cache
@@ -1,5 +1,6 @@
 import os
 import json
+import threading
 from langchain_anthropic import ChatAnthropic
 from langchain_deepseek import ChatDeepSeek
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -148,3 +149,47 @@ def get_model(model_name: str, model_provider: ModelProvider) -> ChatOpenAI | Ch
             model=model_name,
             base_url=base_url,
         )
+
+
+# Clients are reused across calls and threads so that their HTTP connection pools are too.
+# Keyed by (provider, model, base URL, output schema); the schema is None for the bare client.
+_clients: dict[tuple, any] = {}
+_clients_lock = threading.RLock()
+
+
+def normalize_provider(model_provider: ModelProvider | str) -> str:
+    """Canonical name of a provider, given as a ModelProvider, its value or its member name (e.g. "OPENAI")."""
+    try:
+        return ModelProvider(model_provider).value
+    except ValueError:
+        try:
+            return ModelProvider[str(model_provider).upper()].value
+        except KeyError:
+            return str(model_provider)
+
+
+def _get_base_url(model_provider: str) -> str | None:
+    """Base URL a provider's client is built with, as configured in the environment."""
+    if model_provider == ModelProvider.OPENAI:
+        return os.getenv("OPENAI_API_BASE")
+    if model_provider == ModelProvider.OLLAMA:
+        ollama_host = os.getenv("OLLAMA_HOST", "localhost")
+        return os.getenv("OLLAMA_BASE_URL", f"http://{ollama_host}:11434")
+    return None
+
+
+def get_model_client(model_name: str, model_provider: ModelProvider, pydantic_model: type[BaseModel] | None = None):
+    """Get a shared client for a model, wrapped for JSON-mode structured output of pydantic_model if given."""
+    model_provider = normalize_provider(model_provider)
+    key = (model_provider, model_name, _get_base_url(model_provider), pydantic_model)
+    if (client := _clients.get(key)) is not None:
+        return client
+
+    with _clients_lock:
+        if (client := _clients.get(key)) is None:
+            if pydantic_model is None:
+                client = get_model(model_name, model_provider)
+            else:
+                client = get_model_client(model_name, model_provider).with_structured_output(pydantic_model, method="json_mode")
+            _clients[key] = client
+    return client
@@ -8,11 +8,13 @@ import questionary
 from src.agents.portfolio_manager import portfolio_management_agent
 from src.agents.risk_manager import risk_management_agent
 from src.graph.state import AgentState
-from src.utils.display import print_trading_output
-from src.utils.analysts import ANALYST_ORDER, get_analyst_nodes
+from src.utils.display import print_data_stats, print_trading_output
+from src.utils.analysts import ANALYST_CONFIG, ANALYST_ORDER, get_analyst_nodes
 from src.utils.progress import progress
 from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, ModelProvider
 from src.utils.ollama import ensure_ollama_and_model
+from src.tools.prefetch import plan_prefetch, prefetch
+from src.data.stats import get_data_stats
 
 import argparse
 from datetime import datetime
@@ -63,6 +65,9 @@ def run_hedge_fund(
         else:
             agent = app
 
+        # Fetch the data every analyst needs up front, so the analysts read it from the cache
+        prefetch(plan_prefetch(selected_analysts or list(ANALYST_CONFIG), tickers, start_date, end_date))
+
         final_state = agent.invoke(
             {
                 "messages": [
@@ -319,3 +324,4 @@ if __name__ == "__main__":
         model_provider=model_provider,
     )
     print_trading_output(result)
+    print_data_stats(get_data_stats().snapshot())
@@ -1,9 +1,9 @@
 import datetime
-import os
+from collections import defaultdict
+
 import pandas as pd
-import requests
 
-from src.data.cache import get_cache
+from src.data.cache import LINE_ITEM_BASE_FIELDS, get_cache
 from src.data.models import (
     CompanyNews,
     CompanyNewsResponse,
@@ -15,42 +15,76 @@ from src.data.models import (
     LineItemResponse,
     InsiderTrade,
     InsiderTradeResponse,
+    CompanyFacts,
     CompanyFactsResponse,
 )
+from src.data.price_series import PriceSeries
+from src.data.stats import get_data_stats
+from src.tools.client import get_client
+from src.tools.singleflight import SingleFlight
 
 # Global cache instance
 _cache = get_cache()
 
+# Cache hits and misses and pages fetched per endpoint
+_stats = get_data_stats()
+
+# Concurrent agents asking for the same data share a single in-flight request
+_inflight = SingleFlight()
+
+# Most tickers sent in a single line item search request
+LINE_ITEMS_BATCH_SIZE = 10
+
+
+def _fetch_once(key: str, fn):
+    """Run a fetch once for concurrent callers sharing a key; with a shared cache, also once across processes.
+
+    Callers waiting on another process find its results in the cache, so `fn` must re-check the cache first.
+    """
+
+    def leased():
+        with _cache.lease(key):
+            return fn()
+
+    return _inflight.do(key, leased)
+
 
 def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
-    """Fetch price data from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{start_date}_{end_date}"
-    
-    # Check cache first - simple exact match
-    if cached_data := _cache.get_prices(cache_key):
-        return [Price(**price) for price in cached_data]
-
-    # If not in cache, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
-
-    url = f"https://api.financialdatasets.ai/prices/?ticker={ticker}&interval=day&interval_multiplier=1&start_date={start_date}&end_date={end_date}"
-    response = requests.get(url, headers=headers)
+    """Fetch price data from cache or API, only requesting the parts of the range that are not cached."""
+    return get_price_series(ticker, start_date, end_date).to_prices()
+
+
+def get_price_series(ticker: str, start_date: str, end_date: str) -> PriceSeries:
+    """Fetch price data as a columnar series from cache or API, only requesting the parts of the range that are not cached."""
+
+    def fetch_missing_prices() -> PriceSeries:
+        fetched = PriceSeries.empty()
+        for missing_start, missing_end in _cache.get_missing_price_ranges(ticker, start_date, end_date):
+            series = PriceSeries.from_prices(_fetch_prices(ticker, missing_start, missing_end))
+            _cache.set_prices(ticker, series, missing_start, missing_end)
+            fetched = series.merge(fetched)
+        return fetched
+
+    missing = bool(_cache.get_missing_price_ranges(ticker, start_date, end_date))
+    _stats.record_lookup("prices", hit=not missing)
+    fetched = _fetch_once(f"prices_{ticker}_{start_date}_{end_date}", fetch_missing_prices) if missing else PriceSeries.empty()
+
+    if (series := _cache.get_prices(ticker, start_date, end_date)) is not None:
+        return series
+    # The series was evicted or overwritten since it was fetched, so answer from the fetched bars and whatever is still cached
+    return fetched.merge(_cache.get_cached_prices(ticker, start_date, end_date))
+
+
+def _fetch_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
+    """Fetch price data for a date range from the API."""
+    params = {"ticker": ticker, "interval": "day", "interval_multiplier": 1, "start_date": start_date, "end_date": end_date}
+    response = get_client().get("/prices/", params=params)
     if response.status_code != 200:
         raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
 
     # Parse response with Pydantic model
     price_response = PriceResponse(**response.json())
-    prices = price_response.prices
-
-    if not prices:
-        return []
-
-    # Cache the results using the comprehensive cache key
-    _cache.set_prices(cache_key, [p.model_dump() for p in prices])
-    return prices
+    return price_response.prices
 
 
 def get_financial_metrics(
@@ -60,20 +94,24 @@ def get_financial_metrics(
     limit: int = 10,
 ) -> list[FinancialMetrics]:
     """Fetch financial metrics from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{period}_{end_date}_{limit}"
-    
-    # Check cache first - simple exact match
-    if cached_data := _cache.get_financial_metrics(cache_key):
-        return [FinancialMetrics(**metric) for metric in cached_data]
-
-    # If not in cache, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
-
-    url = f"https://api.financialdatasets.ai/financial-metrics/?ticker={ticker}&report_period_lte={end_date}&limit={limit}&period={period}"
-    response = requests.get(url, headers=headers)
+    # Check cache first - a query with a higher limit or a later end date also answers this one
+    if cached_data := _cache.get_financial_metrics(ticker, period, end_date, limit):
+        _stats.record_lookup("financial_metrics", hit=True)
+        return cached_data
+
+    # If not in cache, fetch from API, sharing the request with concurrent callers
+    _stats.record_lookup("financial_metrics", hit=False)
+    return _fetch_once(f"financial_metrics_{ticker}_{period}_{end_date}_{limit}", lambda: _fetch_financial_metrics(ticker, end_date, period, limit))
+
+
+def _fetch_financial_metrics(ticker: str, end_date: str, period: str, limit: int) -> list[FinancialMetrics]:
+    """Fetch financial metrics from the API and cache them."""
+    # Another caller may have filled the cache while we were waiting to fetch
+    if cached_data := _cache.get_financial_metrics(ticker, period, end_date, limit):
+        return cached_data
+
+    params = {"ticker": ticker, "report_period_lte": end_date, "limit": limit, "period": period}
+    response = get_client().get("/financial-metrics/", params=params)
     if response.status_code != 200:
         raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
 
@@ -84,8 +122,8 @@ def get_financial_metrics(
     if not financial_metrics:
         return []
 
-    # Cache the results as dicts using the comprehensive cache key
-    _cache.set_financial_metrics(cache_key, [m.model_dump() for m in financial_metrics])
+    # Cache the validated models per report period
+    _cache.set_financial_metrics(ticker, period, end_date, limit, financial_metrics)
     return financial_metrics
 
 
@@ -96,32 +134,140 @@ def search_line_items(
     period: str = "ttm",
     limit: int = 10,
 ) -> list[LineItem]:
-    """Fetch line items from API."""
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
+    """Fetch line items from cache or API, only requesting the fields that are not cached."""
+    return search_line_items_batch([ticker], line_items, end_date, period, limit)[ticker]
 
-    url = "https://api.financialdatasets.ai/financials/search/line-items"
 
+def search_line_items_batch(
+    tickers: list[str],
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> dict[str, list[LineItem]]:
+    """Fetch line items for many tickers from cache or API, sharing requests between tickers that miss the same fields."""
+
+    def fetch_missing_line_items(batch: list[str], missing_line_items: list[str], fetch_limit: int) -> dict[str, list[dict[str, any]]]:
+        # Another process may have fetched these while we waited for the lease
+        batch = [ticker for ticker in batch if _cache.get_missing_line_items(ticker, period, end_date, limit, missing_line_items)[0]]
+        if not batch:
+            return {}
+        search_results = _fetch_line_items(batch, missing_line_items, end_date, period, fetch_limit)
+        rows = _cache_line_items_by_ticker(batch, period, end_date, fetch_limit, missing_line_items, search_results)
+        # Tickers the shared response did not answer for are asked about on their own
+        for ticker in [ticker for ticker in batch if ticker not in rows]:
+            search_results = _fetch_line_items([ticker], missing_line_items, end_date, period, fetch_limit)
+            rows.update(_cache_line_items_by_ticker([ticker], period, end_date, fetch_limit, missing_line_items, search_results))
+        return rows
+
+    fetched = {}
+    batches = _plan_line_item_batches(tickers, line_items, end_date, period, limit)
+    _record_line_item_lookups(tickers, batches)
+    # A second pass is only needed if the reported periods changed while adding fields
+    for _ in range(2):
+        if not batches:
+            break
+        for batch, missing_line_items, fetch_limit in batches:
+            rows = _fetch_once(
+                f"line_items_{','.join(batch)}_{period}_{end_date}_{fetch_limit}_{','.join(missing_line_items)}",
+                lambda: fetch_missing_line_items(batch, missing_line_items, fetch_limit),
+            )
+            _merge_line_item_rows(fetched, rows)
+        batches = _plan_line_item_batches(tickers, line_items, end_date, period, limit)
+
+    return _line_items_from_cache(tickers, line_items, end_date, period, limit, fetched)
+
+
+def _merge_line_item_rows(fetched: dict[str, list[dict[str, any]]], rows: dict[str, list[dict[str, any]]]):
+    """Add rows fetched for some fields to those fetched earlier in the same call; the latest fetch decides the periods."""
+    for ticker, ticker_rows in rows.items():
+        earlier = {row["report_period"]: row for row in fetched.get(ticker, [])}
+        fetched[ticker] = [{**earlier.get(row["report_period"], {}), **row} for row in ticker_rows]
+
+
+def _line_items_from_cache(tickers: list[str], line_items: list[str], end_date: str, period: str, limit: int, fetched: dict[str, list[dict[str, any]]]) -> dict[str, list[LineItem]]:
+    results = {}
+    for ticker in tickers:
+        cached_data = _cache.get_line_items(ticker, period, end_date, limit, line_items)
+        if cached_data is None:
+            # The entry was evicted or overwritten since it was fetched, so answer from the fetched rows and whatever fields are still cached
+            cached_rows = _cache.get_cached_line_item_rows(ticker, period, end_date, limit)
+            by_period = {row["report_period"]: row for row in cached_rows}
+            rows = [{**by_period.get(row["report_period"], {}), **row} for row in fetched[ticker]] if fetched.get(ticker) else cached_rows
+            cached_data = [{**{field: row[field] for field in LINE_ITEM_BASE_FIELDS}, **{field: row[field] for field in line_items if field in row}} for row in rows[:limit]]
+        # Cached values were validated when they were fetched
+        results[ticker] = [LineItem.model_construct(**item) for item in cached_data]
+    return results
+
+
+def _plan_line_item_batches(tickers: list[str], line_items: list[str], end_date: str, period: str, limit: int) -> list[tuple[list[str], list[str], int]]:
+    """Group the tickers that miss the same fields at the same limit into (tickers, line_items, limit) requests."""
+    groups = defaultdict(list)
+    for ticker in dict.fromkeys(tickers):
+        missing_line_items, fetch_limit = _cache.get_missing_line_items(ticker, period, end_date, limit, line_items)
+        if missing_line_items:
+            groups[(tuple(missing_line_items), fetch_limit)].append(ticker)
+    return [(group[i : i + LINE_ITEMS_BATCH_SIZE], list(missing_line_items), fetch_limit) for (missing_line_items, fetch_limit), group in groups.items() for i in range(0, len(group), LINE_ITEMS_BATCH_SIZE)]
+
+
+def _record_line_item_lookups(tickers: list[str], batches: list[tuple[list[str], list[str], int]]):
+    """Record one lookup per ticker, missed if any of its fields have to be fetched."""
+    misses = sum(len(batch) for batch, _, _ in batches)
+    _stats.record_lookup("line_items", hit=False, count=misses)
+    _stats.record_lookup("line_items", hit=True, count=len(dict.fromkeys(tickers)) - misses)
+
+
+def _cache_line_items_by_ticker(tickers: list[str], period: str, end_date: str, limit: int, line_items: list[str], search_results: list[LineItem]) -> dict[str, list[dict[str, any]]]:
+    """Split a search response back into per-ticker cache entries, returning the rows stored for each ticker it answered for.
+
+    A single-ticker response belongs to that ticker whatever symbol the API
+    reports; otherwise results are matched to the requested tickers ignoring
+    case. Tickers absent from the response are left uncached rather than
+    stored as empty. If a multi-ticker response holds exactly `limit` results,
+    the API may have applied the limit to the whole response, so tickers with
+    fewer than `limit` results are not trusted to be complete either.
+    """
+    if len(tickers) == 1:
+        rows = [item.model_dump() for item in search_results][:limit]
+        _cache.set_line_items(tickers[0], period, end_date, limit, line_items, rows)
+        return {tickers[0]: rows}
+
+    by_ticker = defaultdict(list)
+    for item in search_results:
+        by_ticker[item.ticker.upper()].append(item.model_dump())
+    possibly_truncated = len(search_results) == limit
+
+    answered = {}
+    for ticker in tickers:
+        results = by_ticker.get(ticker.upper())
+        if not results or (possibly_truncated and len(results) < limit):
+            continue
+        answered[ticker] = results[:limit]
+        _cache.set_line_items(ticker, period, end_date, limit, line_items, answered[ticker])
+    return answered
+
+
+def _fetch_line_items(
+    tickers: list[str],
+    line_items: list[str],
+    end_date: str,
+    period: str,
+    limit: int,
+) -> list[LineItem]:
+    """Fetch line items for one or more tickers from the API; the limit applies per ticker."""
     body = {
-        "tickers": [ticker],
+        "tickers": tickers,
         "line_items": line_items,
         "end_date": end_date,
         "period": period,
         "limit": limit,
     }
-    response = requests.post(url, headers=headers, json=body)
+    response = get_client().post("/financials/search/line-items", json=body)
     if response.status_code != 200:
-        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+        raise Exception(f"Error fetching data: {','.join(tickers)} - {response.status_code} - {response.text}")
     data = response.json()
     response_model = LineItemResponse(**data)
-    search_results = response_model.search_results
-    if not search_results:
-        return []
-
-    # Cache the results
-    return search_results[:limit]
+    return response_model.search_results
 
 
 def get_insider_trades(
@@ -130,31 +276,46 @@ def get_insider_trades(
     start_date: str | None = None,
     limit: int = 1000,
 ) -> list[InsiderTrade]:
-    """Fetch insider trades from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{start_date or 'none'}_{end_date}_{limit}"
-    
-    # Check cache first - simple exact match
-    if cached_data := _cache.get_insider_trades(cache_key):
-        return [InsiderTrade(**trade) for trade in cached_data]
-
-    # If not in cache, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
+    """Fetch insider trades from cache or API, only requesting the parts of the window that are not cached."""
+    # Check cache first - the ticker's stored records answer any window they cover
+    if (cached_data := _cache.get_insider_trades(ticker, end_date, start_date, limit)) is not None:
+        _stats.record_lookup("insider_trades", hit=True)
+        return cached_data
+
+    # If not in cache, fetch from API, sharing the request with concurrent callers
+    _stats.record_lookup("insider_trades", hit=False)
+    return _fetch_once(f"insider_trades_{ticker}_{start_date or 'none'}_{end_date}_{limit}", lambda: _fetch_insider_trades(ticker, end_date, start_date, limit))
+
 
+def _fetch_insider_trades(ticker: str, end_date: str, start_date: str | None, limit: int) -> list[InsiderTrade]:
+    """Fetch the uncovered windows of an insider trades query from the API and cache them."""
+    fetched = []
+    for fetch_start, fetch_end in _cache.get_missing_insider_trade_ranges(ticker, end_date, start_date, limit):
+        trades = _fetch_insider_trade_pages(ticker, fetch_end, fetch_start, limit)
+        _cache.set_insider_trades(ticker, trades, fetch_end, fetch_start, limit)
+        fetched.extend(trades)
+
+    if (cached_data := _cache.get_insider_trades(ticker, end_date, start_date, limit)) is not None:
+        return cached_data
+    # The records were evicted or overwritten since they were fetched, so answer from the ones fetched here
+    return _records_in_window(fetched, "filing_date", end_date, start_date, limit)
+
+
+def _fetch_insider_trade_pages(ticker: str, end_date: str, start_date: str | None, limit: int) -> list[InsiderTrade]:
+    """Fetch insider trades from the API, paging back to start_date if one is given."""
     all_trades = []
     current_end_date = end_date
 
     while True:
-        url = f"https://api.financialdatasets.ai/insider-trades/?ticker={ticker}&filing_date_lte={current_end_date}"
+        params = {"ticker": ticker, "filing_date_lte": current_end_date}
         if start_date:
-            url += f"&filing_date_gte={start_date}"
-        url += f"&limit={limit}"
+            params["filing_date_gte"] = start_date
+        params["limit"] = limit
 
-        response = requests.get(url, headers=headers)
+        response = get_client().get("/insider-trades/", params=params)
         if response.status_code != 200:
             raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+        _stats.record_page("insider_trades")
 
         data = response.json()
         response_model = InsiderTradeResponse(**data)
@@ -176,11 +337,6 @@ def get_insider_trades(
         if current_end_date <= start_date:
             break
 
-    if not all_trades:
-        return []
-
-    # Cache the results using the comprehensive cache key
-    _cache.set_insider_trades(cache_key, [trade.model_dump() for trade in all_trades])
     return all_trades
 
 
@@ -190,31 +346,53 @@ def get_company_news(
     start_date: str | None = None,
     limit: int = 1000,
 ) -> list[CompanyNews]:
-    """Fetch company news from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{start_date or 'none'}_{end_date}_{limit}"
-    
-    # Check cache first - simple exact match
-    if cached_data := _cache.get_company_news(cache_key):
-        return [CompanyNews(**news) for news in cached_data]
-
-    # If not in cache, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
+    """Fetch company news from cache or API, only requesting the parts of the window that are not cached."""
+    # Check cache first - the ticker's stored records answer any window they cover
+    if (cached_data := _cache.get_company_news(ticker, end_date, start_date, limit)) is not None:
+        _stats.record_lookup("company_news", hit=True)
+        return cached_data
+
+    # If not in cache, fetch from API, sharing the request with concurrent callers
+    _stats.record_lookup("company_news", hit=False)
+    return _fetch_once(f"company_news_{ticker}_{start_date or 'none'}_{end_date}_{limit}", lambda: _fetch_company_news(ticker, end_date, start_date, limit))
+
+
+def _fetch_company_news(ticker: str, end_date: str, start_date: str | None, limit: int) -> list[CompanyNews]:
+    """Fetch the uncovered windows of a company news query from the API and cache them."""
+    fetched = []
+    for fetch_start, fetch_end in _cache.get_missing_company_news_ranges(ticker, end_date, start_date, limit):
+        news = _fetch_company_news_pages(ticker, fetch_end, fetch_start, limit)
+        _cache.set_company_news(ticker, news, fetch_end, fetch_start, limit)
+        fetched.extend(news)
+
+    if (cached_data := _cache.get_company_news(ticker, end_date, start_date, limit)) is not None:
+        return cached_data
+    # The records were evicted or overwritten since they were fetched, so answer from the ones fetched here
+    return _records_in_window(fetched, "date", end_date, start_date, limit)
+
+
+def _records_in_window(records: list, date_field: str, end_date: str, start_date: str | None, limit: int) -> list:
+    """The fetched trades or news a query returns: every record in its window, or the `limit` newest without a start date."""
+    in_window = [record for record in dict.fromkeys(records) if (not start_date or getattr(record, date_field)[:10] >= start_date) and getattr(record, date_field)[:10] <= end_date]
+    in_window.sort(key=lambda record: getattr(record, date_field), reverse=True)
+    return in_window if start_date else in_window[:limit]
+
 
+def _fetch_company_news_pages(ticker: str, end_date: str, start_date: str | None, limit: int) -> list[CompanyNews]:
+    """Fetch company news from the API, paging back to start_date if one is given."""
     all_news = []
     current_end_date = end_date
 
     while True:
-        url = f"https://api.financialdatasets.ai/news/?ticker={ticker}&end_date={current_end_date}"
+        params = {"ticker": ticker, "end_date": current_end_date}
         if start_date:
-            url += f"&start_date={start_date}"
-        url += f"&limit={limit}"
+            params["start_date"] = start_date
+        params["limit"] = limit
 
-        response = requests.get(url, headers=headers)
+        response = get_client().get("/news/", params=params)
         if response.status_code != 200:
             raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+        _stats.record_page("company_news")
 
         data = response.json()
         response_model = CompanyNewsResponse(**data)
@@ -236,11 +414,6 @@ def get_company_news(
         if current_end_date <= start_date:
             break
 
-    if not all_news:
-        return []
-
-    # Cache the results using the comprehensive cache key
-    _cache.set_company_news(cache_key, [news.model_dump() for news in all_news])
     return all_news
 
 
@@ -252,19 +425,8 @@ def get_market_cap(
     # Check if end_date is today
     if end_date == datetime.datetime.now().strftime("%Y-%m-%d"):
         # Get the market cap from company facts API
-        headers = {}
-        if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-            headers["X-API-KEY"] = api_key
-
-        url = f"https://api.financialdatasets.ai/company/facts/?ticker={ticker}"
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            print(f"Error fetching company facts: {ticker} - {response.status_code}")
-            return None
-
-        data = response.json()
-        response_model = CompanyFactsResponse(**data)
-        return response_model.company_facts.market_cap
+        company_facts = get_company_facts(ticker)
+        return company_facts.market_cap if company_facts else None
 
     financial_metrics = get_financial_metrics(ticker, end_date)
     if not financial_metrics:
@@ -278,19 +440,50 @@ def get_market_cap(
     return market_cap
 
 
-def prices_to_df(prices: list[Price]) -> pd.DataFrame:
+def get_company_facts(ticker: str) -> CompanyFacts | None:
+    """Fetch company facts from cache or API; cached facts expire after the company_facts TTL."""
+    if cached_data := _cache.get_company_facts(ticker):
+        _stats.record_lookup("company_facts", hit=True)
+        return cached_data
+
+    _stats.record_lookup("company_facts", hit=False)
+    return _fetch_once(f"company_facts_{ticker}", lambda: _fetch_company_facts(ticker))
+
+
+def _fetch_company_facts(ticker: str) -> CompanyFacts | None:
+    """Fetch company facts from the API and cache them."""
+    # Another caller may have filled the cache while we were waiting to fetch
+    if cached_data := _cache.get_company_facts(ticker):
+        return cached_data
+
+    response = get_client().get("/company/facts/", params={"ticker": ticker})
+    if response.status_code != 200:
+        print(f"Error fetching company facts: {ticker} - {response.status_code}")
+        return None
+
+    data = response.json()
+    response_model = CompanyFactsResponse(**data)
+    _cache.set_company_facts(ticker, response_model.company_facts)
+    return response_model.company_facts
+
+
+def prices_to_df(prices: list[Price] | PriceSeries) -> pd.DataFrame:
     """Convert prices to a DataFrame."""
-    df = pd.DataFrame([p.model_dump() for p in prices])
-    df["Date"] = pd.to_datetime(df["time"])
-    df.set_index("Date", inplace=True)
-    numeric_cols = ["open", "close", "high", "low", "volume"]
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-    df.sort_index(inplace=True)
-    return df
+    if not isinstance(prices, PriceSeries):
+        prices = PriceSeries.from_prices(prices)
+    return pd.DataFrame(
+        {
+            "open": prices.open,
+            "close": prices.close,
+            "high": prices.high,
+            "low": prices.low,
+            "volume": prices.volume,
+            "time": prices.time,
+        },
+        index=pd.DatetimeIndex(prices.dates, name="Date"),
+    )
 
 
 # Update the get_price_data function to use the new functions
 def get_price_data(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
-    prices = get_prices(ticker, start_date, end_date)
-    return prices_to_df(prices)
+    return prices_to_df(get_price_series(ticker, start_date, end_date))
@@ -0,0 +1,327 @@
+"""Asyncio-native counterparts of the fetchers in src.tools.api.
+
+Each coroutine fetches whatever the shared cache is missing over httpx, stores
+it exactly as the synchronous fetcher would, and then returns the result from
+the cache. Cache calls run in worker threads, because reads and writes of the
+persistent store can wait on SQLite locks held by other processes.
+"""
+
+import asyncio
+import datetime
+import functools
+
+from src.data.cache import get_cache
+from src.data.models import (
+    CompanyNews,
+    CompanyNewsResponse,
+    FinancialMetrics,
+    FinancialMetricsResponse,
+    Price,
+    PriceResponse,
+    LineItem,
+    LineItemResponse,
+    InsiderTrade,
+    InsiderTradeResponse,
+    CompanyFacts,
+    CompanyFactsResponse,
+)
+from src.data.price_series import PriceSeries
+from src.data.stats import ENDPOINTS, get_data_stats
+from src.tools import api
+from src.tools.client import get_async_client
+from src.tools.singleflight import AsyncSingleFlight
+
+# Global cache instance
+_cache = get_cache()
+
+# Cache hits and misses and pages fetched per endpoint
+_stats = get_data_stats()
+
+# Fetches in flight on an event loop, keyed like the cache leases
+_inflight = AsyncSingleFlight()
+
+
+async def _fetch_once(key: str, fn):
+    """Run a fetch once for concurrent coroutines sharing a key; with a shared cache, also once across processes.
+
+    Callers waiting on another process find its results in the cache, so `fn` must re-check the cache first.
+    """
+
+    async def leased():
+        async with _cache.lease_async(key):
+            return await fn()
+
+    return await _inflight.do(key, leased)
+
+
+async def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
+    """Fetch price data from cache or API, only requesting the parts of the range that are not cached."""
+    return (await get_price_series(ticker, start_date, end_date)).to_prices()
+
+
+async def get_price_series(ticker: str, start_date: str, end_date: str) -> PriceSeries:
+    """Fetch price data as a columnar series from cache or API, only requesting the parts of the range that are not cached."""
+
+    async def fetch_missing_prices() -> PriceSeries:
+        fetched = PriceSeries.empty()
+        # Another process may have fetched them while we waited for the lease
+        missing_ranges = await asyncio.to_thread(_cache.get_missing_price_ranges, ticker, start_date, end_date)
+        results = await asyncio.gather(*(_fetch_prices(ticker, missing_start, missing_end) for missing_start, missing_end in missing_ranges))
+        for (missing_start, missing_end), prices in zip(missing_ranges, results):
+            series = PriceSeries.from_prices(prices)
+            await asyncio.to_thread(_cache.set_prices, ticker, series, missing_start, missing_end)
+            fetched = series.merge(fetched)
+        return fetched
+
+    missing_ranges = await asyncio.to_thread(_cache.get_missing_price_ranges, ticker, start_date, end_date)
+    _stats.record_lookup("prices", hit=not missing_ranges)
+    fetched = await _fetch_once(f"prices_{ticker}_{start_date}_{end_date}", fetch_missing_prices) if missing_ranges else PriceSeries.empty()
+
+    if (series := await asyncio.to_thread(_cache.get_prices, ticker, start_date, end_date)) is not None:
+        return series
+    # The series was evicted or overwritten since it was fetched, so answer from the fetched bars and whatever is still cached
+    return fetched.merge(await asyncio.to_thread(_cache.get_cached_prices, ticker, start_date, end_date))
+
+
+async def _fetch_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
+    """Fetch price data for a date range from the API."""
+    params = {"ticker": ticker, "interval": "day", "interval_multiplier": 1, "start_date": start_date, "end_date": end_date}
+    response = await get_async_client().get("/prices/", params=params)
+    if response.status_code != 200:
+        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+
+    return PriceResponse(**response.json()).prices
+
+
+async def get_financial_metrics(
+    ticker: str,
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> list[FinancialMetrics]:
+    """Fetch financial metrics from cache or API."""
+    if cached_data := await asyncio.to_thread(_cache.get_financial_metrics, ticker, period, end_date, limit):
+        _stats.record_lookup("financial_metrics", hit=True)
+        return cached_data
+
+    _stats.record_lookup("financial_metrics", hit=False)
+
+    async def fetch_financial_metrics() -> list[FinancialMetrics]:
+        # Another process may have fetched them while we waited for the lease
+        if cached_data := await asyncio.to_thread(_cache.get_financial_metrics, ticker, period, end_date, limit):
+            return cached_data
+
+        params = {"ticker": ticker, "report_period_lte": end_date, "limit": limit, "period": period}
+        response = await get_async_client().get("/financial-metrics/", params=params)
+        if response.status_code != 200:
+            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+
+        financial_metrics = FinancialMetricsResponse(**response.json()).financial_metrics
+        if not financial_metrics:
+            return []
+        await asyncio.to_thread(_cache.set_financial_metrics, ticker, period, end_date, limit, financial_metrics)
+        return financial_metrics
+
+    return await _fetch_once(f"financial_metrics_{ticker}_{period}_{end_date}_{limit}", fetch_financial_metrics)
+
+
+async def search_line_items(
+    ticker: str,
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> list[LineItem]:
+    """Fetch line items from cache or API, only requesting the fields that are not cached."""
+    return (await search_line_items_batch([ticker], line_items, end_date, period, limit))[ticker]
+
+
+async def search_line_items_batch(
+    tickers: list[str],
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> dict[str, list[LineItem]]:
+    """Fetch line items for many tickers from cache or API, sharing requests between tickers that miss the same fields."""
+
+    async def fetch_line_items(batch: list[str], missing_line_items: list[str], fetch_limit: int) -> list[LineItem]:
+        body = {
+            "tickers": batch,
+            "line_items": missing_line_items,
+            "end_date": end_date,
+            "period": period,
+            "limit": fetch_limit,
+        }
+        response = await get_async_client().post("/financials/search/line-items", json=body)
+        if response.status_code != 200:
+            raise Exception(f"Error fetching data: {','.join(batch)} - {response.status_code} - {response.text}")
+        return LineItemResponse(**response.json()).search_results
+
+    async def fetch_missing_line_items(batch: list[str], missing_line_items: list[str], fetch_limit: int) -> dict[str, list[dict[str, any]]]:
+        # Another process may have fetched these while we waited for the lease
+        batch = [ticker for ticker in batch if (await asyncio.to_thread(_cache.get_missing_line_items, ticker, period, end_date, limit, missing_line_items))[0]]
+        if not batch:
+            return {}
+        search_results = await fetch_line_items(batch, missing_line_items, fetch_limit)
+        rows = await asyncio.to_thread(api._cache_line_items_by_ticker, batch, period, end_date, fetch_limit, missing_line_items, search_results)
+        # Tickers the shared response did not answer for are asked about on their own
+        unanswered = [ticker for ticker in batch if ticker not in rows]
+        for ticker, results in zip(unanswered, await asyncio.gather(*(fetch_line_items([ticker], missing_line_items, fetch_limit) for ticker in unanswered))):
+            rows.update(await asyncio.to_thread(api._cache_line_items_by_ticker, [ticker], period, end_date, fetch_limit, missing_line_items, results))
+        return rows
+
+    fetched = {}
+    batches = await asyncio.to_thread(api._plan_line_item_batches, tickers, line_items, end_date, period, limit)
+    api._record_line_item_lookups(tickers, batches)
+    # A second pass is only needed if the reported periods changed while adding fields
+    for _ in range(2):
+        if not batches:
+            break
+        fetches = [
+            _fetch_once(
+                f"line_items_{','.join(batch)}_{period}_{end_date}_{fetch_limit}_{','.join(missing_line_items)}",
+                functools.partial(fetch_missing_line_items, batch, missing_line_items, fetch_limit),
+            )
+            for batch, missing_line_items, fetch_limit in batches
+        ]
+        for rows in await asyncio.gather(*fetches):
+            api._merge_line_item_rows(fetched, rows)
+        batches = await asyncio.to_thread(api._plan_line_item_batches, tickers, line_items, end_date, period, limit)
+
+    return await asyncio.to_thread(api._line_items_from_cache, tickers, line_items, end_date, period, limit, fetched)
+
+
+async def get_insider_trades(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+) -> list[InsiderTrade]:
+    """Fetch insider trades from cache or API, only requesting the parts of the window that are not cached."""
+
+    async def fetch_missing_insider_trades() -> list[InsiderTrade]:
+        fetched = []
+        # Another process may have fetched them while we waited for the lease
+        for fetch_start, fetch_end in await asyncio.to_thread(_cache.get_missing_insider_trade_ranges, ticker, end_date, start_date, limit):
+            params = {"ticker": ticker}
+            if fetch_start:
+                params["filing_date_gte"] = fetch_start
+            params["limit"] = limit
+            trades = await _paginate("/insider-trades/", params, "filing_date_lte", fetch_end, fetch_start, limit, lambda data: InsiderTradeResponse(**data).insider_trades, lambda trade: trade.filing_date)
+            await asyncio.to_thread(_cache.set_insider_trades, ticker, trades, fetch_end, fetch_start, limit)
+            fetched.extend(trades)
+        return fetched
+
+    missing_ranges = await asyncio.to_thread(_cache.get_missing_insider_trade_ranges, ticker, end_date, start_date, limit)
+    _stats.record_lookup("insider_trades", hit=not missing_ranges)
+    fetched = await _fetch_once(f"insider_trades_{ticker}_{start_date or 'none'}_{end_date}_{limit}", fetch_missing_insider_trades) if missing_ranges else []
+
+    if (cached_data := await asyncio.to_thread(_cache.get_insider_trades, ticker, end_date, start_date, limit)) is not None:
+        return cached_data
+    # The records were evicted or overwritten since they were fetched, so answer from the ones fetched here
+    return api._records_in_window(fetched, "filing_date", end_date, start_date, limit)
+
+
+async def get_company_news(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+) -> list[CompanyNews]:
+    """Fetch company news from cache or API, only requesting the parts of the window that are not cached."""
+
+    async def fetch_missing_company_news() -> list[CompanyNews]:
+        fetched = []
+        # Another process may have fetched them while we waited for the lease
+        for fetch_start, fetch_end in await asyncio.to_thread(_cache.get_missing_company_news_ranges, ticker, end_date, start_date, limit):
+            params = {"ticker": ticker}
+            if fetch_start:
+                params["start_date"] = fetch_start
+            params["limit"] = limit
+            news = await _paginate("/news/", params, "end_date", fetch_end, fetch_start, limit, lambda data: CompanyNewsResponse(**data).news, lambda news: news.date)
+            await asyncio.to_thread(_cache.set_company_news, ticker, news, fetch_end, fetch_start, limit)
+            fetched.extend(news)
+        return fetched
+
+    missing_ranges = await asyncio.to_thread(_cache.get_missing_company_news_ranges, ticker, end_date, start_date, limit)
+    _stats.record_lookup("company_news", hit=not missing_ranges)
+    fetched = await _fetch_once(f"company_news_{ticker}_{start_date or 'none'}_{end_date}_{limit}", fetch_missing_company_news) if missing_ranges else []
+
+    if (cached_data := await asyncio.to_thread(_cache.get_company_news, ticker, end_date, start_date, limit)) is not None:
+        return cached_data
+    # The records were evicted or overwritten since they were fetched, so answer from the ones fetched here
+    return api._records_in_window(fetched, "date", end_date, start_date, limit)
+
+
+async def _paginate(path, params, end_date_param, end_date, start_date, limit, parse, get_date) -> list:
+    """Page backwards through a date-ordered endpoint, mirroring the pagination in src.tools.api."""
+    results = []
+    current_end_date = end_date
+
+    while True:
+        response = await get_async_client().get(path, params={**params, end_date_param: current_end_date})
+        if response.status_code != 200:
+            raise Exception(f"Error fetching data: {params['ticker']} - {response.status_code} - {response.text}")
+        _stats.record_page(ENDPOINTS[path])
+
+        page = parse(response.json())
+        if not page:
+            break
+
+        results.extend(page)
+
+        # Only continue pagination if we have a start_date and got a full page
+        if not start_date or len(page) < limit:
+            break
+
+        # Update end_date to the oldest date from current batch for next iteration
+        current_end_date = min(get_date(item) for item in page).split("T")[0]
+
+        # If we've reached or passed the start_date, we can stop
+        if current_end_date <= start_date:
+            break
+
+    return results
+
+
+async def get_company_facts(ticker: str) -> CompanyFacts | None:
+    """Fetch company facts from cache or API."""
+    if cached_data := await asyncio.to_thread(_cache.get_company_facts, ticker):
+        _stats.record_lookup("company_facts", hit=True)
+        return cached_data
+
+    _stats.record_lookup("company_facts", hit=False)
+
+    async def fetch_company_facts() -> CompanyFacts | None:
+        # Another process may have fetched them while we waited for the lease
+        if cached_data := await asyncio.to_thread(_cache.get_company_facts, ticker):
+            return cached_data
+
+        response = await get_async_client().get("/company/facts/", params={"ticker": ticker})
+        if response.status_code != 200:
+            print(f"Error fetching company facts: {ticker} - {response.status_code}")
+            return None
+        company_facts = CompanyFactsResponse(**response.json()).company_facts
+        await asyncio.to_thread(_cache.set_company_facts, ticker, company_facts)
+        return company_facts
+
+    return await _fetch_once(f"company_facts_{ticker}", fetch_company_facts)
+
+
+async def get_market_cap(
+    ticker: str,
+    end_date: str,
+) -> float | None:
+    """Fetch market cap from the API."""
+    # Check if end_date is today
+    if end_date == datetime.datetime.now().strftime("%Y-%m-%d"):
+        # Get the market cap from company facts API
+        company_facts = await get_company_facts(ticker)
+        return company_facts.market_cap if company_facts else None
+
+    financial_metrics = await get_financial_metrics(ticker, end_date)
+    if not financial_metrics:
+        return None
+
+    return financial_metrics[0].market_cap or None
@@ -0,0 +1,207 @@
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.data.stats import get_data_stats
+from src.tools.rate_limit import RateLimiter, get_rate_limiter
+
+# Status codes that indicate a transient failure worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+class _BaseClient:
+    """Configuration and retry policy shared by the sync and async clients."""
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+        backoff_factor: float | None = None,
+        max_backoff: float | None = None,
+        pool_size: int | None = None,
+        max_concurrency: int | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        self.base_url = (base_url or os.environ.get("FINANCIAL_DATASETS_BASE_URL") or "https://api.financialdatasets.ai").rstrip("/")
+        self.timeout = timeout if timeout is not None else _env_float("FINANCIAL_DATASETS_TIMEOUT", 30.0)
+        self.max_retries = max_retries if max_retries is not None else _env_int("FINANCIAL_DATASETS_MAX_RETRIES", 5)
+        self.backoff_factor = backoff_factor if backoff_factor is not None else _env_float("FINANCIAL_DATASETS_BACKOFF_FACTOR", 0.5)
+        self.max_backoff = max_backoff if max_backoff is not None else _env_float("FINANCIAL_DATASETS_MAX_BACKOFF", 60.0)
+        self.pool_size = pool_size if pool_size is not None else _env_int("FINANCIAL_DATASETS_POOL_SIZE", 32)
+        self.max_concurrency = max_concurrency if max_concurrency is not None else _env_int("FINANCIAL_DATASETS_MAX_CONCURRENCY", 8)
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+
+    def _headers(self) -> dict[str, str]:
+        headers = {}
+        if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
+            headers["X-API-KEY"] = api_key
+        return headers
+
+    def _backoff(self, attempt: int, response: requests.Response | httpx.Response | None = None) -> float:
+        """Seconds to wait before the next attempt, preferring the server's Retry-After hint."""
+        if response is not None and (retry_after := response.headers.get("Retry-After")):
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                try:
+                    return min(max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0), self.max_backoff)
+                except (TypeError, ValueError):
+                    pass
+        delay = self.backoff_factor * (2**attempt)
+        return min(delay + random.uniform(0, delay), self.max_backoff)
+
+
+class FinancialDatasetsClient(_BaseClient):
+    """HTTP client for the financialdatasets.ai API.
+
+    Wraps a single requests.Session so that connections are kept alive and
+    pooled across calls, and retries rate-limited (429) and server error
+    responses with exponential backoff, honoring the Retry-After header.
+    Requests are paced by the shared rate limiter and the number in flight is
+    bounded, so excess requests queue instead of failing.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._in_flight = threading.BoundedSemaphore(self.max_concurrency)
+        self.session = requests.Session()
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request, retrying transient failures.
+
+        The final response is returned as-is once retries are exhausted, so
+        callers keep handling non-200 status codes themselves.
+        """
+        url = f"{self.base_url}{path}"
+        kwargs.setdefault("timeout", self.timeout)
+        stats = get_data_stats()
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                stats.record_retry(path)
+            try:
+                with self._in_flight:
+                    self.rate_limiter.acquire()
+                    with stats.time_request(path) as timing:
+                        response = self.session.request(method, url, headers=self._headers(), **kwargs)
+                        timing.update(bytes=len(response.content), error=response.status_code != 200)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                return response
+            if response.status_code == 429:
+                # Rate limited: hold back every caller until the server is ready again
+                self.rate_limiter.pause(self._backoff(attempt, response))
+            else:
+                time.sleep(self._backoff(attempt, response))
+
+    def get(self, path: str, params: dict | None = None) -> requests.Response:
+        return self.request("GET", path, params=params)
+
+    def post(self, path: str, json: dict | None = None) -> requests.Response:
+        return self.request("POST", path, json=json)
+
+
+class AsyncFinancialDatasetsClient(_BaseClient):
+    """Asyncio counterpart of FinancialDatasetsClient built on httpx.
+
+    Applies the same retry policy, pacing and bound on requests in flight,
+    so callers can gather many fetches at once.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._in_flight = asyncio.Semaphore(self.max_concurrency)
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            headers={"Accept-Encoding": "gzip, deflate"},
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+        )
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying transient failures."""
+        stats = get_data_stats()
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                stats.record_retry(path)
+            try:
+                async with self._in_flight:
+                    await self.rate_limiter.acquire_async()
+                    with stats.time_request(path) as timing:
+                        response = await self.client.request(method, path, headers=self._headers(), **kwargs)
+                        timing.update(bytes=len(response.content), error=response.status_code != 200)
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                return response
+            if response.status_code == 429:
+                # Rate limited: hold back every caller until the server is ready again
+                self.rate_limiter.pause(self._backoff(attempt, response))
+            else:
+                await asyncio.sleep(self._backoff(attempt, response))
+
+    async def get(self, path: str, params: dict | None = None) -> httpx.Response:
+        return await self.request("GET", path, params=params)
+
+    async def post(self, path: str, json: dict | None = None) -> httpx.Response:
+        return await self.request("POST", path, json=json)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+_client: FinancialDatasetsClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> FinancialDatasetsClient:
+    """Get the shared client, creating it on first use so .env settings are picked up."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = FinancialDatasetsClient()
+    return _client
+
+
+# httpx connection pools and asyncio semaphores belong to one event loop, so keep one async client per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncFinancialDatasetsClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> AsyncFinancialDatasetsClient:
+    """Get the async client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _async_clients:
+        _async_clients[loop] = AsyncFinancialDatasetsClient()
+    return _async_clients[loop]
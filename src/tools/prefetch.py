@@ -0,0 +1,102 @@
+"""Plan and run the data fetches of a hedge fund run before the analysts start.
+
+Each analyst declares its data needs in ANALYST_CONFIG. The planner merges the
+needs of the selected analysts into the smallest set of API calls whose cached
+results answer every analyst's own queries (the largest limit per period, the
+union of line items, the longest lookback), and the runners execute those
+calls concurrently so the analysts themselves only read from the cache.
+Line items are searched for all tickers at once, so those calls carry the list
+of tickers in place of a single ticker.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+from src.tools import api, async_api
+from src.utils.analysts import ANALYST_CONFIG
+
+# Limit of the ttm financial metrics get_market_cap reads for past end dates
+MARKET_CAP_METRICS_LIMIT = 10
+
+# API function that runs each planned endpoint call, as fetcher(ticker, **kwargs) or fetcher(tickers, **kwargs) for line items
+FETCHERS = {
+    "prices": api.get_price_series,
+    "financial_metrics": api.get_financial_metrics,
+    "line_items": api.search_line_items_batch,
+    "insider_trades": api.get_insider_trades,
+    "company_news": api.get_company_news,
+    "company_facts": api.get_company_facts,
+}
+
+ASYNC_FETCHERS = {
+    "prices": async_api.get_price_series,
+    "financial_metrics": async_api.get_financial_metrics,
+    "line_items": async_api.search_line_items_batch,
+    "insider_trades": async_api.get_insider_trades,
+    "company_news": async_api.get_company_news,
+    "company_facts": async_api.get_company_facts,
+}
+
+
+def plan_prefetch(selected_analysts: list[str], tickers: list[str], start_date: str, end_date: str) -> list[tuple[str, str | list[str], dict]]:
+    """Merge the data needs of the selected analysts into (endpoint, ticker, kwargs) calls."""
+    metrics_limits: dict[str, int] = {}
+    line_items: dict[str, dict] = {}
+    latest_limits = {"insider_trades": 0, "company_news": 0}
+    lookbacks: dict[str, dict] = {}
+    needs_market_cap = False
+
+    for analyst in selected_analysts:
+        data = ANALYST_CONFIG.get(analyst, {}).get("data", {})
+        for period, limit in data.get("financial_metrics", {}).items():
+            metrics_limits[period] = max(metrics_limits.get(period, 0), limit)
+        for period, request in data.get("line_items", {}).items():
+            merged = line_items.setdefault(period, {"limit": 0, "fields": set()})
+            merged["limit"] = max(merged["limit"], request["limit"])
+            merged["fields"].update(request["fields"])
+        for endpoint in ("insider_trades", "company_news"):
+            if request := data.get(endpoint):
+                if "lookback_days" in request:
+                    merged = lookbacks.setdefault(endpoint, {"lookback_days": 0, "limit": 0})
+                    merged["lookback_days"] = max(merged["lookback_days"], request["lookback_days"])
+                    merged["limit"] = max(merged["limit"], request["limit"])
+                else:
+                    latest_limits[endpoint] = max(latest_limits[endpoint], request["limit"])
+        needs_market_cap = needs_market_cap or data.get("market_cap", False)
+
+    is_today = end_date == datetime.now().strftime("%Y-%m-%d")
+    if needs_market_cap and not is_today:
+        metrics_limits["ttm"] = max(metrics_limits.get("ttm", 0), MARKET_CAP_METRICS_LIMIT)
+
+    calls = []
+    for period, request in line_items.items():
+        calls.append(("line_items", list(tickers), {"line_items": sorted(request["fields"]), "end_date": end_date, "period": period, "limit": request["limit"]}))
+    for ticker in tickers:
+        # The risk manager always reads prices over the run's window
+        calls.append(("prices", ticker, {"start_date": start_date, "end_date": end_date}))
+        for period, limit in metrics_limits.items():
+            calls.append(("financial_metrics", ticker, {"end_date": end_date, "period": period, "limit": limit}))
+        for endpoint, limit in latest_limits.items():
+            if limit:
+                calls.append((endpoint, ticker, {"end_date": end_date, "limit": limit}))
+        for endpoint, request in lookbacks.items():
+            lookback_start = (datetime.fromisoformat(end_date) - timedelta(days=request["lookback_days"])).date().isoformat()
+            calls.append((endpoint, ticker, {"end_date": end_date, "start_date": lookback_start, "limit": request["limit"]}))
+        if needs_market_cap and is_today:
+            calls.append(("company_facts", ticker, {}))
+    return calls
+
+
+def prefetch(calls: list[tuple[str, str | list[str], dict]], max_workers: int = 8):
+    """Run planned calls on a thread pool.
+
+    Failures are ignored here; the analysts fall back to fetching the data themselves.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        wait([executor.submit(FETCHERS[endpoint], ticker, **kwargs) for endpoint, ticker, kwargs in calls])
+
+
+async def prefetch_async(calls: list[tuple[str, str | list[str], dict]]):
+    """Run planned calls concurrently on the event loop, ignoring failures like `prefetch`."""
+    await asyncio.gather(*(ASYNC_FETCHERS[endpoint](ticker, **kwargs) for endpoint, ticker, kwargs in calls), return_exceptions=True)
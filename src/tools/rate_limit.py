@@ -0,0 +1,66 @@
+import asyncio
+import os
+import threading
+import time
+
+
+class RateLimiter:
+    """Token-bucket limiter shared by every request to the data API.
+
+    Callers reserve a token before each request and sleep until it is due, so
+    bursts queue up and drain at a steady `rate` instead of tripping the API's
+    rate limit. A rate of 0 disables pacing. Independently of the rate, `pause`
+    holds back all callers, which is used to honor a server's Retry-After.
+    """
+
+    def __init__(self, rate: float = 0.0, burst: int = 1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller has to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self._paused_until - now, 0.0)
+            if self.rate > 0:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def acquire(self):
+        """Block until the next request may be sent."""
+        if wait := self._reserve():
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait, without blocking the event loop, until the next request may be sent."""
+        if wait := self._reserve():
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold back all requests for the given number of seconds."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+_rate_limiter: RateLimiter | None = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide limiter, configured from the environment on first use."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                rate = float(os.environ.get("FINANCIAL_DATASETS_RATE_LIMIT") or 0)
+                burst = int(os.environ.get("FINANCIAL_DATASETS_RATE_BURST") or max(int(rate), 1))
+                _rate_limiter = RateLimiter(rate, burst)
+    return _rate_limiter
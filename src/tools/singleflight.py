@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from collections.abc import Awaitable
+from concurrent.futures import Future
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """De-duplicates concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still in flight block until it finishes and receive the same result (or
+    exception) instead of issuing their own request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """Asyncio counterpart of SingleFlight.
+
+    The first coroutine for a key on an event loop runs the function; coroutines
+    arriving while it is still in flight await the same result (or exception).
+    Cancelling a waiter does not cancel the shared call.
+    """
+
+    def __init__(self):
+        self._calls: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        if (future := self._calls.get((loop, key))) is not None:
+            return await asyncio.shield(future)
+
+        future = self._calls[(loop, key)] = loop.create_future()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved, as there may be no waiters to see it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[(loop, key)]
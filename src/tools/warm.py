@@ -0,0 +1,152 @@
+"""Bulk-populate the financial data cache for a universe of tickers.
+
+Fetches, fanned out over a worker pool, what the analyst agents declare in
+ANALYST_CONFIG for each business day of a date range (the days a backtest
+steps through): the financial metrics and line items as of every day, prices
+over the whole range and the backtester's lookback before it, and insider
+trades and news over the whole range plus whatever the analysts read before
+its first day. It also fetches what the backtester itself reads up front. Point FINANCIAL_DATA_CACHE_DIR at the same directory for the
+warm-up and the run.
+
+Data of windows that end before today never expires, so a backtest over the
+warmed range is served from the cache. Data ending today expires after the
+live-data TTLs (FINANCIAL_DATA_TTL_<CATEGORY>, minutes to an hour), so a
+warm-up for a trading run only helps within that window unless --live-ttl
+keeps it for longer.
+
+    poetry run python -m src.tools.warm --tickers AAPL,MSFT,NVDA --start 2024-01-01 --end 2024-12-31
+    poetry run python -m src.tools.warm --tickers AAPL,MSFT,NVDA --live-ttl 43200
+"""
+
+import argparse
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+from dotenv import load_dotenv
+from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+from rich.table import Table
+
+from src.data.cache import CACHE_DIR_ENV, get_cache
+from src.data.freshness import DEFAULT_TTLS, FreshnessPolicy
+from src.tools.prefetch import FETCHERS, plan_prefetch
+from src.utils.analysts import ANALYST_CONFIG
+
+console = Console()
+
+# Page size for the trades and news fetched over the whole warm-up range
+WINDOW_LIMIT = 1000
+
+# Days of prices before each day that the backtester hands the agents (see Backtester.run_backtest)
+BACKTEST_LOOKBACK_DAYS = 30
+
+# Prices and ttm metrics the backtester reads up front (see Backtester.prefetch_data)
+BACKTEST_PRICE_HISTORY = relativedelta(years=1)
+BACKTEST_METRICS_LIMIT = 10
+
+
+def plan_tasks(tickers: list[str], start_date: str, end_date: str) -> list[tuple[str, str | list[str], dict]]:
+    """List the (endpoint, ticker, kwargs) calls needed to warm the cache for every analyst on every business day of the range."""
+    # The backtester reads a year of prices up front, and hands each day's agents the BACKTEST_LOOKBACK_DAYS before it
+    prices_start = min(datetime.fromisoformat(end_date) - BACKTEST_PRICE_HISTORY, datetime.fromisoformat(start_date) - timedelta(days=BACKTEST_LOOKBACK_DAYS)).date().isoformat()
+    calls = [(endpoint, ticker, {**kwargs, "start_date": prices_start} if endpoint == "prices" else kwargs) for endpoint, ticker, kwargs in plan_prefetch(list(ANALYST_CONFIG), tickers, start_date, end_date)]
+    calls.extend(("financial_metrics", ticker, {"end_date": end_date, "period": "ttm", "limit": BACKTEST_METRICS_LIMIT}) for ticker in tickers)
+    # Metrics and line items are cached per end date, and a backtest reads them as of each day it steps through
+    for day in pd.date_range(start_date, end_date, freq="B").strftime("%Y-%m-%d"):
+        if day != end_date:
+            calls.extend(call for call in plan_prefetch(list(ANALYST_CONFIG), tickers, day, day) if call[0] in ("financial_metrics", "line_items"))
+    # Backtests move the analysts' end date across the whole range, so cover trades and news over all of it; together with
+    # the analysts' queries as of the first day (their latest records, or their lookback), that answers them on any later day
+    calls.extend(call for call in plan_prefetch(list(ANALYST_CONFIG), tickers, start_date, start_date) if call[0] in ("insider_trades", "company_news"))
+    for ticker in tickers:
+        calls.append(("insider_trades", ticker, {"end_date": end_date, "start_date": start_date, "limit": WINDOW_LIMIT}))
+        calls.append(("company_news", ticker, {"end_date": end_date, "start_date": start_date, "limit": WINDOW_LIMIT}))
+    return calls
+
+
+def warm_cache(tickers: list[str], start_date: str, end_date: str, workers: int = 8) -> dict[str, dict[str, float]]:
+    """Run the warm-up fetches on a thread pool and return per-endpoint stats."""
+    tasks = plan_tasks(tickers, start_date, end_date)
+    stats = defaultdict(lambda: {"calls": 0, "errors": 0, "seconds": 0.0})
+    lock = threading.Lock()
+
+    def run(endpoint: str, ticker: str | list[str], kwargs: dict):
+        started = time.perf_counter()
+        try:
+            FETCHERS[endpoint](ticker, **kwargs)
+            error = None
+        except Exception as e:
+            error = e
+        elapsed = time.perf_counter() - started
+        with lock:
+            stats[endpoint]["calls"] += 1
+            stats[endpoint]["seconds"] += elapsed
+            if error:
+                stats[endpoint]["errors"] += 1
+        # Batched line item calls cover several tickers
+        return endpoint, ticker if isinstance(ticker, str) else ",".join(ticker), error
+
+    started = time.perf_counter()
+    with Progress(TextColumn("[progress.description]{task.description}"), BarColumn(), MofNCompleteColumn(), TimeElapsedColumn(), console=console) as progress:
+        bar = progress.add_task("Warming cache", total=len(tasks))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run, *task) for task in tasks]
+            for future in as_completed(futures):
+                endpoint, ticker, error = future.result()
+                if error:
+                    progress.console.print(f"[red]Error warming {endpoint} for {ticker}: {error}[/red]")
+                progress.update(bar, advance=1, description=f"Warming cache ({ticker} {endpoint})")
+
+    wall_seconds = time.perf_counter() - started
+    for endpoint_stats in stats.values():
+        endpoint_stats["throughput"] = endpoint_stats["calls"] / wall_seconds if wall_seconds else 0.0
+    return dict(stats)
+
+
+def print_stats(stats: dict[str, dict[str, float]]):
+    table = Table(title="Cache warm-up")
+    table.add_column("Endpoint")
+    table.add_column("Calls", justify="right")
+    table.add_column("Errors", justify="right")
+    table.add_column("Avg latency (s)", justify="right")
+    table.add_column("Throughput (calls/s)", justify="right")
+    for endpoint, endpoint_stats in stats.items():
+        table.add_row(
+            endpoint,
+            str(endpoint_stats["calls"]),
+            str(endpoint_stats["errors"]),
+            f"{endpoint_stats['seconds'] / endpoint_stats['calls']:.2f}",
+            f"{endpoint_stats['throughput']:.2f}",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Populate the financial data cache ahead of a backtest over the same range, or a trading run within the live-data TTLs")
+    parser.add_argument("--tickers", type=str, required=True, help="Comma-separated list of stock ticker symbols")
+    parser.add_argument("--start", type=str, help="Start date (YYYY-MM-DD). Defaults to 1 year before end date")
+    parser.add_argument("--end", type=str, default=datetime.now().strftime("%Y-%m-%d"), help="End date (YYYY-MM-DD). Defaults to today")
+    parser.add_argument("--workers", type=int, default=8, help="Number of concurrent fetches. Defaults to 8")
+    parser.add_argument("--live-ttl", type=float, help="Seconds that warmed data ending today stays valid. Defaults to the FINANCIAL_DATA_TTL_<CATEGORY> settings (minutes)")
+    args = parser.parse_args()
+
+    tickers = [ticker.strip() for ticker in args.tickers.split(",")]
+    start_date = args.start or (datetime.strptime(args.end, "%Y-%m-%d") - relativedelta(years=1)).strftime("%Y-%m-%d")
+
+    if not os.environ.get(CACHE_DIR_ENV):
+        console.print(f"[yellow]{CACHE_DIR_ENV} is not set, so the warmed data only lives as long as this process.[/yellow]")
+
+    if args.live_ttl is not None:
+        get_cache().freshness = FreshnessPolicy({category: args.live_ttl for category in DEFAULT_TTLS})
+    elif args.end >= datetime.now().strftime("%Y-%m-%d"):
+        console.print("[yellow]Data ending today expires after the live-data TTLs; run within them, or pass --live-ttl to keep it longer.[/yellow]")
+
+    print_stats(warm_cache(tickers, start_date, args.end, args.workers))
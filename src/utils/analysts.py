@@ -16,82 +16,170 @@ from src.agents.valuation import valuation_analyst_agent
 from src.agents.warren_buffett import warren_buffett_agent
 from src.agents.rakesh_jhunjhunwala import rakesh_jhunjhunwala_agent
 
-# Define analyst configuration - single source of truth
+# Define analyst configuration - single source of truth.
+# "data" declares what each analyst fetches per ticker, so it can be prefetched before the analysts run:
+#   prices: price history over the run's start_date..end_date window
+#   financial_metrics: {period: limit}
+#   line_items: {period: {"limit": limit, "fields": [...]}}
+#   market_cap: company facts as of today, or the latest ttm financial metrics for past dates
+#   insider_trades / company_news: the latest `limit` records, or every record over `lookback_days` if given
 ANALYST_CONFIG = {
     "aswath_damodaran": {
         "display_name": "Aswath Damodaran",
         "agent_func": aswath_damodaran_agent,
         "order": 0,
+        "data": {
+            "financial_metrics": {"ttm": 5},
+            "line_items": {"ttm": {"limit": 10, "fields": ["free_cash_flow", "ebit", "interest_expense", "capital_expenditure", "depreciation_and_amortization", "outstanding_shares", "net_income", "total_debt"]}},
+            "market_cap": True,
+        },
     },
     "ben_graham": {
         "display_name": "Ben Graham",
         "agent_func": ben_graham_agent,
         "order": 1,
+        "data": {
+            "financial_metrics": {"annual": 10},
+            "line_items": {"annual": {"limit": 10, "fields": ["earnings_per_share", "revenue", "net_income", "book_value_per_share", "total_assets", "total_liabilities", "current_assets", "current_liabilities", "dividends_and_other_cash_distributions", "outstanding_shares"]}},
+            "market_cap": True,
+        },
     },
     "bill_ackman": {
         "display_name": "Bill Ackman",
         "agent_func": bill_ackman_agent,
         "order": 2,
+        "data": {
+            "financial_metrics": {"annual": 5},
+            "line_items": {"annual": {"limit": 5, "fields": ["revenue", "operating_margin", "debt_to_equity", "free_cash_flow", "total_assets", "total_liabilities", "dividends_and_other_cash_distributions", "outstanding_shares"]}},
+            "market_cap": True,
+        },
     },
     "cathie_wood": {
         "display_name": "Cathie Wood",
         "agent_func": cathie_wood_agent,
         "order": 3,
+        "data": {
+            "financial_metrics": {"annual": 5},
+            "line_items": {"annual": {"limit": 5, "fields": ["revenue", "gross_margin", "operating_margin", "debt_to_equity", "free_cash_flow", "total_assets", "total_liabilities", "dividends_and_other_cash_distributions", "outstanding_shares", "research_and_development", "capital_expenditure", "operating_expense"]}},
+            "market_cap": True,
+        },
     },
     "charlie_munger": {
         "display_name": "Charlie Munger",
         "agent_func": charlie_munger_agent,
         "order": 4,
+        "data": {
+            "financial_metrics": {"annual": 10},
+            "line_items": {"annual": {"limit": 10, "fields": ["revenue", "net_income", "operating_income", "return_on_invested_capital", "gross_margin", "operating_margin", "free_cash_flow", "capital_expenditure", "cash_and_equivalents", "total_debt", "shareholders_equity", "outstanding_shares", "research_and_development", "goodwill_and_intangible_assets"]}},
+            "market_cap": True,
+            "insider_trades": {"limit": 100},
+            "company_news": {"limit": 100},
+        },
     },
     "michael_burry": {
         "display_name": "Michael Burry",
         "agent_func": michael_burry_agent,
         "order": 5,
+        "data": {
+            "financial_metrics": {"ttm": 5},
+            "line_items": {"ttm": {"limit": 10, "fields": ["free_cash_flow", "net_income", "total_debt", "cash_and_equivalents", "total_assets", "total_liabilities", "outstanding_shares", "issuance_or_purchase_of_equity_shares"]}},
+            "market_cap": True,
+            "insider_trades": {"limit": 1000, "lookback_days": 365},
+            "company_news": {"limit": 250, "lookback_days": 365},
+        },
     },
     "peter_lynch": {
         "display_name": "Peter Lynch",
         "agent_func": peter_lynch_agent,
         "order": 6,
+        "data": {
+            "prices": True,
+            "financial_metrics": {"annual": 5},
+            "line_items": {"annual": {"limit": 5, "fields": ["revenue", "earnings_per_share", "net_income", "operating_income", "gross_margin", "operating_margin", "free_cash_flow", "capital_expenditure", "cash_and_equivalents", "total_debt", "shareholders_equity", "outstanding_shares"]}},
+            "market_cap": True,
+            "insider_trades": {"limit": 50},
+            "company_news": {"limit": 50},
+        },
     },
     "phil_fisher": {
         "display_name": "Phil Fisher",
         "agent_func": phil_fisher_agent,
         "order": 7,
+        "data": {
+            "financial_metrics": {"annual": 5},
+            "line_items": {"annual": {"limit": 5, "fields": ["revenue", "net_income", "earnings_per_share", "free_cash_flow", "research_and_development", "operating_income", "operating_margin", "gross_margin", "total_debt", "shareholders_equity", "cash_and_equivalents", "ebit", "ebitda"]}},
+            "market_cap": True,
+            "insider_trades": {"limit": 50},
+            "company_news": {"limit": 50},
+        },
     },
     "rakesh_jhunjhunwala": {
         "display_name": "Rakesh Jhunjhunwala",
         "agent_func": rakesh_jhunjhunwala_agent,
         "order": 8,
+        "data": {
+            "financial_metrics": {"ttm": 5},
+            "line_items": {"ttm": {"limit": 10, "fields": ["net_income", "earnings_per_share", "ebit", "operating_income", "revenue", "operating_margin", "total_assets", "total_liabilities", "current_assets", "current_liabilities", "free_cash_flow", "dividends_and_other_cash_distributions", "issuance_or_purchase_of_equity_shares"]}},
+            "market_cap": True,
+        },
     },
     "stanley_druckenmiller": {
         "display_name": "Stanley Druckenmiller",
         "agent_func": stanley_druckenmiller_agent,
         "order": 9,
+        "data": {
+            "prices": True,
+            "financial_metrics": {"annual": 5},
+            "line_items": {"annual": {"limit": 5, "fields": ["revenue", "earnings_per_share", "net_income", "operating_income", "gross_margin", "operating_margin", "free_cash_flow", "capital_expenditure", "cash_and_equivalents", "total_debt", "shareholders_equity", "outstanding_shares", "ebit", "ebitda"]}},
+            "market_cap": True,
+            "insider_trades": {"limit": 50},
+            "company_news": {"limit": 50},
+        },
     },
     "warren_buffett": {
         "display_name": "Warren Buffett",
         "agent_func": warren_buffett_agent,
         "order": 10,
+        "data": {
+            "financial_metrics": {"ttm": 10},
+            "line_items": {"ttm": {"limit": 10, "fields": ["capital_expenditure", "depreciation_and_amortization", "net_income", "outstanding_shares", "total_assets", "total_liabilities", "shareholders_equity", "dividends_and_other_cash_distributions", "issuance_or_purchase_of_equity_shares", "gross_profit", "revenue", "free_cash_flow"]}},
+            "market_cap": True,
+        },
     },
     "technical_analyst": {
         "display_name": "Technical Analyst",
         "agent_func": technical_analyst_agent,
         "order": 11,
+        "data": {
+            "prices": True,
+        },
     },
     "fundamentals_analyst": {
         "display_name": "Fundamentals Analyst",
         "agent_func": fundamentals_analyst_agent,
         "order": 12,
+        "data": {
+            "financial_metrics": {"ttm": 10},
+        },
     },
     "sentiment_analyst": {
         "display_name": "Sentiment Analyst",
         "agent_func": sentiment_analyst_agent,
         "order": 13,
+        "data": {
+            "insider_trades": {"limit": 1000},
+            "company_news": {"limit": 100},
+        },
     },
     "valuation_analyst": {
         "display_name": "Valuation Analyst",
         "agent_func": valuation_analyst_agent,
         "order": 14,
+        "data": {
+            "financial_metrics": {"ttm": 8},
+            "line_items": {"ttm": {"limit": 2, "fields": ["free_cash_flow", "net_income", "depreciation_and_amortization", "capital_expenditure", "working_capital"]}},
+            "market_cap": True,
+        },
     },
 }
 
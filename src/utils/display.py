@@ -364,3 +364,40 @@ def format_backtest_row(
             f"{Fore.RED}{bearish_count}{Style.RESET_ALL}",
             f"{Fore.BLUE}{neutral_count}{Style.RESET_ALL}",
         ]
+
+
+def print_data_stats(stats: dict[str, dict]) -> None:
+    """Print per-endpoint cache and HTTP counters of the financial data layer"""
+    if not stats:
+        return
+
+    rows = []
+    for endpoint, counters in stats.items():
+        hit_rate = f"{counters['hit_rate']:.0%}" if counters["hit_rate"] is not None else "-"
+        mean_latency = f"{counters['mean_latency_seconds']:.3f}" if counters["mean_latency_seconds"] is not None else "-"
+        rows.append(
+            [
+                endpoint,
+                counters["hits"],
+                counters["misses"],
+                hit_rate,
+                counters["disk_reads"],
+                counters["requests"],
+                counters["pages"],
+                counters["retries"],
+                counters["errors"],
+                f"{counters['bytes'] / 1024:,.1f}",
+                f"{counters['latency_seconds']:.2f}",
+                mean_latency,
+            ]
+        )
+
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}DATA LAYER:{Style.RESET_ALL}")
+    print(
+        tabulate(
+            rows,
+            headers=["Endpoint", "Hits", "Misses", "Hit Rate", "Disk Reads", "Requests", "Pages", "Retries", "Errors", "KB", "HTTP Time (s)", "Mean Latency (s)"],
+            tablefmt="grid",
+            colalign=("left",) + ("right",) * 11,
+        )
+    )
@@ -1,12 +1,58 @@
 """Helper functions for LLM"""
 
+import asyncio
+import functools
 import json
-from pydantic import BaseModel
-from src.llm.models import get_model, get_model_info
+import os
+import threading
+import weakref
+from collections.abc import Awaitable
+from langchain_core.messages import HumanMessage
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, create_model
+from src.llm.cache import get_llm_cache
+from src.llm.models import ModelProvider, get_model_client, get_model_info, normalize_provider
 from src.utils.progress import progress
 from src.graph.state import AgentState
 
 
+# Environment variable capping the LLM calls in flight per provider, e.g. LLM_MAX_CONCURRENCY_OPENAI=32.
+# Without a provider suffix it sets the limit of every provider that has none of its own.
+LLM_MAX_CONCURRENCY_ENV = "LLM_MAX_CONCURRENCY"
+
+# Calls in flight per provider unless configured otherwise; local models serve few requests at once
+DEFAULT_MAX_CONCURRENCY = 8
+PROVIDER_MAX_CONCURRENCY = {ModelProvider.OPENAI.value: 32, ModelProvider.OLLAMA.value: 2}
+
+# Environment variable with the number of tickers an analyst sends in one LLM call (default 1, one call per ticker)
+LLM_BATCH_SIZE_ENV = "LLM_BATCH_SIZE"
+
+# Appended to an analyst's prompt when it covers several tickers at once
+BATCH_INSTRUCTIONS = """You are analyzing {count} tickers at once: {tickers}.
+The analysis data above is keyed by ticker. Analyze each ticker on its own merits and respond with a single JSON object of the form
+{{"signals": {{"<ticker>": <the JSON object requested above, for that ticker>}}}}
+with exactly one entry for each of {tickers}."""
+
+
+# Environment variables enabling the rule-based fast path, which answers decisive and data-starved cases without the LLM,
+# and the fractions of the maximum score at or beyond which an analyst's score counts as decisively bullish or bearish
+LLM_FAST_PATH_ENV = "LLM_FAST_PATH"
+LLM_FAST_PATH_BULLISH_ENV = "LLM_FAST_PATH_BULLISH"
+LLM_FAST_PATH_BEARISH_ENV = "LLM_FAST_PATH_BEARISH"
+DEFAULT_FAST_PATH_BULLISH = 0.85
+DEFAULT_FAST_PATH_BEARISH = 0.15
+
+
+class RuleBasedResponse:
+    """Marks a response produced by the rule-based fast path instead of the LLM."""
+
+
+class BatchResponse(BaseModel):
+    """Responses of a batched call by ticker, each validated on its own so one bad entry does not discard the rest."""
+
+    signals: dict[str, dict]
+
+
 def call_llm(
     prompt: any,
     pydantic_model: type[BaseModel],
@@ -14,6 +60,7 @@ def call_llm(
     state: AgentState | None = None,
     max_retries: int = 3,
     default_factory=None,
+    use_cache: bool = True,
 ) -> BaseModel:
     """
     Makes an LLM call with retry logic, handling both JSON supported and non-JSON supported models.
@@ -25,60 +72,289 @@ def call_llm(
         state: Optional state object to extract agent-specific model configuration
         max_retries: Maximum number of retries (default: 3)
         default_factory: Optional factory function to create default response on failure
+        use_cache: Whether to answer from, and store the response in, the persistent LLM response cache (default: True)
 
     Returns:
         An instance of the specified Pydantic model
     """
-    
-    # Extract model configuration if state is provided and agent_name is available
-    if state and agent_name:
-        model_name, model_provider = get_agent_model_config(state, agent_name)
-    
-    # Fallback to defaults if still not provided
-    if not model_name:
-        model_name = "gpt-4o"
-    if not model_provider:
-        model_provider = "OPENAI"
-
-    model_info = get_model_info(model_name, model_provider)
-    llm = get_model(model_name, model_provider)
-
-    # For non-JSON support models, we can use structured output
-    if not (model_info and not model_info.has_json_mode()):
-        llm = llm.with_structured_output(
-            pydantic_model,
-            method="json_mode",
-        )
+    call = _LLMCall(prompt, pydantic_model, agent_name, state, use_cache)
+    if call.cached_response:
+        return call.cached_response
 
     # Call the LLM with retries
     for attempt in range(max_retries):
         try:
             # Call the LLM
-            result = llm.invoke(prompt)
+            if (response := call.parse(call.llm.invoke(prompt))) is not None:
+                return response
+        except Exception as e:
+            if attempt == max_retries - 1:
+                return call.fail(e, max_retries, default_factory)
+            call.report_retry(attempt, max_retries)
 
-            # For non-JSON support models, we need to extract and parse the JSON manually
-            if model_info and not model_info.has_json_mode():
-                parsed_result = extract_json_from_response(result.content)
-                if parsed_result:
-                    return pydantic_model(**parsed_result)
-            else:
-                return result
+    # This should never be reached due to the retry logic above
+    return create_default_response(pydantic_model)
 
-        except Exception as e:
-            if agent_name:
-                progress.update_status(agent_name, None, f"Error - retry {attempt + 1}/{max_retries}")
 
+async def acall_llm(
+    prompt: any,
+    pydantic_model: type[BaseModel],
+    agent_name: str | None = None,
+    state: AgentState | None = None,
+    max_retries: int = 3,
+    default_factory=None,
+    use_cache: bool = True,
+) -> BaseModel:
+    """
+    Asyncio counterpart of call_llm, taking the same arguments.
+
+    Calls wait for a slot of their provider's concurrency limit, so any number
+    of them can be gathered at once. Response cache lookups and writes, and
+    building the client, run in worker threads so that a store waiting on a
+    SQLite lock does not hold up the other calls on the event loop.
+    """
+    call = await asyncio.to_thread(_LLMCall, prompt, pydantic_model, agent_name, state, use_cache)
+    if call.cached_response:
+        return call.cached_response
+
+    for attempt in range(max_retries):
+        try:
+            async with _get_provider_semaphore(call.model_provider):
+                result = await call.llm.ainvoke(prompt)
+            if (response := await asyncio.to_thread(call.parse, result)) is not None:
+                return response
+        except Exception as e:
             if attempt == max_retries - 1:
-                print(f"Error in LLM call after {max_retries} attempts: {e}")
-                # Use default_factory if provided, otherwise create a basic default
-                if default_factory:
-                    return default_factory()
-                return create_default_response(pydantic_model)
+                return call.fail(e, max_retries, default_factory)
+            call.report_retry(attempt, max_retries)
 
-    # This should never be reached due to the retry logic above
     return create_default_response(pydantic_model)
 
 
+async def acall_llm_per_ticker(
+    template: ChatPromptTemplate,
+    analysis_data: dict[str, dict],
+    pydantic_model: type[BaseModel],
+    agent_name: str | None = None,
+    state: AgentState | None = None,
+    default_factory=None,
+) -> dict[str, BaseModel]:
+    """
+    Gets one response per ticker from a prompt template taking `ticker` and `analysis_data`.
+
+    Each ticker gets its own call by default, all of them concurrent. With
+    LLM_BATCH_SIZE above 1, that many tickers share a call whose prompt holds
+    all of their analysis data; any ticker missing from or invalid in the
+    batch's response falls back to its own call. With LLM_FAST_PATH enabled,
+    tickers whose analysis is decisive or lacks data skip the LLM entirely
+    (see rule_based_response).
+
+    Args:
+        template: The analyst's prompt template
+        analysis_data: The analysis data of each ticker
+        pydantic_model: The Pydantic model class of a single ticker's response
+        agent_name, state, default_factory: As for call_llm
+
+    Returns:
+        The response for each ticker of analysis_data
+    """
+    responses = {}
+    if os.environ.get(LLM_FAST_PATH_ENV, "").lower() in ("1", "true", "yes"):
+        for ticker, data in analysis_data.items():
+            if response := rule_based_response(data, pydantic_model):
+                responses[ticker] = response
+    tickers = [ticker for ticker in analysis_data if ticker not in responses]
+    batch_size = max(int(os.environ.get(LLM_BATCH_SIZE_ENV) or 1), 1)
+
+    async def call_for_ticker(ticker: str) -> BaseModel:
+        prompt = template.invoke({"analysis_data": json.dumps(analysis_data[ticker], indent=2), "ticker": ticker})
+        return await acall_llm(prompt, pydantic_model, agent_name, state, default_factory=default_factory)
+
+    async def call_for_batch(batch: list[str]) -> list[BaseModel]:
+        if len(batch) == 1:
+            return [await call_for_ticker(batch[0])]
+
+        prompt = template.invoke({"analysis_data": json.dumps({ticker: analysis_data[ticker] for ticker in batch}, indent=2), "ticker": ", ".join(batch)})
+        messages = prompt.to_messages() + [HumanMessage(content=BATCH_INSTRUCTIONS.format(count=len(batch), tickers=", ".join(batch)))]
+        response = await acall_llm(messages, BatchResponse, agent_name, state, default_factory=lambda: BatchResponse(signals={}))
+
+        responses = {}
+        for ticker in batch:
+            try:
+                responses[ticker] = pydantic_model.model_validate(response.signals[ticker])
+            except (KeyError, ValueError):
+                pass
+        fallbacks = [ticker for ticker in batch if ticker not in responses]
+        responses.update(zip(fallbacks, await asyncio.gather(*(call_for_ticker(ticker) for ticker in fallbacks))))
+        return [responses[ticker] for ticker in batch]
+
+    batches = [tickers[i : i + batch_size] for i in range(0, len(tickers), batch_size)]
+    results = await asyncio.gather(*(call_for_batch(batch) for batch in batches))
+    responses.update(zip(tickers, (response for batch_responses in results for response in batch_responses)))
+    return {ticker: responses[ticker] for ticker in analysis_data}
+
+
+def rule_based_response(analysis: dict, pydantic_model: type[BaseModel]) -> BaseModel | None:
+    """
+    Answers a ticker from its rule-based analysis alone when the LLM could add little.
+
+    That is when every sub-analysis reports missing inputs with
+    "data_available": False (a neutral signal with no confidence), or when
+    all inputs are available and the score is at least LLM_FAST_PATH_BULLISH
+    or at most LLM_FAST_PATH_BEARISH of the maximum score (a bullish or
+    bearish signal as confident as the score is extreme). Returns None for
+    the borderline cases and for partially missing data, whose score says
+    more about the gaps than about the company; both are left to the LLM.
+
+    The response is an instance of pydantic_model that is also a
+    RuleBasedResponse, so callers can mark it in their output with is_rule_based.
+    """
+    sub_analyses = {name: value for name, value in analysis.items() if isinstance(value, dict) and "score" in value and "details" in value}
+    score, max_score = analysis.get("score"), analysis.get("max_score")
+
+    missing = [name for name, value in sub_analyses.items() if not value.get("data_available", True)]
+
+    if sub_analyses and len(missing) == len(sub_analyses):
+        signal, confidence = "neutral", 0.0
+        reasoning = "Insufficient data for analysis, defaulting to neutral without consulting the LLM"
+    elif missing:
+        return None
+    elif isinstance(score, (int, float)) and isinstance(max_score, (int, float)) and max_score > 0:
+        bullish = float(os.environ.get(LLM_FAST_PATH_BULLISH_ENV) or DEFAULT_FAST_PATH_BULLISH)
+        bearish = float(os.environ.get(LLM_FAST_PATH_BEARISH_ENV) or DEFAULT_FAST_PATH_BEARISH)
+        ratio = min(max(score / max_score, 0.0), 1.0)
+        if ratio >= bullish:
+            signal, confidence = "bullish", round(ratio * 100, 1)
+        elif ratio <= bearish:
+            signal, confidence = "bearish", round((1 - ratio) * 100, 1)
+        else:
+            return None
+        reasoning = f"Rule-based score of {score:.1f}/{max_score:g} is decisively {signal}, so the LLM was not consulted"
+    else:
+        return None
+
+    details = "; ".join(f"{name}: {value['details']}" for name, value in sub_analyses.items())
+    return _rule_based_model(pydantic_model)(signal=signal, confidence=confidence, reasoning=f"{reasoning}. {details}" if details else reasoning)
+
+
+def is_rule_based(response: BaseModel) -> bool:
+    """Whether a response came from the rule-based fast path rather than the LLM."""
+    return isinstance(response, RuleBasedResponse)
+
+
+@functools.lru_cache(maxsize=None)
+def _rule_based_model(pydantic_model: type[BaseModel]) -> type[BaseModel]:
+    return create_model(f"RuleBased{pydantic_model.__name__}", __base__=(pydantic_model, RuleBasedResponse))
+
+
+def run_llm(coroutine: Awaitable):
+    """Run an acall_llm coroutine, or one gathering several, and wait for its result.
+
+    The coroutine runs on a long-lived event loop shared by every caller, so that
+    the clients' connection pools and the provider limits outlast a single call.
+    """
+    return asyncio.run_coroutine_threadsafe(coroutine, _get_llm_loop()).result()
+
+
+class _LLMCall:
+    """Model configuration, client and response cache entry of one call_llm or acall_llm call."""
+
+    def __init__(self, prompt: any, pydantic_model: type[BaseModel], agent_name: str | None, state: AgentState | None, use_cache: bool):
+        self.pydantic_model = pydantic_model
+        self.agent_name = agent_name
+
+        model_name, model_provider = None, None
+
+        # Extract model configuration if state is provided and agent_name is available
+        if state and agent_name:
+            model_name, model_provider = get_agent_model_config(state, agent_name)
+
+        # Fallback to defaults if still not provided
+        if not model_name:
+            model_name = "gpt-4o"
+        # Providers arrive as enum members, values or member names; key limits, clients and the cache on one spelling
+        model_provider = normalize_provider(model_provider or ModelProvider.OPENAI.value)
+        self.model_provider = model_provider
+
+        # Identical requests are answered from the response cache instead of the provider
+        self.cache = get_llm_cache()
+        self.cache_key = self.cache.key(model_provider, model_name, pydantic_model, prompt) if use_cache and self.cache.enabled else None
+        self.cached_response = self.cache.get(self.cache_key, pydantic_model) if self.cache_key else None
+        if self.cached_response:
+            return
+
+        self.model_info = get_model_info(model_name, model_provider)
+
+        # For JSON mode models, we can use structured output; clients are shared across calls
+        if self.uses_json_mode:
+            self.llm = get_model_client(model_name, model_provider, pydantic_model)
+        else:
+            self.llm = get_model_client(model_name, model_provider)
+
+    @property
+    def uses_json_mode(self) -> bool:
+        return not (self.model_info and not self.model_info.has_json_mode())
+
+    def parse(self, result: any) -> BaseModel | None:
+        """Turn the model's output into the response, caching it, or return None if it holds no JSON."""
+        # For non-JSON support models, we need to extract and parse the JSON manually
+        if not self.uses_json_mode:
+            parsed_result = extract_json_from_response(result.content)
+            if not parsed_result:
+                return None
+            result = self.pydantic_model(**parsed_result)
+
+        if self.cache_key:
+            self.cache.set(self.cache_key, result)
+        return result
+
+    def report_retry(self, attempt: int, max_retries: int):
+        if self.agent_name:
+            progress.update_status(self.agent_name, None, f"Error - retry {attempt + 1}/{max_retries}")
+
+    def fail(self, error: Exception, max_retries: int, default_factory=None) -> BaseModel:
+        self.report_retry(max_retries - 1, max_retries)
+        print(f"Error in LLM call after {max_retries} attempts: {error}")
+        # Use default_factory if provided, otherwise create a basic default
+        if default_factory:
+            return default_factory()
+        return create_default_response(self.pydantic_model)
+
+
+# asyncio semaphores belong to one event loop, so keep one set of provider limits per loop
+_provider_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+
+def _get_max_concurrency(model_provider: str) -> int:
+    """Concurrency limit of a provider, configured from the environment."""
+    max_concurrency = os.environ.get(f"{LLM_MAX_CONCURRENCY_ENV}_{model_provider.upper()}") or os.environ.get(LLM_MAX_CONCURRENCY_ENV)
+    if max_concurrency:
+        return max(int(max_concurrency), 1)
+    return PROVIDER_MAX_CONCURRENCY.get(model_provider, DEFAULT_MAX_CONCURRENCY)
+
+
+def _get_provider_semaphore(model_provider: str) -> asyncio.Semaphore:
+    """Get the semaphore bounding a provider's calls in flight on the running event loop."""
+    semaphores = _provider_semaphores.setdefault(asyncio.get_running_loop(), {})
+    if model_provider not in semaphores:
+        semaphores[model_provider] = asyncio.Semaphore(_get_max_concurrency(model_provider))
+    return semaphores[model_provider]
+
+
+_llm_loop: asyncio.AbstractEventLoop | None = None
+_llm_loop_lock = threading.Lock()
+
+
+def _get_llm_loop() -> asyncio.AbstractEventLoop:
+    """Get the event loop that run_llm runs on, starting it in a daemon thread on first use."""
+    global _llm_loop
+    with _llm_loop_lock:
+        if _llm_loop is None:
+            _llm_loop = asyncio.new_event_loop()
+            threading.Thread(target=_llm_loop.run_forever, name="llm-event-loop", daemon=True).start()
+    return _llm_loop
+
+
 def create_default_response(model_class: type[BaseModel]) -> BaseModel:
     """Creates a safe default response based on the model's fields."""
     default_values = {}
@@ -126,7 +402,7 @@ def get_agent_model_config(state, agent_name):
     if agent_name == 'portfolio_manager':
         # Get the model and provider from state metadata
         model_name = state.get("metadata", {}).get("model_name", "gpt-4o")
-        model_provider = state.get("metadata", {}).get("model_provider", "OPENAI")
+        model_provider = state.get("metadata", {}).get("model_provider", ModelProvider.OPENAI.value)
         return model_name, model_provider
     
     if request and hasattr(request, 'get_agent_model_config'):
@@ -136,7 +412,7 @@ def get_agent_model_config(state, agent_name):
     
     # Fall back to global configuration
     model_name = state.get("metadata", {}).get("model_name", "gpt-4o")
-    model_provider = state.get("metadata", {}).get("model_provider", "OPENAI")
+    model_provider = state.get("metadata", {}).get("model_provider", ModelProvider.OPENAI.value)
     
     # Convert enum to string if necessary
     if hasattr(model_provider, 'value'):
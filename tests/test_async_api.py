@@ -0,0 +1,26 @@
+import asyncio
+
+from src.data.cache import CACHE_DIR_ENV, Cache
+from src.data.models import Price
+from src.tools import async_api
+
+
+def test_concurrent_fetches_of_a_key_share_one_request(monkeypatch):
+    requests = []
+
+    async def fetch_prices(ticker, start_date, end_date):
+        requests.append((ticker, start_date, end_date))
+        await asyncio.sleep(0.05)
+        return [Price(open=1, close=1, high=1, low=1, volume=1, time="2024-01-02T00:00:00Z")]
+
+    monkeypatch.delenv(CACHE_DIR_ENV, raising=False)
+    monkeypatch.setattr(async_api, "_cache", Cache(shared=False))
+    monkeypatch.setattr(async_api, "_fetch_prices", fetch_prices)
+
+    async def main():
+        return await asyncio.gather(*(async_api.get_prices("AAPL", "2024-01-01", "2024-01-05") for _ in range(5)))
+
+    results = asyncio.run(main())
+
+    assert requests == [("AAPL", "2024-01-01", "2024-01-05")]
+    assert all(len(prices) == 1 for prices in results)
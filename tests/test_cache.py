@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+import pytest
+
+from src.data.cache import CACHE_DIR_ENV, CACHE_MAX_MB_ENV, Cache
+from src.data.models import InsiderTrade, LineItem
+from src.tools import api
+
+
+def make_trade(filing_date: str) -> InsiderTrade:
+    fields = {field: None for field in InsiderTrade.model_fields}
+    return InsiderTrade(**{**fields, "ticker": "AAPL", "filing_date": filing_date})
+
+
+# One filing a day, newest first, as the API returns them
+TRADES = [make_trade((date(2024, 12, 31) - timedelta(days=offset)).isoformat()) for offset in range(1000)]
+
+
+@pytest.fixture
+def requests(monkeypatch):
+    """Serve insider trades from TRADES through a fresh memory-only cache, recording each request's window."""
+    requests = []
+
+    def fetch_pages(ticker, end_date, start_date, limit):
+        requests.append((start_date, end_date))
+        trades = [trade for trade in TRADES if trade.filing_date <= end_date and (not start_date or trade.filing_date >= start_date)]
+        return trades if start_date else trades[:limit]
+
+    monkeypatch.delenv(CACHE_DIR_ENV, raising=False)
+    monkeypatch.delenv(CACHE_MAX_MB_ENV, raising=False)
+    monkeypatch.setattr(api, "_cache", Cache(shared=False))
+    monkeypatch.setattr(api, "_fetch_insider_trade_pages", fetch_pages)
+    return requests
+
+
+def test_sliding_end_date_fetches_only_new_days(requests):
+    for end_date in ["2024-03-01", "2024-03-04", "2024-03-05", "2024-03-06"]:
+        trades = api.get_insider_trades("AAPL", end_date, limit=100)
+        assert trades == [trade for trade in TRADES if trade.filing_date <= end_date][:100]
+
+    assert requests == [(None, "2024-03-01"), ("2024-03-02", "2024-03-04"), ("2024-03-05", "2024-03-05"), ("2024-03-06", "2024-03-06")]
+
+
+def test_covered_window_is_not_fetched_again(requests):
+    api.get_insider_trades("AAPL", "2024-03-06", limit=100)
+    api.get_insider_trades("AAPL", "2024-03-01", limit=50)
+    api.get_insider_trades("AAPL", "2024-03-06", start_date="2024-02-01", limit=100)
+
+    assert requests == [(None, "2024-03-06")]
+
+
+def test_line_items_evicted_before_read_back_are_still_returned(monkeypatch):
+    def fetch_line_items(tickers, line_items, end_date, period, limit):
+        return [LineItem(ticker=ticker, report_period=f"2023-0{i + 1}-01", period=period, currency="USD", **{field: 1.0 for field in line_items}) for ticker in tickers for i in range(limit)]
+
+    monkeypatch.delenv(CACHE_DIR_ENV, raising=False)
+    # Too small to hold every ticker's entry at once
+    monkeypatch.setattr(api, "_cache", Cache(max_bytes=4000, shared=False))
+    monkeypatch.setattr(api, "_fetch_line_items", fetch_line_items)
+
+    results = api.search_line_items_batch(["AAPL", "MSFT", "NVDA"], ["revenue", "net_income"], "2023-12-31", limit=5)
+
+    assert {ticker: len(items) for ticker, items in results.items()} == {"AAPL": 5, "MSFT": 5, "NVDA": 5}
+    assert all(item.revenue == item.net_income == 1.0 for items in results.values() for item in items)
+
+
+def test_insider_trades_evicted_before_read_back_are_still_returned(requests, monkeypatch):
+    # Room for a single ticker's trades, and another ticker's fetch lands right after each write
+    cache = Cache(max_bytes=1000, shared=False)
+    set_insider_trades = cache.set_insider_trades
+
+    def set_then_evict(ticker, data, end_date, start_date, limit):
+        set_insider_trades(ticker, data, end_date, start_date, limit)
+        set_insider_trades("MSFT", [], end_date, start_date, limit)
+
+    monkeypatch.setattr(cache, "set_insider_trades", set_then_evict)
+    monkeypatch.setattr(api, "_cache", cache)
+
+    assert api.get_insider_trades("AAPL", "2024-03-01", limit=100) == [trade for trade in TRADES if trade.filing_date <= "2024-03-01"][:100]
+    assert api.get_insider_trades("AAPL", "2024-03-01", start_date="2024-02-01") == [trade for trade in TRADES if "2024-02-01" <= trade.filing_date <= "2024-03-01"]
@@ -0,0 +1,49 @@
+from typing import Literal
+
+import pytest
+from pydantic import BaseModel
+
+pytest.importorskip("langchain_core")
+
+from src.utils.llm import is_rule_based, rule_based_response
+
+
+class Signal(BaseModel):
+    signal: Literal["bullish", "bearish", "neutral"]
+    confidence: float
+    reasoning: str
+
+
+def missing(details: str) -> dict:
+    return {"score": 0, "details": details, "data_available": False}
+
+
+def test_decisive_score_skips_llm():
+    analysis = {"score": 9.5, "max_score": 10, "growth": {"score": 10, "details": "Strong revenue growth"}}
+    response = rule_based_response(analysis, Signal)
+    assert response.signal == "bullish" and is_rule_based(response)
+
+
+def test_all_data_missing_is_neutral():
+    analysis = {"score": 0, "max_score": 10, "growth": missing("Insufficient financial data"), "valuation": missing("Insufficient data for valuation")}
+    response = rule_based_response(analysis, Signal)
+    assert (response.signal, response.confidence) == ("neutral", 0.0)
+
+
+def test_partially_missing_data_goes_to_llm():
+    # Peter Lynch weights: growth 30%, valuation 25%, fundamentals 20%, sentiment 15%, insider 10%
+    analysis = {
+        "score": 5 * 0.15 + 5 * 0.10,
+        "max_score": 10,
+        "growth_analysis": missing("Insufficient financial data for growth analysis"),
+        "valuation_analysis": missing("Insufficient data for valuation"),
+        "fundamentals_analysis": missing("Insufficient fundamentals data"),
+        "sentiment_analysis": {"score": 5, "details": "Mostly neutral headlines"},
+        "insider_activity": {"score": 5, "details": "No buy/sell transactions found; neutral stance"},
+    }
+    assert rule_based_response(analysis, Signal) is None
+
+
+def test_findings_phrased_as_no_are_not_missing_data():
+    analysis = {"score": 5, "max_score": 10, "balance_sheet": {"score": 5, "details": "No debt on balance sheet"}}
+    assert rule_based_response(analysis, Signal) is None